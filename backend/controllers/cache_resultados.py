@@ -0,0 +1,121 @@
+import hashlib
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+
+def huella_carga(procesos) -> str:
+    """Hash de la carga: (pid, llegada, ráfaga, prioridad, ráfagas de E/S) de cada proceso, en orden de cola."""
+    valores = array("q")
+    for p in procesos:
+        pcb = p.pcb
+        rafagas = pcb.lista_rafagas()
+        valores.extend((pcb.pid, pcb.tiempo_llegada, pcb.rafaga_original, pcb.prioridad, len(rafagas)))
+        valores.extend(rafagas)
+    return hashlib.blake2b(valores.tobytes(), digest_size=16).hexdigest()
+
+
+def tamanio_aproximado(resultado) -> int:
+    """
+    Bytes aproximados de un resultado: una lista de filas (dicts de escalares) o un dict.
+    Se mide la primera fila y se multiplica: todas las filas tienen los mismos campos.
+    """
+    if isinstance(resultado, dict):
+        return sys.getsizeof(resultado) + sum(sys.getsizeof(v) for v in resultado.values())
+    if isinstance(resultado, list) and resultado:
+        return sys.getsizeof(resultado) + len(resultado) * tamanio_aproximado(resultado[0])
+    return sys.getsizeof(resultado)
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados de planificación.
+    La clave incluye la huella de la carga, el algoritmo y sus parámetros, así que
+    un resultado nunca se sirve para otra carga. La huella de la cola se recalcula
+    solo cuando la cola cambió (su `version`) o las rutas de colas avisan un cambio
+    (nueva_version).
+    Se limitan tanto las entradas como los bytes: un resultado completo ocupa una
+    fila por proceso, así que pocas entradas pueden pesar mucho.
+    """
+
+    def __init__(self, capacidad=64, max_bytes=64 << 20):
+        if capacidad <= 0:
+            raise ValueError("La capacidad del cache debe ser positiva")
+        if max_bytes <= 0:
+            raise ValueError("El límite de bytes del cache debe ser positivo")
+        self.capacidad = capacidad
+        self.max_bytes = max_bytes
+        self.entradas = OrderedDict()   # clave -> (resultado, bytes)
+        self.bytes = 0
+        self.version = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._huella = None           # (version, huella) de la cola de listos
+        # las rutas sync corren en el threadpool: leer también reordena el LRU
+        self._candado = threading.Lock()
+
+    def nueva_version(self) -> None:
+        """La cola de listos cambió: la próxima consulta vuelve a calcular la huella."""
+        self.version += 1
+        self._huella = None
+
+    def huella(self, cola) -> str:
+        """
+        Huella de la carga de una ColaIndexada, recordada junto con la versión de la cola.
+        Quien necesite que la huella corresponda a una instantánea de la cola debe
+        tomar las dos dentro de un mismo `with cola.candado`.
+        """
+        with cola.candado:
+            version = (self.version, cola.version)
+            if self._huella is None or self._huella[0] != version:
+                self._huella = (version, huella_carga(cola))
+            return self._huella[1]
+
+    def obtener(self, clave):
+        """Devuelve el resultado guardado (o None) y lo marca como el más reciente."""
+        with self._candado:
+            entrada = self.entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[0]
+
+    def guardar(self, clave, resultado) -> None:
+        """Guarda el resultado; uno que solo ya supera max_bytes no se guarda."""
+        tamanio = tamanio_aproximado(resultado)
+        if tamanio > self.max_bytes:
+            return
+        with self._candado:
+            anterior = self.entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self.entradas[clave] = (resultado, tamanio)
+            self.bytes += tamanio
+            while len(self.entradas) > self.capacidad or self.bytes > self.max_bytes:
+                _, (_, liberado) = self.entradas.popitem(last=False)
+                self.bytes -= liberado
+                self.desalojos += 1
+
+    def invalidar(self) -> None:
+        with self._candado:
+            self.entradas.clear()
+            self.bytes = 0
+        self.nueva_version()
+
+    def estadisticas(self):
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self.entradas),
+                "capacidad": self.capacidad,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
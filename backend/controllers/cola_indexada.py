@@ -0,0 +1,162 @@
+import threading
+
+
+class ColaIndexada:
+    """
+    Cola FIFO de procesos con índice por PID.
+    - Lista doblemente enlazada intrusiva: los enlaces viven en el propio Proceso
+      (_anterior / _siguiente / _cola), sin nodos aparte.
+    - Un dict pid -> proceso permite buscar, quitar o mover cualquier proceso en O(1).
+    - Se puede recorrer sin copiar; quien necesite una vista estable mientras otros
+      modifican la cola debe tomar `candado`.
+    Un proceso está a lo sumo en una cola a la vez.
+    `version` crece con cada modificación (sirve de ETag para los listados).
+    Cada proceso que entra recibe una secuencia mayor que la de todos los anteriores,
+    así que la cola queda ordenada por secuencia: un cursor de paginación que la guarda
+    sigue valiendo aunque ese proceso se quite o se mueva a otra cola.
+    """
+
+    def __init__(self):
+        self.candado = threading.RLock()
+        self._primero = None
+        self._ultimo = None
+        self._por_pid = {}
+        self.version = 0
+        self._secuencia = 0
+
+    # ---------------- consultas ----------------
+    def __len__(self) -> int:
+        return len(self._por_pid)
+
+    def __contains__(self, pid) -> bool:
+        return pid in self._por_pid
+
+    def __iter__(self):
+        return self.desde()
+
+    def buscar(self, pid):
+        """Proceso con ese PID, o None si no está en la cola."""
+        return self._por_pid.get(pid)
+
+    def desde(self, pid=None):
+        """Recorre a partir del proceso siguiente al PID dado (o desde el principio)."""
+        # el siguiente se lee antes de entregar el actual: se puede quitar mientras se recorre
+        if pid is None:
+            proceso = self._primero
+        else:
+            proceso = self._por_pid[pid]._siguiente
+        while proceso is not None:
+            siguiente = proceso._siguiente
+            yield proceso
+            proceso = siguiente
+
+    def despues_de(self, secuencia: int, pid=None):
+        """
+        Recorre los procesos que entraron después de la secuencia dada.
+        Si `pid` sigue en la cola con esa secuencia se continúa desde él en O(1);
+        si no, se avanza desde el principio salteando los de secuencia menor o igual.
+        """
+        proceso = self._por_pid.get(pid)
+        if proceso is not None and proceso._secuencia == secuencia:
+            return self.desde(pid)
+        return self._despues_de(secuencia)
+
+    def _despues_de(self, secuencia: int):
+        proceso = self._primero
+        while proceso is not None and proceso._secuencia <= secuencia:
+            proceso = proceso._siguiente
+        while proceso is not None:
+            siguiente = proceso._siguiente
+            yield proceso
+            proceso = siguiente
+
+    def primero(self):
+        return self._primero
+
+    def empty(self) -> bool:
+        return self._primero is None
+
+    def qsize(self) -> int:
+        return len(self._por_pid)
+
+    # ---------------- modificaciones ----------------
+    def put(self, proceso) -> None:
+        """Agrega al final. Falla si el PID ya está o si el proceso está en otra cola."""
+        with self.candado:
+            self._validar(proceso)
+            self._enlazar(proceso)
+
+    def extend(self, procesos) -> None:
+        """Agrega varios al final con una sola toma del candado (todos o ninguno)."""
+        procesos = list(procesos)
+        with self.candado:
+            nuevos = set()
+            for proceso in procesos:
+                self._validar(proceso)
+                if proceso.pcb.pid in nuevos:
+                    raise ValueError(f"PID {proceso.pcb.pid} repetido")
+                nuevos.add(proceso.pcb.pid)
+            for proceso in procesos:
+                self._enlazar(proceso)
+
+    def get(self):
+        """Quita y devuelve el primero."""
+        with self.candado:
+            if self._primero is None:
+                raise IndexError("La cola está vacía")
+            proceso = self._primero
+            self._desenlazar(proceso)
+            return proceso
+
+    def quitar(self, pid):
+        """Quita y devuelve el proceso con ese PID, en cualquier posición."""
+        with self.candado:
+            proceso = self._por_pid.get(pid)
+            if proceso is None:
+                raise KeyError(pid)
+            self._desenlazar(proceso)
+            return proceso
+
+    def tocar(self) -> None:
+        """Registra un cambio hecho por fuera sobre los procesos de la cola (p. ej. su PCB)."""
+        self.version += 1
+
+    def limpiar(self) -> None:
+        with self.candado:
+            while self._primero is not None:
+                self._desenlazar(self._primero)
+
+    # ---------------- internos ----------------
+    def _validar(self, proceso) -> None:
+        if proceso._cola is not None:
+            raise ValueError(f"El proceso {proceso.pcb.pid} ya está en una cola")
+        if proceso.pcb.pid in self._por_pid:
+            raise ValueError(f"PID {proceso.pcb.pid} repetido")
+
+    def _enlazar(self, proceso) -> None:
+        proceso._cola = self
+        proceso._anterior = self._ultimo
+        proceso._siguiente = None
+        if self._ultimo is None:
+            self._primero = proceso
+        else:
+            self._ultimo._siguiente = proceso
+        self._ultimo = proceso
+        self._por_pid[proceso.pcb.pid] = proceso
+        self._secuencia += 1
+        proceso._secuencia = self._secuencia
+        self.version += 1
+
+    def _desenlazar(self, proceso) -> None:
+        anterior, siguiente = proceso._anterior, proceso._siguiente
+        if anterior is None:
+            self._primero = siguiente
+        else:
+            anterior._siguiente = siguiente
+        if siguiente is None:
+            self._ultimo = anterior
+        else:
+            siguiente._anterior = anterior
+        del self._por_pid[proceso.pcb.pid]
+        proceso._anterior = proceso._siguiente = proceso._cola = None
+        self.version += 1
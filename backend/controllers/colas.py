@@ -1,13 +1,24 @@
-from fastapi import APIRouter, HTTPException
+import copy
+from itertools import islice
+from fastapi import APIRouter, HTTPException, Request, Response
+from models.pcb import PCB
 from models.process import Proceso
-from queue import Queue
-from typing import List, Dict, Any
+from controllers.cache_resultados import CacheResultados
+from controllers.ingesta import campos_proceso, ingerir
+from controllers.cola_indexada import ColaIndexada
+from typing import List, Dict, Any, Optional
 
 router = APIRouter(prefix="/colas", tags=["Colas"])
 
 # --- Colas simuladas ---
-cola_listos: Queue[Proceso] = Queue()
-cola_bloqueados: Queue[Proceso] = Queue()
+# Quien toma los candados de las dos colas lo hace en este orden: primero listos y
+# después bloqueados (con un orden fijo dos movimientos opuestos no se traban).
+cola_listos = ColaIndexada()
+cola_bloqueados = ColaIndexada()
+
+# Resultados de /planificar por huella de la cola de listos; cada cambio a la cola
+# lo avisa con nueva_version()
+cache_planificacion = CacheResultados()
 
 # --- Datos de prueba ---
 procesos_test1 = [
@@ -16,24 +27,138 @@ procesos_test1 = [
 ]
 
 def transformar_y_encolar(proceso_dict: Dict[str, Any]) -> Proceso:
-    """Convierte un diccionario en una instancia de Proceso y la agrega a la cola de listos."""
+    """
+    Convierte un diccionario en una instancia de Proceso y la agrega a la cola de listos.
+    Los campos numéricos se validan como en la carga masiva (1.0 se acepta como 1);
+    un valor inválido o un PID ya usado levanta ValueError.
+    """
+    pid, llegada, rafaga, _, rafagas = campos_proceso(proceso_dict)
     p = Proceso(
-        pid=proceso_dict["PID"],
+        pid=pid,
         estado="LISTO",
-        tiempo_llegada=proceso_dict["tiempo_llegada"],
-        rafaga_cpu=proceso_dict["rafaga_cpu"],
+        tiempo_llegada=llegada,
+        rafaga_cpu=rafaga,
         prioridad=1,
         registros=[],
         memoria=None,
         archivos_abiertos=[],
-        usuario=proceso_dict["usuario"]
+        usuario=proceso_dict["usuario"],
+        rafagas=rafagas
     )
 
     p.cambiar_estado("Listo")
-    cola_listos.put(p)
+    with cola_listos.candado, cola_bloqueados.candado:
+        # el chequeo y el alta juntos: otro no puede encolar ni mover ese PID en el medio
+        if pid_en_uso(pid):
+            raise ValueError(f"Ya existe un proceso con PID {pid}")
+        cola_listos.put(p)
+    cache_planificacion.nueva_version()
     return p
 
 
+def encolar_lote(procesos: List[Proceso]) -> None:
+    """
+    Agrega varios procesos a la cola de listos tomando el lock una sola vez.
+    Falla sin encolar ninguno (ValueError) si algún PID ya está en alguna de las colas.
+    """
+    with cola_listos.candado, cola_bloqueados.candado:
+        for p in procesos:
+            if p.pcb.pid in cola_bloqueados:
+                raise ValueError(f"PID {p.pcb.pid} repetido")
+        cola_listos.extend(procesos)
+    cache_planificacion.nueva_version()
+
+
+def instantanea_listos() -> List[Proceso]:
+    """
+    Copia de los procesos listos, cada uno con su propio PCB y fuera de toda cola.
+    Las simulaciones trabajan sobre la copia: no modifican ni compiten por la cola real.
+    """
+    with cola_listos.candado:
+        return [copy.deepcopy(proceso) for proceso in cola_listos]
+
+
+def pid_en_uso(pid: int) -> bool:
+    return pid in cola_listos or pid in cola_bloqueados
+
+
+def _cola_de(pid: int):
+    """Cola (y su nombre) en la que está el PID, o (None, None)."""
+    if pid in cola_listos:
+        return cola_listos, "listos"
+    if pid in cola_bloqueados:
+        return cola_bloqueados, "bloqueados"
+    return None, None
+
+
+# --- Listados: paginación por cursor, proyección de campos y ETag ---
+COLAS = (("listos", cola_listos), ("bloqueados", cola_bloqueados))
+MAX_LIMITE = 10000
+
+
+def etag_colas() -> str:
+    return f'W/"{cola_listos.version}.{cola_bloqueados.version}"'
+
+
+def _no_modificado(request: Request, response: Response) -> bool:
+    """Pone el ETag actual; True si el cliente ya tiene esa versión (If-None-Match)."""
+    etag = etag_colas()
+    response.headers["ETag"] = etag
+    pedidos = [e.strip() for e in request.headers.get("if-none-match", "").split(",")]
+    return etag in pedidos or "*" in pedidos
+
+
+def _cursor(nombre: str, proceso) -> str:
+    return f"{nombre}:{proceso._secuencia}:{proceso.pcb.pid}"
+
+
+def _parsear_cursor(cursor: Optional[str]):
+    """
+    El cursor es "<cola>:<secuencia>:<pid>" del último proceso entregado.
+    Devuelve (índice de cola, secuencia, pid). Sigue valiendo si ese proceso ya no está:
+    la página siguiente empieza en el primero que entró a la cola después que él.
+    """
+    if cursor is None:
+        return 0, None, None
+    nombre, secuencia, pid = (cursor.split(":") + ["", ""])[:3]
+    for indice, (nombre_cola, _) in enumerate(COLAS):
+        if nombre_cola == nombre and secuencia.isdigit() and pid.lstrip("-").isdigit():
+            return indice, int(secuencia), int(pid)
+    raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def _pagina(limite: Optional[int], cursor: Optional[str], response: Response):
+    """Procesos (cola, proceso) de la página; si quedan más, deja el cursor en X-Cursor-Siguiente."""
+    if limite is not None and not 0 < limite <= MAX_LIMITE:
+        raise HTTPException(status_code=400, detail=f"El límite debe estar entre 1 y {MAX_LIMITE}")
+    inicio, secuencia, pid = _parsear_cursor(cursor)
+
+    def recorrer():
+        for indice, (nombre, cola) in enumerate(COLAS[inicio:]):
+            procesos = cola.despues_de(secuencia, pid) if indice == 0 and secuencia is not None else cola
+            for proceso in procesos:
+                yield nombre, proceso
+
+    if limite is None:
+        return list(recorrer())
+    pagina = list(islice(recorrer(), limite + 1))
+    if len(pagina) > limite:
+        pagina.pop()
+        nombre, ultimo = pagina[-1]
+        response.headers["X-Cursor-Siguiente"] = _cursor(nombre, ultimo)
+    return pagina
+
+
+def _campos(campos: Optional[str]):
+    if campos is None:
+        return None
+    lista = [c.strip() for c in campos.split(",") if c.strip()]
+    invalidos = [c for c in lista if c not in PCB.CAMPOS]
+    if invalidos or not lista:
+        raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(invalidos)}")
+    return lista
+
+
 # Inicializamos los procesos de prueba
 for pd in procesos_test1:
     transformar_y_encolar(pd)
@@ -42,66 +167,150 @@ for pd in procesos_test1:
 # --- Rutas de API ---
 
 @router.get("/procesos")
-def listar_procesos() -> List[Dict[str, Any]]:
-    """Lista todos los procesos en colas de listos y bloqueados."""
+def listar_procesos(
+    request: Request,
+    response: Response,
+    limite: Optional[int] = None,
+    cursor: Optional[str] = None,
+    campos: Optional[str] = None,
+):
+    """
+    Lista los procesos de listos y luego bloqueados.
+    - ?limite=N&cursor=... pagina; el cursor de la página siguiente va en X-Cursor-Siguiente.
+    - ?campos=pid,estado,... devuelve solo esos campos del PCB.
+    - Responde 304 sin cuerpo si If-None-Match coincide con la versión de las colas.
+    """
+    if _no_modificado(request, response):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    proyeccion = _campos(campos)
     salida = []
-    for proc in list(cola_listos.queue):
-        salida.append({
-            "PID": proc.pcb.pid,
-            "Estado": proc.pcb.estado
-        })
-    for proc in list(cola_bloqueados.queue):
-        salida.append({
-            "PID": proc.pcb.pid,
-            "Estado": proc.pcb.estado
-        })
+    for _, proc in _pagina(limite, cursor, response):
+        if proyeccion is None:
+            salida.append({
+                "PID": proc.pcb.pid,
+                "Estado": proc.pcb.estado
+            })
+        else:
+            salida.append({campo: getattr(proc.pcb, campo) for campo in proyeccion})
     return salida
 
 
 @router.post("/agregar")
 def agregar_proceso(proceso: Dict[str, Any]) -> Dict[str, Any]:
-    """Agrega un nuevo proceso a la cola de listos."""
+    """
+    Agrega un nuevo proceso a la cola de listos.
+    En lugar de rafaga_cpu puede traer "rafagas": [CPU, E/S, CPU, ...]; en la simulación
+    el proceso se bloquea durante cada ráfaga de E/S.
+    """
     if not (
         "pid" in proceso or "PID" in proceso
     ) or not (
         "tiempo_llegada" in proceso or "tiempoLlegada" in proceso
     ) or not (
-        "rafaga_cpu" in proceso or "rafaga_CPU" in proceso
+        "rafaga_cpu" in proceso or "rafaga_CPU" in proceso or "rafagas" in proceso
     ) or not (
         "usuario" in proceso
     ):
         raise HTTPException(status_code=400, detail="Faltan datos obligatorios del proceso")
-    p = transformar_y_encolar(proceso)
+    try:
+        p = transformar_y_encolar(proceso)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"PID": p.pcb.pid, "Estado": p.pcb.estado, "Tiempo Llegada": p.pcb.tiempo_llegada, "Ráfaga CPU": p.pcb.rafaga_cpu}
 
 
+@router.post("/agregar/lote")
+async def agregar_lote(request: Request, formato: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Carga masiva a la cola de listos. El cuerpo se lee en streaming:
+    NDJSON (un objeto por línea) o CSV con encabezado, según ?formato= o el Content-Type.
+    Campos: pid, tiempo_llegada, rafaga_cpu y opcionalmente prioridad, usuario y rafagas
+    (lista CPU, E/S, CPU... en NDJSON; "5;3;2" en CSV, que reemplaza a rafaga_cpu).
+    Devuelve cuántos procesos se encolaron y las filas rechazadas con su error.
+    """
+    if formato is None:
+        formato = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    if formato not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Formato no soportado (use ndjson o csv)")
+    return await ingerir(request.stream(), formato, encolar_lote, pid_en_uso)
+
+
+@router.get("/procesos/{pid}")
+def buscar_proceso(pid: int) -> Dict[str, Any]:
+    """PCB del proceso y la cola en la que está (búsqueda por PID en O(1))."""
+    cola, nombre = _cola_de(pid)
+    if cola is None:
+        raise HTTPException(status_code=404, detail=f"No existe el proceso {pid}")
+    datos = cola.buscar(pid).to_dict()
+    datos["cola"] = nombre
+    return datos
+
+
+@router.delete("/procesos/{pid}")
+def eliminar_proceso(pid: int) -> Dict[str, Any]:
+    """Quita el proceso de la cola en la que esté."""
+    with cola_listos.candado, cola_bloqueados.candado:
+        cola, nombre = _cola_de(pid)
+        if cola is None:
+            raise HTTPException(status_code=404, detail=f"No existe el proceso {pid}")
+        p = cola.quitar(pid)
+    if cola is cola_listos:
+        cache_planificacion.nueva_version()
+    return {"PID": p.pcb.pid, "Cola": nombre}
+
+
 @router.post("/bloquear")
-def bloquear_proceso() -> Dict[str, Any]:
-    """Mueve el primer proceso de listos a bloqueados."""
-    if cola_listos.empty():
-        raise HTTPException(status_code=400, detail="No hay procesos en la cola de listos")
-    p = cola_listos.get()
-    p.pcb.estado = "BLOQUEADO"
-    cola_bloqueados.put(p)
+def bloquear_proceso(pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Mueve un proceso de listos a bloqueados: el indicado por ?pid= o el primero.
+    Con las dos colas tomadas: el proceso nunca queda fuera de ambas a la vista de otros.
+    """
+    with cola_listos.candado, cola_bloqueados.candado:
+        if cola_listos.empty():
+            raise HTTPException(status_code=400, detail="No hay procesos en la cola de listos")
+        if pid is None:
+            p = cola_listos.get()
+        elif pid in cola_listos:
+            p = cola_listos.quitar(pid)
+        else:
+            raise HTTPException(status_code=404, detail=f"El proceso {pid} no está en la cola de listos")
+        p.pcb.estado = "BLOQUEADO"
+        cola_bloqueados.put(p)
+    cache_planificacion.nueva_version()
     return {"PID": p.pcb.pid, "Nuevo Estado": p.pcb.estado}
 
 
 @router.post("/desbloquear")
-def desbloquear_proceso() -> Dict[str, Any]:
-    """Mueve el primer proceso de bloqueados a listos."""
-    if cola_bloqueados.empty():
-        raise HTTPException(status_code=400, detail="No hay procesos bloqueados")
-    p = cola_bloqueados.get()
-    p.pcb.estado = "LISTO"
-    cola_listos.put(p)
+def desbloquear_proceso(pid: Optional[int] = None) -> Dict[str, Any]:
+    """Mueve un proceso de bloqueados a listos: el indicado por ?pid= o el primero (como /bloquear)."""
+    with cola_listos.candado, cola_bloqueados.candado:
+        if cola_bloqueados.empty():
+            raise HTTPException(status_code=400, detail="No hay procesos bloqueados")
+        if pid is None:
+            p = cola_bloqueados.get()
+        elif pid in cola_bloqueados:
+            p = cola_bloqueados.quitar(pid)
+        else:
+            raise HTTPException(status_code=404, detail=f"El proceso {pid} no está bloqueado")
+        p.pcb.estado = "LISTO"
+        cola_listos.put(p)
+    cache_planificacion.nueva_version()
     return {"PID": p.pcb.pid, "Nuevo Estado": p.pcb.estado}
 
 
 @router.get("/mostrar")
-def mostrar_colas() -> Dict[str, List[int]]:
-    """Devuelve los PID de cada cola."""
-    listos_pids = [proc.pcb.pid for proc in list(cola_listos.queue)]
-    bloqueados_pids = [proc.pcb.pid for proc in list(cola_bloqueados.queue)]
+def mostrar_colas(
+    request: Request,
+    response: Response,
+    limite: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """Devuelve los PID de cada cola (paginable y con ETag, igual que /procesos)."""
+    if _no_modificado(request, response):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    pagina = _pagina(limite, cursor, response)
+    listos_pids = [proc.pcb.pid for nombre, proc in pagina if nombre == "listos"]
+    bloqueados_pids = [proc.pcb.pid for nombre, proc in pagina if nombre == "bloqueados"]
     return {
         "cola_listos": listos_pids,
         "cola_bloqueados": bloqueados_pids
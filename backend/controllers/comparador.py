@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from models.process import Proceso
+from controllers.planificador import fabrica_politica
+from controllers.simulador import SimuladorEventos
+
+ALGORITMOS_COMPARABLES = ("fcfs", "sjf", "rr", "srtf", "prioridad", "prioridad_expropiativo", "mlfq")
+MAX_QUANTUMS_BARRIDO = 500
+
+# Con pocos procesos arrancar y alimentar otros procesos cuesta más que simular en serie
+UMBRAL_PARALELO = 2000
+
+_pool = None
+_candado_pool = threading.Lock()
+
+
+def instantanea(procesos):
+    """
+    Copia mínima y serializable de la carga: (pid, llegada, ráfaga, prioridad, ráfagas de E/S)
+    por proceso (la última es una lista vacía si el proceso no hace E/S).
+    """
+    return [
+        (p.pcb.pid, p.pcb.tiempo_llegada, p.pcb.rafaga_original, p.pcb.prioridad, p.pcb.lista_rafagas())
+        for p in procesos
+    ]
+
+
+def procesos_desde_instantanea(carga):
+    """Crea Procesos nuevos a partir de una instantánea (cada simulación usa los suyos)."""
+    return [
+        Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad,
+                rafagas=rafagas or None)
+        for pid, llegada, rafaga, prioridad, rafagas in carga
+    ]
+
+
+def resumen_simulacion(simulador, terminados):
+    """Promedios de espera, retorno y respuesta, throughput y cambios de contexto."""
+    n = len(terminados)
+    duracion = simulador.reloj
+    if n == 0:
+        return {
+            "procesos": 0, "espera_promedio": 0.0, "retorno_promedio": 0.0,
+            "respuesta_promedio": 0.0, "throughput": 0.0,
+            "cambios_contexto": simulador.cambios_contexto, "tiempo_total": duracion,
+        }
+    espera = retorno = respuesta = 0
+    for proceso in terminados:
+        pcb = proceso.pcb
+        espera += pcb.tiempo_espera
+        retorno += pcb.tiempo_retorno
+        respuesta += pcb.tiempo_inicio - pcb.tiempo_llegada
+    return {
+        "procesos": n,
+        "espera_promedio": espera / n,
+        "retorno_promedio": retorno / n,
+        "respuesta_promedio": respuesta / n,
+        "throughput": n / duracion if duracion > 0 else 0.0,
+        "cambios_contexto": simulador.cambios_contexto,
+        "tiempo_total": duracion,
+    }
+
+
+def simular_resumen(algoritmo, carga, opciones):
+    """Tarea de un worker: simula un algoritmo sobre la instantánea y devuelve su resumen."""
+    fabrica = fabrica_politica(algoritmo, **opciones)
+    simulador = SimuladorEventos(fabrica(), procesos_desde_instantanea(carga))
+    terminados = simulador.ejecutar()
+    return resumen_simulacion(simulador, terminados)
+
+
+def _trabajadores() -> int:
+    return os.cpu_count() or 1
+
+
+def obtener_pool():
+    """
+    Pool de procesos compartido. Los workers se crean con spawn: el servidor tiene
+    varios hilos y un fork podría heredar un lock tomado (tabla de procesos, logging, caches).
+    """
+    global _pool
+    with _candado_pool:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_trabajadores(),
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def descartar_pool(pool) -> None:
+    """Olvida un pool roto (murió un worker); el próximo obtener_pool crea otro."""
+    global _pool
+    with _candado_pool:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def enviar(funcion, *args):
+    """
+    Envía una tarea al pool. Si el pool está roto se descarta y se reintenta con uno nuevo;
+    si se rompe mientras la tarea corre, el futuro falla y el pool se descarta igual.
+    """
+    pool = obtener_pool()
+    try:
+        futuro = pool.submit(funcion, *args)
+    except BrokenProcessPool:
+        descartar_pool(pool)
+        pool = obtener_pool()
+        futuro = pool.submit(funcion, *args)
+
+    def revisar(f):
+        if not f.cancelled() and isinstance(f.exception(), BrokenProcessPool):
+            descartar_pool(pool)
+
+    futuro.add_done_callback(revisar)
+    return futuro
+
+
+def _resultados(tareas):
+    """Ejecuta (función, *args) en el pool y devuelve sus resultados; reintenta una vez si el pool se rompe."""
+    for intento in range(2):
+        futuros = [enviar(*tarea) for tarea in tareas]
+        try:
+            return [futuro.result() for futuro in futuros]
+        except BrokenProcessPool:
+            if intento == 1:
+                raise
+
+
+def comparar(carga, algoritmos, opciones):
+    """
+    Ejecuta cada algoritmo sobre la misma instantánea y devuelve {algoritmo: resumen}.
+    Con cargas grandes cada algoritmo corre en su propio proceso, así que el tiempo
+    total lo marca el algoritmo más lento y no la suma de todos.
+    """
+    if len(carga) < UMBRAL_PARALELO or len(algoritmos) < 2:
+        return {a: simular_resumen(a, carga, opciones) for a in algoritmos}
+    resultados = _resultados([(simular_resumen, a, carga, opciones) for a in algoritmos])
+    return dict(zip(algoritmos, resultados))
+
+
+def _barrer_quantums(carga, quantums):
+    """Tarea de un worker: varias corridas de RR sobre la misma carga ya recibida."""
+    return [simular_resumen("rr", carga, {"quantum": q}) for q in quantums]
+
+
+def barrido_quantum(carga, quantums):
+    """
+    Evalúa Round Robin para cada quantum y devuelve las curvas de métricas.
+    La carga se ordena por llegada una sola vez (el heap de llegadas ya queda armado)
+    y cada worker la recibe una vez para todo su grupo de quantums.
+    """
+    # el largo se controla antes de armar la lista (un range enorme no se materializa)
+    if len(quantums) > MAX_QUANTUMS_BARRIDO:
+        raise ValueError(f"Como máximo {MAX_QUANTUMS_BARRIDO} quantums por barrido")
+    quantums = list(quantums)
+    if not quantums:
+        raise ValueError("Se necesita al menos un quantum")
+    if not all(isinstance(q, int) and not isinstance(q, bool) for q in quantums):
+        raise ValueError("Los quantums deben ser enteros")
+    if any(q <= 0 for q in quantums):
+        raise ValueError("Los quantums deben ser positivos")
+    carga = sorted(carga, key=lambda fila: (fila[1], fila[0]))
+
+    grupos = min(_trabajadores(), len(quantums))
+    if len(carga) < UMBRAL_PARALELO or grupos < 2:
+        resumenes = _barrer_quantums(carga, quantums)
+    else:
+        # intercalados: los quantums chicos (más eventos) quedan repartidos entre los grupos
+        resultados = _resultados([(_barrer_quantums, carga, quantums[g::grupos]) for g in range(grupos)])
+        resumenes = [resultados[i % grupos][i // grupos] for i in range(len(quantums))]
+
+    curvas = {"quantums": quantums}
+    for metrica in ("espera_promedio", "retorno_promedio", "respuesta_promedio", "cambios_contexto", "throughput"):
+        curvas[metrica] = [resumen[metrica] for resumen in resumenes]
+    return curvas
@@ -0,0 +1,124 @@
+import io
+import struct
+import zipfile
+from array import array
+import numpy as np
+from controllers.planificador_lote import COLUMNAS_SALIDA
+
+COLUMNAS_TRAMOS = ("pid", "cpu", "inicio", "fin")
+ALINEACION = 64                 # los datos de cada columna empiezan en múltiplo de 64 bytes
+VALORES_POR_ENVIO = 1 << 17     # 1 MiB de int64 por fragmento de la respuesta
+ID_RELLENO = 0xD935             # campo extra de relleno (el mismo que usa zipalign)
+ZIP64_EXTRA = 20                # bytes que agrega zipfile al encabezado local con ZIP64
+
+
+class ResultadoColumnar:
+    """
+    Resultados de una simulación en columnas int64 (array('q'), 8 bytes por valor).
+    El simulador lo usa como `metricas`: llama a `registrar(pcb)` al cerrar cada PCB,
+    así que no hace falta conservar los procesos terminados.
+    """
+
+    def __init__(self):
+        self.procesos = {nombre: array("q") for nombre in COLUMNAS_SALIDA}
+        self.tramos = {nombre: array("q") for nombre in COLUMNAS_TRAMOS}
+
+    def registrar(self, pcb) -> None:
+        for nombre, columna in self.procesos.items():
+            columna.append(getattr(pcb, nombre))
+
+    def agregar_tramo(self, pid, cpu, inicio, fin) -> None:
+        self.tramos["pid"].append(pid)
+        self.tramos["cpu"].append(cpu)
+        self.tramos["inicio"].append(inicio)
+        self.tramos["fin"].append(fin)
+
+    def tablas(self):
+        return {"procesos": self.procesos, "tramos": self.tramos}
+
+
+class _Salida:
+    """Destino de zipfile que acumula lo escrito hasta que el generador lo envía."""
+
+    def __init__(self):
+        self.partes = []
+        self.posicion = 0
+
+    def write(self, datos) -> int:
+        self.partes.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+
+    def flush(self) -> None:
+        pass
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self.partes)
+        self.partes.clear()
+        return datos
+
+
+def _relleno(posicion, nombre, tamano) -> bytes:
+    """Campo extra del encabezado local para que los datos del miembro queden alineados."""
+    zip64 = tamano * 1.05 > zipfile.ZIP64_LIMIT
+    encabezado = 30 + len(nombre.encode()) + 4 + (ZIP64_EXTRA if zip64 else 0)
+    faltan = -(posicion + encabezado) % ALINEACION
+    return struct.pack("<HH", ID_RELLENO, faltan) + b"\0" * faltan
+
+
+def escribir_npz(tablas):
+    """
+    Genera un .npz sin comprimir, con un .npy por columna ("procesos/tiempo_espera", ...).
+    Se lee con np.load; como los miembros no están comprimidos y sus datos están
+    alineados, también se puede mapear cada columna sin copiarla (abrir_exportacion).
+    Se envía en fragmentos de VALORES_POR_ENVIO valores.
+    """
+    salida = _Salida()
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_STORED, allowZip64=True) as archivo:
+        for tabla, columnas in tablas.items():
+            for columna, valores in columnas.items():
+                arreglo = np.frombuffer(valores, dtype="<i8") if len(valores) else np.empty(0, "<i8")
+                # la cabecera .npy ya viene rellenada a múltiplo de 64 bytes
+                cabecera = io.BytesIO()
+                np.lib.format.write_array_header_1_0(
+                    cabecera, np.lib.format.header_data_from_array_1_0(arreglo)
+                )
+                nombre = f"{tabla}/{columna}.npy"
+                info = zipfile.ZipInfo(nombre, date_time=(1980, 1, 1, 0, 0, 0))
+                info.file_size = len(cabecera.getvalue()) + arreglo.nbytes
+                info.extra = _relleno(salida.posicion, nombre, info.file_size)
+                with archivo.open(info, "w") as miembro:
+                    miembro.write(cabecera.getvalue())
+                    for inicio in range(0, len(arreglo), VALORES_POR_ENVIO):
+                        miembro.write(arreglo[inicio:inicio + VALORES_POR_ENVIO].tobytes())
+                        yield salida.vaciar()
+    yield salida.vaciar()
+
+
+def abrir_exportacion(ruta):
+    """
+    Columnas de un .npz de escribir_npz mapeadas en memoria (np.memmap de solo lectura),
+    por nombre ("procesos/pid", "tramos/inicio", ...). Nada se copia ni se decodifica.
+    """
+    with zipfile.ZipFile(ruta) as archivo:
+        miembros = archivo.infolist()
+    columnas = {}
+    with open(ruta, "rb") as datos:
+        for info in miembros:
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} está comprimido: no se puede mapear")
+            datos.seek(info.header_offset + 26)
+            largo_nombre, largo_extra = struct.unpack("<HH", datos.read(4))
+            datos.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+            version = np.lib.format.read_magic(datos)
+            if version == (1, 0):
+                forma, fortran, tipo = np.lib.format.read_array_header_1_0(datos)
+            else:
+                forma, fortran, tipo = np.lib.format.read_array_header_2_0(datos)
+            clave = info.filename[:-len(".npy")]
+            if 0 in forma:
+                columnas[clave] = np.empty(forma, dtype=tipo)
+            else:
+                columnas[clave] = np.memmap(ruta, dtype=tipo, mode="r", offset=datos.tell(), shape=forma,
+                                            order="F" if fortran else "C")
+    return columnas
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import os
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from models.filesystem.bloques import ContenidoBloques
+from models.filesystem.permisos import modo_desde_texto
 from models.filesystem.sistema_de_archivos import SistemaArchivos
 
 router = APIRouter(prefix="/fs", tags=["filesystem"])
+logger = logging.getLogger(__name__)
 
 # Instancia global del sistema de archivos
-_fs_instance = SistemaArchivos()
+# FS_VERIFICAR_BUSQUEDA=1 exige x en cada ancestro; FS_CACHE_PERMISOS=1 cachea las decisiones
+_fs_instance = SistemaArchivos(
+    verificar_busqueda=os.environ.get("FS_VERIFICAR_BUSQUEDA") == "1",
+    cache_permisos=os.environ.get("FS_CACHE_PERMISOS") == "1",
+)
 
 def get_fs():
     """Dependency que retorna la instancia del filesystem"""
@@ -57,19 +68,19 @@ def ls(ruta: str = ".", fs: SistemaArchivos = Depends(get_fs)):
 @router.post("/mkdir")
 def mkdir(ruta: str, permisos: str = "755", fs: SistemaArchivos = Depends(get_fs)):
     result = fs.mkdir(ruta, permisos=permisos)
-    print(f"[DEBUG] mkdir result: {result}")  # Debug
+    logger.debug("mkdir", extra={"ruta": ruta, "permisos": permisos, "resultado": result})
     return result
 
 @router.post("/cd")
 def cd(ruta: str, fs: SistemaArchivos = Depends(get_fs)):
     result = fs.cd(ruta)
-    print(f"[DEBUG] cd result: {result}")  # Debug
+    logger.debug("cd", extra={"ruta": ruta, "resultado": result})
     return result
 
 @router.post("/create")
 def create(ruta: str, contenido: str = "", permisos: str = "644", fs: SistemaArchivos = Depends(get_fs)):
     result = fs.crear_archivo(ruta, contenido, permisos=permisos)
-    print(f"[DEBUG] create file result: {result}")  # Debug
+    logger.debug("create", extra={"ruta": ruta, "permisos": permisos, "resultado": result})
     return result
 
 @router.get("/read")
@@ -80,10 +91,132 @@ def read(ruta: str, fs: SistemaArchivos = Depends(get_fs)):
 def write(ruta: str, contenido: str, fs: SistemaArchivos = Depends(get_fs)):
     return fs.write(ruta, contenido)
 
+@router.post("/append")
+async def append(ruta: str, request: Request, fs: SistemaArchivos = Depends(get_fs)):
+    """Agrega el cuerpo de la petición al final del archivo, fragmento a fragmento."""
+    archivo, error = fs.abrir(ruta, "w")
+    if error:
+        raise _error_http(error)
+    escritos = 0
+    try:
+        async for fragmento in request.stream():
+            escritos += archivo.agregar(fragmento)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": "archivo modificado", "escritos": escritos, "tamanio": archivo.tamanio}
+
+@router.post("/truncate")
+def truncate(ruta: str, tamanio: int, fs: SistemaArchivos = Depends(get_fs)):
+    return fs.truncate(ruta, tamanio)
+
+def _error_http(error: dict) -> HTTPException:
+    mensaje = error["error"]
+    if "permiso denegado" in mensaje:
+        return HTTPException(status_code=403, detail=mensaje)
+    if "no encontrado" in mensaje or "no existe" in mensaje:
+        return HTTPException(status_code=404, detail=mensaje)
+    return HTTPException(status_code=400, detail=mensaje)
+
+def _rango(encabezado: Optional[str], tamanio: int) -> Optional[Tuple[int, int]]:
+    """
+    (inicio, fin) del encabezado Range: 'bytes=a-b', 'bytes=a-' o 'bytes=-n' (los últimos n).
+    None si no hay rango o no se entiende (se envía el archivo entero); 416 si no es satisfacible.
+    """
+    if not encabezado or not encabezado.startswith("bytes=") or "," in encabezado:
+        return None
+    desde, guion, hasta = encabezado[len("bytes="):].strip().partition("-")
+    if not guion or not (desde + hasta).isdigit():
+        return None
+    if not desde:
+        inicio, fin = max(0, tamanio - int(hasta)), tamanio
+    else:
+        inicio = int(desde)
+        fin = min(int(hasta) + 1, tamanio) if hasta else tamanio
+        if hasta and int(hasta) < inicio:
+            return None
+    if inicio >= tamanio:
+        raise HTTPException(status_code=416, detail="Rango no satisfacible",
+                            headers={"Content-Range": f"bytes */{tamanio}"})
+    return inicio, fin
+
+async def _enviar(vistas):
+    # recorrer los bloques no bloquea: se envían desde el event loop, sin pasar por el threadpool
+    for vista in vistas:
+        yield vista
+
+@router.get("/download")
+def download(ruta: str, request: Request, fs: SistemaArchivos = Depends(get_fs)):
+    """
+    Contenido del archivo en bytes, enviado bloque a bloque desde donde está guardado
+    (sin armar el archivo entero en memoria). Admite Range con un solo rango (206).
+    """
+    archivo, error = fs.abrir(ruta, "r")
+    if error:
+        raise _error_http(error)
+    tamanio = archivo.tamanio
+    rango = _rango(request.headers.get("range"), tamanio)
+    encabezados = {"Accept-Ranges": "bytes"}
+    if rango is None:
+        inicio, fin, estado = 0, tamanio, 200
+    else:
+        inicio, fin = rango
+        estado = 206
+        encabezados["Content-Range"] = f"bytes {inicio}-{fin - 1}/{tamanio}"
+    encabezados["Content-Length"] = str(fin - inicio)
+    return StreamingResponse(_enviar(archivo.vistas(inicio, fin - inicio)), status_code=estado,
+                             media_type="application/octet-stream", headers=encabezados)
+
+@router.put("/upload")
+async def upload(ruta: str, request: Request, permisos: str = "644", desplazamiento: Optional[int] = None,
+                 fs: SistemaArchivos = Depends(get_fs)):
+    """
+    Guarda el cuerpo de la petición en el archivo (lo crea si no existe), fragmento a fragmento.
+    Sin desplazamiento reemplaza el contenido, recién al terminar de recibirlo; con
+    desplazamiento escribe desde ahí sin tocar el resto (para continuar una subida por partes).
+    """
+    if desplazamiento is not None and desplazamiento < 0:
+        raise HTTPException(status_code=400, detail="El desplazamiento no puede ser negativo")
+    archivo, error = fs.abrir(ruta, "w")
+    creado = False
+    if error and error["error"] == "archivo no encontrado":
+        # antes de crear: que el modo sea válido y le deje escribir a quien lo crea
+        try:
+            modo = modo_desde_texto(permisos)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if fs.usuario_actual.uid != 0 and not modo & 0o200:
+            raise HTTPException(status_code=403, detail="permiso denegado para escribir")
+        result = fs.crear_archivo(ruta, "", permisos=permisos)
+        if "error" in result:
+            raise _error_http(result)
+        archivo, error = fs.abrir(ruta, "w")
+        creado = True
+    if error:
+        raise _error_http(error)
+    try:
+        if desplazamiento is None:
+            nuevo = ContenidoBloques()
+            async for fragmento in request.stream():
+                nuevo.agregar(fragmento)
+            archivo.datos = nuevo
+        else:
+            posicion = desplazamiento
+            async for fragmento in request.stream():
+                posicion += archivo.escribir_en(posicion, fragmento)
+    except BaseException as e:
+        # límite de tamaño, cliente desconectado o cancelación: no queda un archivo creado a medias
+        if creado:
+            fs.rm(ruta)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    logger.debug("upload", extra={"ruta": ruta, "desplazamiento": desplazamiento, "tamanio": archivo.tamanio})
+    return {"ok": "archivo creado" if creado else "archivo modificado", "tamanio": archivo.tamanio}
+
 @router.post("/rm")
 def rm(ruta: str, fs: SistemaArchivos = Depends(get_fs)):
     result = fs.rm(ruta)
-    print(f"[DEBUG] rm result: {result}")  # Debug
+    logger.debug("rm", extra={"ruta": ruta, "resultado": result})
     return result
 
 @router.post("/chmod")
@@ -0,0 +1,109 @@
+class HeapIndexado:
+    """
+    Heap binario mínimo con índice de posiciones (id -> posición en el arreglo).
+    Permite cambiar la clave de un elemento (decrease/increase-key) o quitarlo
+    en O(log n), sin reordenar todo el conjunto.
+    Cada entrada es [clave, id, elemento]; las claves deben ser comparables (p. ej. tuplas).
+    """
+
+    def __init__(self):
+        self.datos = []
+        self.posicion = {}
+
+    def __len__(self) -> int:
+        return len(self.datos)
+
+    def __contains__(self, ident) -> bool:
+        return ident in self.posicion
+
+    def push(self, ident, clave, elemento=None) -> None:
+        if ident in self.posicion:
+            raise KeyError(f"El id {ident} ya está en el heap")
+        self.datos.append([clave, ident, elemento])
+        self.posicion[ident] = len(self.datos) - 1
+        self._subir(len(self.datos) - 1)
+
+    def tope(self):
+        """Devuelve (id, clave, elemento) del mínimo sin quitarlo."""
+        clave, ident, elemento = self.datos[0]
+        return ident, clave, elemento
+
+    def pop(self):
+        """Quita y devuelve (id, clave, elemento) del mínimo."""
+        ident, clave, elemento = self.tope()
+        self._quitar_en(0)
+        return ident, clave, elemento
+
+    def ultimo(self):
+        """Id de la última hoja (quitarla no mueve a ningún otro elemento)."""
+        return self.datos[-1][1]
+
+    def clave(self, ident):
+        return self.datos[self.posicion[ident]][0]
+
+    def actualizar(self, ident, clave) -> None:
+        """Cambia la clave de un elemento y lo reubica (sube o baja según corresponda)."""
+        i = self.posicion[ident]
+        anterior = self.datos[i][0]
+        self.datos[i][0] = clave
+        if clave < anterior:
+            self._subir(i)
+        else:
+            self._bajar(i)
+
+    def quitar(self, ident):
+        """Quita un elemento arbitrario y devuelve su entrada (clave, elemento)."""
+        i = self.posicion[ident]
+        clave, _, elemento = self.datos[i]
+        self._quitar_en(i)
+        return clave, elemento
+
+    # ---------------- internos ----------------
+    def _quitar_en(self, i) -> None:
+        ultimo = self.datos.pop()
+        if i == len(self.datos):
+            del self.posicion[ultimo[1]]
+            return
+        del self.posicion[self.datos[i][1]]
+        self.datos[i] = ultimo
+        self.posicion[ultimo[1]] = i
+        self._subir(i)
+        self._bajar(self.posicion[ultimo[1]])
+
+    def _subir(self, i) -> None:
+        # se mueve el "hueco" hacia arriba y se coloca la entrada una sola vez
+        datos = self.datos
+        posicion = self.posicion
+        entrada = datos[i]
+        clave = entrada[0]
+        while i > 0:
+            padre = (i - 1) >> 1
+            arriba = datos[padre]
+            if not clave < arriba[0]:
+                break
+            datos[i] = arriba
+            posicion[arriba[1]] = i
+            i = padre
+        datos[i] = entrada
+        posicion[entrada[1]] = i
+
+    def _bajar(self, i) -> None:
+        datos = self.datos
+        posicion = self.posicion
+        n = len(datos)
+        entrada = datos[i]
+        clave = entrada[0]
+        hijo = 2 * i + 1
+        while hijo < n:
+            der = hijo + 1
+            if der < n and datos[der][0] < datos[hijo][0]:
+                hijo = der
+            abajo = datos[hijo]
+            if not abajo[0] < clave:
+                break
+            datos[i] = abajo
+            posicion[abajo[1]] = i
+            i = hijo
+            hijo = 2 * i + 1
+        datos[i] = entrada
+        posicion[entrada[1]] = i
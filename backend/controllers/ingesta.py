@@ -0,0 +1,206 @@
+import csv
+import json
+from typing import Any, Dict, List
+from starlette.concurrency import run_in_threadpool
+from models.process import Proceso, validar_rafagas
+
+MAX_LARGO_LINEA = 64 * 1024     # una línea más larga se rechaza sin acumularla
+MAX_RECHAZOS_DETALLE = 1000     # filas rechazadas que se devuelven con su error
+
+# Nombres aceptados para cada campo (los mismos alias que /colas/agregar)
+ALIAS = {
+    "pid": ("pid", "PID"),
+    "tiempo_llegada": ("tiempo_llegada", "tiempoLlegada"),
+    "rafaga_cpu": ("rafaga_cpu", "rafaga_CPU"),
+    "prioridad": ("prioridad",),
+    "usuario": ("usuario",),
+    "rafagas": ("rafagas",),
+}
+
+
+async def lineas(fragmentos):
+    """
+    Arma líneas a partir de los fragmentos del cuerpo sin leerlo entero.
+    Entrega (número de línea, texto o None si la línea excede MAX_LARGO_LINEA).
+    """
+    pendiente = b""
+    numero = 0
+    descartando = False     # la línea en curso ya excedió el largo máximo
+    async for fragmento in fragmentos:
+        partes = (pendiente + fragmento).split(b"\n")
+        pendiente = partes.pop()
+        for linea in partes:
+            numero += 1
+            if descartando or len(linea) > MAX_LARGO_LINEA:
+                descartando = False
+                yield numero, None
+            else:
+                yield numero, linea.decode("utf-8", errors="replace").rstrip("\r")
+        if len(pendiente) > MAX_LARGO_LINEA:
+            pendiente = b""
+            descartando = True
+    if descartando:
+        yield numero + 1, None
+    elif pendiente.strip():
+        yield numero + 1, pendiente.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def _entero(fila: Dict[str, Any], campo: str, defecto=None) -> int:
+    for nombre in ALIAS[campo]:
+        if nombre in fila and fila[nombre] not in (None, ""):
+            valor = fila[nombre]
+            if isinstance(valor, int) and not isinstance(valor, bool):
+                return valor
+            if isinstance(valor, float) and valor.is_integer():
+                return int(valor)
+            if isinstance(valor, str) and valor.strip().lstrip("-").isdigit():
+                return int(valor)
+            raise ValueError(f"'{campo}' debe ser entero")
+    if defecto is None:
+        raise ValueError(f"Falta el campo '{campo}'")
+    return defecto
+
+
+def _rafagas(fila: Dict[str, Any]):
+    """Ráfagas CPU / E/S: lista en NDJSON o texto "5;3;2" en CSV. None si no vienen."""
+    valor = fila.get("rafagas")
+    if valor in (None, "", []):
+        return None
+    if isinstance(valor, str):
+        try:
+            valor = [int(parte) for parte in valor.split(";")]
+        except ValueError:
+            raise ValueError("'rafagas' debe ser una lista de enteros separados por ';'")
+    return validar_rafagas(valor)
+
+
+def campos_proceso(fila: Dict[str, Any]):
+    """Valida una fila ya decodificada: (pid, llegada, ráfaga de CPU total, prioridad, ráfagas o None)."""
+    pid = _entero(fila, "pid")
+    llegada = _entero(fila, "tiempo_llegada")
+    rafagas = _rafagas(fila)
+    # con ráfagas de E/S la ráfaga de CPU total sale de ellas
+    rafaga = sum(rafagas[0::2]) if rafagas else _entero(fila, "rafaga_cpu")
+    prioridad = _entero(fila, "prioridad", 1)
+    if llegada < 0:
+        raise ValueError("El tiempo de llegada no puede ser negativo")
+    if rafaga <= 0:
+        raise ValueError("La ráfaga de CPU debe ser positiva")
+    return pid, llegada, rafaga, prioridad, rafagas
+
+
+def proceso_desde_fila(fila: Dict[str, Any]) -> Proceso:
+    """Valida una fila ya decodificada y crea el Proceso (estado Listo)."""
+    pid, llegada, rafaga, prioridad, rafagas = campos_proceso(fila)
+    usuario = fila.get("usuario") or "desconocido"
+    proceso = Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad,
+                      usuario=str(usuario), rafagas=rafagas)
+    proceso.cambiar_estado("Listo")
+    return proceso
+
+
+def fila_ndjson(linea: str) -> Dict[str, Any]:
+    try:
+        fila = json.loads(linea)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON inválido: {e.msg}")
+    if not isinstance(fila, dict):
+        raise ValueError("Cada línea debe ser un objeto JSON")
+    return fila
+
+
+def fila_csv(linea: str, encabezado: List[str]) -> Dict[str, Any]:
+    valores = next(csv.reader([linea]))
+    if len(valores) != len(encabezado):
+        raise ValueError(f"Se esperaban {len(encabezado)} columnas y hay {len(valores)}")
+    return dict(zip(encabezado, valores))
+
+
+def _procesar_lote(filas, formato, encabezado, encolar_lote, pid_en_uso):
+    """
+    Valida y encola un lote de líneas [(número, texto)]; corre en un hilo del threadpool.
+    Devuelve (aceptados, [(número, error)]).
+    """
+    rechazos = []
+    lote = []
+    pids_lote = set()
+    for numero, linea in filas:
+        try:
+            fila = fila_csv(linea, encabezado) if formato == "csv" else fila_ndjson(linea)
+            proceso = proceso_desde_fila(fila)
+        except (ValueError, TypeError, OverflowError, csv.Error) as e:
+            rechazos.append((numero, str(e)))
+            continue
+        pid = proceso.pcb.pid
+        if pid in pids_lote or pid_en_uso(pid):
+            rechazos.append((numero, f"Ya existe un proceso con PID {pid}"))
+            continue
+        lote.append((numero, proceso))
+        pids_lote.add(pid)
+    if not lote:
+        return 0, rechazos
+    try:
+        encolar_lote([proceso for _, proceso in lote])
+        return len(lote), rechazos
+    except ValueError:
+        pass
+    # otra petición encoló alguno de estos PID después del chequeo: se encolan de a uno
+    aceptados = 0
+    for numero, proceso in lote:
+        try:
+            encolar_lote([proceso])
+            aceptados += 1
+        except ValueError:
+            rechazos.append((numero, f"Ya existe un proceso con PID {proceso.pcb.pid}"))
+    rechazos.sort()
+    return aceptados, rechazos
+
+
+async def ingerir(fragmentos, formato: str, encolar_lote, pid_en_uso, tamano_lote=1000):
+    """
+    Lee el cuerpo línea a línea y, cada `tamano_lote` filas, las valida y encola en un hilo
+    aparte (el event loop sigue atendiendo otras peticiones mientras tanto).
+    Se rechazan los PID que ya están en alguna cola o repetidos en el lote.
+    Solo se retienen en memoria el lote actual y hasta MAX_RECHAZOS_DETALLE errores.
+    """
+    aceptados = 0
+    rechazados = 0
+    detalle = []
+    pendientes = []
+    encabezado = None
+
+    def rechazar(numero, error):
+        nonlocal rechazados
+        rechazados += 1
+        if len(detalle) < MAX_RECHAZOS_DETALLE:
+            detalle.append({"linea": numero, "error": error})
+
+    async def procesar():
+        nonlocal aceptados, pendientes
+        filas, pendientes = pendientes, []
+        encolados, rechazos = await run_in_threadpool(
+            _procesar_lote, filas, formato, encabezado, encolar_lote, pid_en_uso
+        )
+        aceptados += encolados
+        for numero, error in rechazos:
+            rechazar(numero, error)
+
+    async for numero, linea in lineas(fragmentos):
+        if linea is None:
+            rechazar(numero, f"Línea de más de {MAX_LARGO_LINEA} bytes")
+            continue
+        if not linea.strip():
+            continue
+        if formato == "csv" and encabezado is None:
+            try:
+                encabezado = [nombre.strip() for nombre in next(csv.reader([linea]))]
+            except csv.Error as e:
+                rechazar(numero, str(e))
+            continue
+        pendientes.append((numero, linea))
+        if len(pendientes) >= tamano_lote:
+            await procesar()
+    if pendientes:
+        await procesar()
+
+    return {"aceptados": aceptados, "rechazados": rechazados, "errores": detalle}
@@ -0,0 +1,294 @@
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter(tags=["Instrumentación"])
+
+# Límites de los histogramas de latencia (segundos)
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _etiquetas(etiquetas: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((clave, str(valor)) for clave, valor in etiquetas.items()))
+
+
+def _formato_etiquetas(etiquetas, extra=()) -> str:
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ""
+    texto = ",".join(
+        '{}="{}"'.format(clave, valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for clave, valor in pares
+    )
+    return "{" + texto + "}"
+
+
+def _formato_valor(valor) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica:
+    """Métrica con etiquetas, segura entre hilos, en formato de texto de Prometheus."""
+
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.valores = {}
+        self._candado = threading.Lock()
+
+    def lineas(self) -> List[str]:
+        with self._candado:
+            valores = list(self.valores.items())
+        return [
+            f"{self.nombre}{_formato_etiquetas(etiquetas)} {_formato_valor(valor)}"
+            for etiquetas, valor in valores
+        ]
+
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def inc(self, valor=1, **etiquetas) -> None:
+        clave = _etiquetas(etiquetas)
+        with self._candado:
+            self.valores[clave] = self.valores.get(clave, 0) + valor
+
+
+class Medidor(Metrica):
+    tipo = "gauge"
+
+    def set(self, valor, **etiquetas) -> None:
+        with self._candado:
+            self.valores[_etiquetas(etiquetas)] = valor
+
+    def inc(self, valor=1, **etiquetas) -> None:
+        clave = _etiquetas(etiquetas)
+        with self._candado:
+            self.valores[clave] = self.valores.get(clave, 0) + valor
+
+    def dec(self, valor=1, **etiquetas) -> None:
+        self.inc(-valor, **etiquetas)
+
+
+class Histograma(Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, limites=LIMITES_LATENCIA):
+        super().__init__(nombre, ayuda)
+        self.limites = tuple(limites)
+
+    def observar(self, valor, **etiquetas) -> None:
+        clave = _etiquetas(etiquetas)
+        with self._candado:
+            datos = self.valores.get(clave)
+            if datos is None:
+                # [cuenta por cubeta (no acumulada)..., suma, cantidad]
+                datos = self.valores[clave] = [0] * len(self.limites) + [0.0, 0]
+            for i, limite in enumerate(self.limites):
+                if valor <= limite:
+                    datos[i] += 1
+                    break
+            datos[-2] += valor
+            datos[-1] += 1
+
+    def lineas(self) -> List[str]:
+        with self._candado:
+            valores = [(etiquetas, list(datos)) for etiquetas, datos in self.valores.items()]
+        lineas = []
+        for etiquetas, datos in valores:
+            acumulado = 0
+            for limite, cuenta in zip(self.limites, datos):
+                acumulado += cuenta
+                extra = (("le", _formato_valor(float(limite))),)
+                lineas.append(f"{self.nombre}_bucket{_formato_etiquetas(etiquetas, extra)} {acumulado}")
+            extra = (("le", "+Inf"),)
+            lineas.append(f"{self.nombre}_bucket{_formato_etiquetas(etiquetas, extra)} {datos[-1]}")
+            lineas.append(f"{self.nombre}_sum{_formato_etiquetas(etiquetas)} {_formato_valor(datos[-2])}")
+            lineas.append(f"{self.nombre}_count{_formato_etiquetas(etiquetas)} {datos[-1]}")
+        return lineas
+
+
+class Registro:
+    """
+    Métricas del servidor. Además de las métricas propias acepta recolectores:
+    funciones que al exponer devuelven [(nombre, tipo, ayuda, valor)] leyendo
+    contadores que ya existen en otros módulos (cache, filesystem, colas).
+    """
+
+    def __init__(self):
+        self.metricas: List[Metrica] = []
+        self.recolectores: List[Callable] = []
+
+    def registrar(self, metrica: Metrica) -> Metrica:
+        self.metricas.append(metrica)
+        return metrica
+
+    def contador(self, nombre, ayuda) -> Contador:
+        return self.registrar(Contador(nombre, ayuda))
+
+    def medidor(self, nombre, ayuda) -> Medidor:
+        return self.registrar(Medidor(nombre, ayuda))
+
+    def histograma(self, nombre, ayuda, limites=LIMITES_LATENCIA) -> Histograma:
+        return self.registrar(Histograma(nombre, ayuda, limites))
+
+    def registrar_recolector(self, recolector: Callable) -> None:
+        self.recolectores.append(recolector)
+
+    def exponer(self) -> str:
+        lineas = []
+        for metrica in self.metricas:
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.extend(metrica.lineas())
+        for recolector in self.recolectores:
+            for nombre, tipo, ayuda, valor in recolector():
+                lineas.append(f"# HELP {nombre} {ayuda}")
+                lineas.append(f"# TYPE {nombre} {tipo}")
+                lineas.append(f"{nombre} {_formato_valor(valor)}")
+        return "\n".join(lineas) + "\n"
+
+
+REGISTRO = Registro()
+
+PETICIONES_EN_CURSO = REGISTRO.medidor(
+    "http_peticiones_en_curso", "Peticiones HTTP que se están atendiendo")
+DURACION_PETICIONES = REGISTRO.histograma(
+    "http_duracion_peticion_segundos", "Latencia de las peticiones HTTP por ruta")
+SIMULACIONES = REGISTRO.contador(
+    "simulador_simulaciones_total", "Simulaciones completas ejecutadas en este proceso")
+EVENTOS_SIMULADOS = REGISTRO.contador(
+    "simulador_eventos_procesados_total", "Eventos procesados por el simulador")
+TICKS_SIMULADOS = REGISTRO.contador(
+    "simulador_ticks_total", "Unidades de tiempo simuladas")
+SEGUNDOS_SIMULANDO = REGISTRO.contador(
+    "simulador_segundos_total", "Tiempo real dedicado a simular")
+TICKS_POR_SEGUNDO = REGISTRO.medidor(
+    "simulador_ticks_por_segundo", "Unidades simuladas por segundo en la última simulación")
+
+
+def registrar_simulacion(simulador, segundos: float) -> None:
+    """Suma los contadores del simulador al terminar una simulación."""
+    SIMULACIONES.inc()
+    EVENTOS_SIMULADOS.inc(simulador.eventos_procesados)
+    TICKS_SIMULADOS.inc(simulador.reloj)
+    SEGUNDOS_SIMULANDO.inc(segundos)
+    if segundos > 0:
+        TICKS_POR_SEGUNDO.set(simulador.reloj / segundos)
+
+
+class MedirPeticiones:
+    """
+    Middleware ASGI: peticiones en curso y latencia por método, ruta y código.
+    Se etiqueta con la plantilla de la ruta (/colas/procesos/{pid}), no con la URL,
+    para que la cantidad de series no crezca con los parámetros. La latencia incluye
+    el envío completo del cuerpo (también en las respuestas en streaming).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inicio = time.perf_counter()
+        estado = {"codigo": 500}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        PETICIONES_EN_CURSO.inc()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            PETICIONES_EN_CURSO.dec()
+            ruta = scope.get("route")
+            DURACION_PETICIONES.observar(
+                time.perf_counter() - inicio,
+                metodo=scope["method"],
+                ruta=getattr(ruta, "path", "sin_ruta"),
+                codigo=estado["codigo"],
+            )
+
+
+_escucha_logs = None
+
+# Atributos propios de todo LogRecord; lo demás llegó por extra= y va como campo del JSON
+_ATRIBUTOS_REGISTRO = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por línea: tiempo, nivel, logger, mensaje y los campos pasados con extra=."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "tiempo": self.formatTime(record),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for clave, valor in record.__dict__.items():
+            if clave not in _ATRIBUTOS_REGISTRO:
+                datos[clave] = valor
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=repr)
+
+
+class _EncoladorLogs(logging.handlers.QueueHandler):
+    """QueueHandler que deja el mensaje sin la traza: la excepción viaja en su propio campo."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.excepcion = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.exc_text = None
+        return record
+
+
+def configurar_logging() -> None:
+    """
+    Logging de los módulos del backend (controllers.*, models.*).
+    El nivel sale de la variable NIVEL_LOG (WARNING por defecto): los mensajes por
+    debajo no se formatean. Cada registro sale como una línea JSON (FormatoJSON) con
+    los campos de extra=. La escritura la hace un hilo aparte (QueueHandler), así
+    una ruta nunca espera a la consola.
+    """
+    global _escucha_logs
+    if _escucha_logs is not None:
+        return
+    nivel = getattr(logging, os.environ.get("NIVEL_LOG", "WARNING").upper(), None)
+    if not isinstance(nivel, int):
+        nivel = logging.WARNING
+    salida = logging.StreamHandler()
+    salida.setFormatter(FormatoJSON())
+    cola = queue.SimpleQueue()
+    _escucha_logs = logging.handlers.QueueListener(cola, salida)
+    _escucha_logs.start()
+    for nombre in ("controllers", "models"):
+        logger = logging.getLogger(nombre)
+        logger.setLevel(nivel)
+        logger.addHandler(_EncoladorLogs(cola))
+        logger.propagate = False
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metricas():
+    """Métricas en formato de texto de Prometheus."""
+    return PlainTextResponse(REGISTRO.exponer(), media_type="text/plain; version=0.0.4; charset=utf-8")
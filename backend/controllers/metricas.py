@@ -0,0 +1,114 @@
+import math
+from typing import Any, Dict
+
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+class SketchCuantiles:
+    """
+    Resumen de una serie de enteros no negativos en memoria acotada.
+    - Los valores menores que `exactos` se cuentan tal cual (tiempos chicos sin error).
+    - Los mayores van a cubetas logarítmicas: el valor que se reporta para un cuantil
+      difiere del real en menos de `error_relativo` (como en DDSketch).
+    Con valores de 64 bits hay a lo sumo unas pocas miles de cubetas, sin importar
+    cuántos valores se agreguen.
+    """
+
+    def __init__(self, error_relativo=0.01, exactos=1024):
+        if not 0 < error_relativo < 1:
+            raise ValueError("El error relativo debe estar entre 0 y 1")
+        self.exactos = exactos
+        self.gamma = (1 + error_relativo) / (1 - error_relativo)
+        self._log_gamma = math.log(self.gamma)
+        self.cubetas: Dict[int, int] = {}   # valor exacto, o -(índice logarítmico) - 1
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+
+    def agregar(self, valor: int) -> None:
+        if valor < 0:
+            raise ValueError("Solo se admiten valores no negativos")
+        if valor < self.exactos:
+            clave = valor
+        else:
+            clave = -math.ceil(math.log(valor) / self._log_gamma) - 1
+        self.cubetas[clave] = self.cubetas.get(clave, 0) + 1
+        self.cantidad += 1
+        self.suma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    def _representante(self, clave: int) -> int:
+        if clave >= 0:
+            return clave
+        indice = -clave - 1
+        # los tiempos del simulador son enteros: se redondea el centro de la cubeta
+        return round(2 * self.gamma ** indice / (self.gamma + 1))
+
+    def cuantiles(self, qs=CUANTILES):
+        """Valor de cada cuantil (rango más cercano), acotado a [mínimo, máximo]."""
+        if self.cantidad == 0:
+            return [None] * len(qs)
+        # las claves negativas son logarítmicas y crecen hacia el -infinito
+        orden = sorted(self.cubetas, key=lambda c: (c < 0, -c if c < 0 else c))
+        rangos = sorted((max(1, math.ceil(q * self.cantidad)), i) for i, q in enumerate(qs))
+        resultado = [None] * len(qs)
+        acumulado = 0
+        j = 0
+        for clave in orden:
+            acumulado += self.cubetas[clave]
+            while j < len(rangos) and rangos[j][0] <= acumulado:
+                valor = self._representante(clave)
+                resultado[rangos[j][1]] = min(max(valor, self.minimo), self.maximo)
+                j += 1
+            if j == len(rangos):
+                break
+        return resultado
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p95, p99 = self.cuantiles()
+        return {
+            "promedio": self.suma / self.cantidad if self.cantidad else 0.0,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+        }
+
+
+class MetricasAgregadas:
+    """
+    Métricas de una simulación calculadas a medida que terminan los procesos.
+    El simulador llama a `registrar(pcb)` al cerrar cada PCB; no se guarda nada por proceso.
+    """
+
+    def __init__(self):
+        self.espera = SketchCuantiles()
+        self.retorno = SketchCuantiles()
+        self.respuesta = SketchCuantiles()
+        self.terminados = 0
+        self.tiempo_cpu = 0     # suma de ráfagas ejecutadas
+
+    def registrar(self, pcb) -> None:
+        self.terminados += 1
+        self.tiempo_cpu += pcb.rafaga_original
+        self.espera.agregar(pcb.tiempo_espera)
+        self.retorno.agregar(pcb.tiempo_retorno)
+        self.respuesta.agregar(pcb.tiempo_inicio - pcb.tiempo_llegada)
+
+    def resultado(self, tiempo_total: int, cambios_contexto: int, num_cpus=1) -> Dict[str, Any]:
+        capacidad = tiempo_total * num_cpus
+        return {
+            "procesos": self.terminados,
+            "tiempo_total": tiempo_total,
+            "throughput": self.terminados / tiempo_total if tiempo_total > 0 else 0.0,
+            "utilizacion_cpu": self.tiempo_cpu / capacidad if capacidad > 0 else 0.0,
+            "cambios_contexto": cambios_contexto,
+            "espera": self.espera.to_dict(),
+            "retorno": self.retorno.to_dict(),
+            "respuesta": self.respuesta.to_dict(),
+        }
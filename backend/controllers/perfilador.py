@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+from collections import Counter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter(prefix="/perfil", tags=["Perfilador"])
+
+MAX_PROFUNDIDAD = 64        # marcos por pila
+MAX_PILAS = 10000           # pilas distintas; las demás se cuentan juntas
+INTERVALO_MINIMO_MS = 1
+
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo: un hilo aparte lee cada `intervalo` segundos la pila de
+    todos los hilos (sys._current_frames) y cuenta cuántas veces aparece cada una.
+    No instrumenta funciones, así que el costo no depende de lo que se ejecute.
+    El resultado se entrega como pilas colapsadas ("a;b;c cantidad"), el formato
+    que leen flamegraph.pl y speedscope.
+    """
+
+    def __init__(self):
+        self.pilas = Counter()
+        self.muestras = 0
+        self.intervalo = None
+        self._hilo = None
+        self._detener = threading.Event()
+        self._candado = threading.Lock()         # iniciar / detener
+        self._candado_pilas = threading.Lock()   # el hilo escribe mientras se lee el resultado
+
+    def activo(self) -> bool:
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self, intervalo: float) -> None:
+        with self._candado:
+            if self.activo():
+                raise RuntimeError("El perfilador ya está activo")
+            with self._candado_pilas:
+                self.pilas = Counter()
+                self.muestras = 0
+            self.intervalo = intervalo
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+            self._hilo.start()
+
+    def detener(self) -> None:
+        with self._candado:
+            self._detener.set()
+            if self._hilo is not None:
+                self._hilo.join()
+                self._hilo = None
+
+    def _muestrear(self) -> None:
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            claves = []
+            for ident, marco in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila = []
+                while marco is not None and len(pila) < MAX_PROFUNDIDAD:
+                    codigo = marco.f_code
+                    pila.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                    marco = marco.f_back
+                claves.append(";".join(reversed(pila)))
+            with self._candado_pilas:
+                for clave in claves:
+                    if clave not in self.pilas and len(self.pilas) >= MAX_PILAS:
+                        clave = "[otras]"
+                    self.pilas[clave] += 1
+                self.muestras += 1
+
+    def colapsado(self) -> str:
+        with self._candado_pilas:
+            pilas = self.pilas.most_common()
+        return "".join(f"{pila} {cantidad}\n" for pila, cantidad in pilas)
+
+
+perfilador = PerfiladorMuestreo()
+
+
+# --- Rutas de API (solo se registran con PERFILADOR=1) ---
+
+@router.post("/iniciar")
+def iniciar_perfil(intervalo_ms: int = 10):
+    if intervalo_ms < INTERVALO_MINIMO_MS:
+        raise HTTPException(status_code=400, detail=f"El intervalo mínimo es {INTERVALO_MINIMO_MS} ms")
+    try:
+        perfilador.iniciar(intervalo_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"mensaje": "Perfilador iniciado", "intervalo_ms": intervalo_ms}
+
+
+@router.post("/detener")
+def detener_perfil():
+    perfilador.detener()
+    return {"mensaje": "Perfilador detenido", "muestras": perfilador.muestras}
+
+
+@router.get("", response_class=PlainTextResponse)
+def obtener_perfil():
+    """Pilas colapsadas acumuladas desde el último inicio (se puede leer sin detener)."""
+    return PlainTextResponse(perfilador.colapsado())
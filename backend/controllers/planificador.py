@@ -1,11 +1,48 @@
-from collections import deque
+import time
+from controllers.simulador import (
+    SimuladorEventos, PoliticaFCFS, PoliticaMLFQ, PoliticaPrioridad, PoliticaRR, PoliticaSJF,
+    PoliticaSRTF
+)
+
+from controllers.simulador_smp import SimuladorSMP
+from controllers.metricas import MetricasAgregadas
+from controllers.exportacion import ResultadoColumnar
+from controllers.instrumentacion import registrar_simulacion
+
+
+def fabrica_politica(algoritmo, quantum=2, envejecimiento=0, quantums=(2, 4, 8), periodo_boost=0):
+    """Devuelve una función que crea la política pedida (una instancia por CPU), o None."""
+    fabricas = {
+        "fcfs": lambda: PoliticaFCFS(),
+        "sjf": lambda: PoliticaSJF(),
+        "rr": lambda: PoliticaRR(quantum),
+        "srtf": lambda: PoliticaSRTF(),
+        "prioridad": lambda: PoliticaPrioridad(False, envejecimiento),
+        "prioridad_expropiativo": lambda: PoliticaPrioridad(True, envejecimiento),
+        "mlfq": lambda: PoliticaMLFQ(quantums, periodo_boost),
+    }
+    return fabricas.get(algoritmo)
 
 class Planificador:
 
+    def _simular(self, politica, procesos, resumen=False):
+        """
+        Ejecuta la simulación por eventos y devuelve los PCB en orden de finalización.
+        Con `resumen` devuelve solo las métricas agregadas, calculadas durante la simulación.
+        """
+        metricas = MetricasAgregadas() if resumen else None
+        simulador = SimuladorEventos(politica, procesos, metricas=metricas)
+        inicio = time.perf_counter()
+        terminados = simulador.ejecutar()
+        registrar_simulacion(simulador, time.perf_counter() - inicio)
+        if resumen:
+            return metricas.resultado(simulador.reloj, simulador.cambios_contexto)
+        return [proceso.pcb.to_dict() for proceso in terminados]
+
     # ---------------------------------------------------------------
     #   ALGORITMO FCFS — First Come First Served
     # ---------------------------------------------------------------
-    def fcfs(self, procesos):
+    def fcfs(self, procesos, resumen=False):
         """
         MACROALGORITMO FCFS (First Come First Served)
         1. Ordenar procesos por tiempo de llegada.
@@ -13,119 +50,191 @@ class Planificador:
         3. No existen interrupciones por tiempo (no expropiativo).
         4. Calcular tiempos de espera, finalización y retorno.
         """
-
-        # Ordenar por tiempo de llegada
-        procesos = sorted(procesos, key=lambda p: (p.pcb.tiempo_llegada, p.pcb.pid)
-)
-
-
-        tiempo_actual = 0
-        resultados = []
-
-        for proceso in procesos:
-            pcb = proceso.pcb
-
-            # Si el proceso llega después, esperamos
-            if tiempo_actual < pcb.tiempo_llegada:
-                tiempo_actual = pcb.tiempo_llegada
-
-            # Tiempo de espera antes de ejecutarse
-            pcb.tiempo_espera = tiempo_actual - pcb.tiempo_llegada
-
-            # Ejecutar por toda su ráfaga
-            tiempo_actual += pcb.rafaga_original
-
-            # Tiempo de finalización
-            pcb.tiempo_finalizacion = tiempo_actual
-
-            # Turnaround
-            pcb.tiempo_retorno = pcb.tiempo_finalizacion - pcb.tiempo_llegada
-
-            resultados.append(pcb.to_dict())
-
-        return resultados
+        return self._simular(PoliticaFCFS(), procesos, resumen)
 
 
 
     # ---------------------------------------------------------------
     #   ALGORITMO ROUND ROBIN — CPU con quantum fijo
     # ---------------------------------------------------------------
-    def round_robin(self, procesos, quantum=2):
+    def round_robin(self, procesos, quantum=2, resumen=False):
         """
         MACROALGORITMO ROUND ROBIN
-        1. Mantener una cola circular de procesos listos.
+        1. Mantener una cola circular de procesos listos (en orden de llegada).
         2. Asignar quantum de tiempo a cada proceso.
         3. Si el proceso no termina, vuelve al final de la cola.
         4. Repetir hasta que todos finalicen.
         """
+        return self._simular(PoliticaRR(quantum), procesos, resumen)
+
+
+
+    # ---------------------------------------------------------------
+    #   ALGORITMO SJF — Shortest Job First
+    # ---------------------------------------------------------------
+    def sjf(self, procesos, resumen=False):
+        """
+        MACROALGORITMO SJF (Shortest Job First — No expropiativo)
+        1. Entre los procesos que ya llegaron, elegir la ráfaga CPU más corta.
+        2. Ejecutar completamente el proceso elegido.
+        3. No expropiativo: no se interrumpe la ejecución.
+        """
+        return self._simular(PoliticaSJF(), procesos, resumen)
+
 
-        cola = deque(procesos)
-        tiempo_actual = 0
-        resultados = []
 
-        while cola:
-            proceso = cola.popleft()
-            pcb = proceso.pcb
+    # ---------------------------------------------------------------
+    #   ALGORITMO SRTF — Shortest Remaining Time First
+    # ---------------------------------------------------------------
+    def srtf(self, procesos, resumen=False):
+        """
+        MACROALGORITMO SRTF (SJF expropiativo)
+        1. Mantener los listos en un heap indexado por ráfaga restante.
+        2. Ejecutar el de menor ráfaga restante.
+        3. Si llega uno con menor restante que el que está en CPU, expropiar.
+        """
+        return self._simular(PoliticaSRTF(), procesos, resumen)
 
-            # Si el proceso llega más tarde, avanzamos el tiempo
-            if tiempo_actual < pcb.tiempo_llegada:
-                tiempo_actual = pcb.tiempo_llegada
 
-            # Tiempo ejecutado = min(quantum, ráfaga restante)
-            ejecucion = min(quantum, pcb.tiempo_restante)
 
-            pcb.tiempo_restante -= ejecucion
-            tiempo_actual += ejecucion
+    # ---------------------------------------------------------------
+    #   ALGORITMO POR PRIORIDAD (con envejecimiento opcional)
+    # ---------------------------------------------------------------
+    def prioridad(self, procesos, expropiativo=False, envejecimiento=0, resumen=False):
+        """
+        MACROALGORITMO POR PRIORIDAD
+        1. Elegir el proceso listo con menor número de prioridad.
+        2. Expropiativo: si aparece uno con mejor prioridad, desplaza al de CPU.
+        3. Envejecimiento: cada `envejecimiento` unidades de espera la prioridad
+           efectiva mejora en 1, evitando la inanición.
+        """
+        return self._simular(PoliticaPrioridad(expropiativo, envejecimiento), procesos, resumen)
+
 
-            # Si terminó su CPU
-            if pcb.tiempo_restante == 0:
-                pcb.tiempo_finalizacion = tiempo_actual
-                pcb.tiempo_retorno = pcb.tiempo_finalizacion - pcb.tiempo_llegada
-                resultados.append(pcb.to_dict())
-            else:
-                # Regresa a cola para seguir en otro turno
-                cola.append(proceso)
 
-        return resultados
+    # ---------------------------------------------------------------
+    #   ALGORITMO MLFQ — Multi-Level Feedback Queue
+    # ---------------------------------------------------------------
+    def mlfq(self, procesos, quantums=(2, 4, 8), periodo_boost=0, resumen=False):
+        """
+        MACROALGORITMO MLFQ
+        1. Todo proceso nuevo entra al nivel de mayor prioridad.
+        2. Se atiende siempre el nivel más alto con procesos (bitmap, O(1)).
+        3. Quien agota el quantum de su nivel baja al siguiente.
+        4. Cada `periodo_boost` unidades todos vuelven al nivel más alto.
+        """
+        return self._simular(PoliticaMLFQ(quantums, periodo_boost), procesos, resumen)
 
 
 
     # ---------------------------------------------------------------
-    #   ALGORITMO SJF — Shortest Job First
+    #   MULTIPROCESADOR (SMP) — una cola de listos por CPU
     # ---------------------------------------------------------------
-    def sjf(self, procesos):
+    def smp(self, procesos, fabrica, num_cpus=2, periodo_balance=0, robo=True, resumen=False):
         """
-        MACROALGORITMO SJF (Shortest Job First — No expropiativo)
-        1. Ordenar procesos por ráfaga CPU más corta.
-        2. Ejecutar completamente el proceso más corto.
-        3. No expropiativo: no se interrumpe la ejecución.
+        MACROALGORITMO SMP
+        1. Cada CPU planifica su propia cola con la política elegida.
+        2. Las llegadas van a la CPU menos cargada.
+        3. Balanceo periódico de colas y robo de trabajo en CPUs ociosas.
+        4. Se reporta en qué CPU corrió cada tramo y la utilización por CPU
+           (o, con `resumen`, solo las métricas agregadas y el detalle por CPU).
         """
+        metricas = MetricasAgregadas() if resumen else None
+        simulador = SimuladorSMP(fabrica, procesos, num_cpus, periodo_balance, robo, metricas)
+        inicio = time.perf_counter()
+        terminados = simulador.ejecutar()
+        registrar_simulacion(simulador, time.perf_counter() - inicio)
+        if resumen:
+            resultado = metricas.resultado(
+                simulador.reloj, simulador.total_cambios_contexto(), num_cpus
+            )
+            resultado["cpus"] = simulador.resumen_cpus()
+            return resultado
+        duracion = simulador.reloj
+        return {
+            "procesos": [proceso.pcb.to_dict() for proceso in terminados],
+            "tramos": [
+                {"pid": pid, "cpu": cpu, "inicio": inicio, "fin": fin}
+                for pid, cpu, inicio, fin in simulador.tramos
+            ],
+            "cpus": simulador.resumen_cpus(),
+            "tiempo_total": duracion,
+            "throughput": len(terminados) / duracion if duracion > 0 else 0.0,
+        }
 
-        # Ordenar por ráfaga CPU ascendente
-        procesos = sorted(procesos, key=lambda p: (p.pcb.rafaga_cpu, p.pcb.pid)
-        )
 
-        tiempo_actual = 0
-        resultados = []
 
-        for proceso in procesos:
-            pcb = proceso.pcb
-            
-            #Si el proceso llega después del tiempo actual, el CPU queda inactivo, se avanza el reloj
-            if tiempo_actual < pcb.tiempo_llegada:
-                tiempo_actual = pcb.tiempo_llegada
+    # ---------------------------------------------------------------
+    #   REPRODUCCIÓN DE TRAZAS — cargas que no entran en memoria
+    # ---------------------------------------------------------------
+    def reproducir(self, fuente, fabrica, num_cpus=1, periodo_balance=0, robo=True):
+        """
+        MACROALGORITMO REPRODUCCIÓN
+        1. Leer los procesos de la fuente (en orden de llegada) de a uno, recién
+           cuando el reloj alcanza la llegada anterior.
+        2. Simular con la política elegida (1 o varias CPUs) sin guardar tramos.
+        3. Registrar las métricas de cada proceso al terminar y soltarlo.
+        4. Devolver solo las métricas agregadas: la memoria depende de los procesos
+           vivos a la vez, no del largo de la traza.
+        """
+        metricas = MetricasAgregadas()
+        if num_cpus == 1:
+            simulador = SimuladorEventos(fabrica(), [], metricas=metricas, fuente=fuente,
+                                         guardar_terminados=False)
+        else:
+            simulador = SimuladorSMP(fabrica, [], num_cpus, periodo_balance, robo, metricas,
+                                     fuente=fuente, guardar_terminados=False, registrar_tramos=False)
+        inicio = time.perf_counter()
+        simulador.ejecutar()
+        registrar_simulacion(simulador, time.perf_counter() - inicio)
+        if num_cpus == 1:
+            return metricas.resultado(simulador.reloj, simulador.cambios_contexto)
+        resultado = metricas.resultado(simulador.reloj, simulador.total_cambios_contexto(), num_cpus)
+        resultado["cpus"] = simulador.resumen_cpus()
+        return resultado
 
-            pcb.tiempo_espera = tiempo_actual - pcb.tiempo_llegada
 
-            # Ejecutar por toda su ráfaga
-            tiempo_actual += pcb.rafaga_original
 
-            # Tiempo de finalización
-            pcb.tiempo_finalizacion = tiempo_actual
+    # ---------------------------------------------------------------
+    #   EXPORTACIÓN COLUMNAR — resultados y tramos sin JSON
+    # ---------------------------------------------------------------
+    def exportar(self, procesos, fabrica, num_cpus=1, periodo_balance=0, robo=True):
+        """
+        MACROALGORITMO EXPORTACIÓN
+        1. Simular con la política elegida registrando cada tramo ejecutado.
+        2. Agregar cada tramo y cada PCB cerrado a columnas int64 (8 bytes por valor),
+           sin conservar los procesos terminados ni armar diccionarios.
+        3. Devolver las columnas (ResultadoColumnar) para escribirlas como .npz.
+        """
+        resultado = ResultadoColumnar()
+        if num_cpus == 1:
+            simulador = SimuladorEventos(fabrica(), procesos, registrar_tramos=True, metricas=resultado,
+                                         guardar_terminados=False)
+        else:
+            simulador = SimuladorSMP(fabrica, procesos, num_cpus, periodo_balance, robo, resultado,
+                                     guardar_terminados=False)
+        inicio = time.perf_counter()
+        for tramo in simulador.linea_de_tiempo():
+            resultado.agregar_tramo(*tramo)
+        registrar_simulacion(simulador, time.perf_counter() - inicio)
+        return resultado
 
-            # Turnaround
-            pcb.tiempo_retorno = tiempo_actual - pcb.tiempo_llegada
 
-            resultados.append(pcb.to_dict())
 
-        return resultados
+    # ---------------------------------------------------------------
+    #   LÍNEA DE TIEMPO (Gantt) — tramos a medida que se simulan
+    # ---------------------------------------------------------------
+    def linea_de_tiempo(self, procesos, fabrica, num_cpus=1, periodo_balance=0, robo=True):
+        """
+        MACROALGORITMO LÍNEA DE TIEMPO
+        1. Simular con la política elegida registrando cada tramo ejecutado.
+        2. Entregar cada tramo {pid, cpu, inicio, fin} apenas se produce (generador).
+        3. No se acumulan resultados: la memoria no crece con la duración.
+        """
+        if num_cpus == 1:
+            simulador = SimuladorEventos(fabrica(), procesos, registrar_tramos=True, guardar_terminados=False)
+        else:
+            simulador = SimuladorSMP(fabrica, procesos, num_cpus, periodo_balance, robo,
+                                     guardar_terminados=False)
+        for pid, cpu, inicio, fin in simulador.linea_de_tiempo():
+            yield {"pid": pid, "cpu": cpu, "inicio": inicio, "fin": fin}
@@ -0,0 +1,99 @@
+import heapq
+import numpy as np
+
+# Columnas de entrada y de salida del modo por lotes (mismos nombres que PCB.to_dict)
+COLUMNAS_ENTRADA = ("pid", "tiempo_llegada", "rafaga_cpu", "prioridad")
+COLUMNAS_SALIDA = COLUMNAS_ENTRADA + (
+    "tiempo_inicio", "tiempo_finalizacion", "tiempo_espera", "tiempo_retorno"
+)
+
+
+def _columnas(pid, llegada, rafaga, prioridad=None):
+    """Convierte las columnas a arreglos int64 y valida que sean consistentes."""
+    pid = np.asarray(pid, dtype=np.int64)
+    llegada = np.asarray(llegada, dtype=np.int64)
+    rafaga = np.asarray(rafaga, dtype=np.int64)
+    if prioridad is None:
+        prioridad = np.ones_like(pid)
+    else:
+        prioridad = np.asarray(prioridad, dtype=np.int64)
+
+    n = len(pid)
+    if not (len(llegada) == len(rafaga) == len(prioridad) == n):
+        raise ValueError("Todas las columnas deben tener la misma longitud")
+    if n and rafaga.min() <= 0:
+        raise ValueError("Las ráfagas de CPU deben ser positivas")
+    if n and llegada.min() < 0:
+        raise ValueError("Los tiempos de llegada no pueden ser negativos")
+    return pid, llegada, rafaga, prioridad
+
+
+def _metricas_en_orden(orden, pid, llegada, rafaga, prioridad):
+    """
+    Dado el orden de ejecución (no expropiativo), calcula todo con sumas acumuladas:
+        fin_i = max(fin_{i-1}, llegada_i) + rafaga_i
+    que equivale a  fin_i = S_i + max_{j<=i}(llegada_j - S_{j-1}),  con S = cumsum(rafaga).
+    """
+    llegada = llegada[orden]
+    rafaga = rafaga[orden]
+    acumulada = np.cumsum(rafaga)
+    holgura = llegada - (acumulada - rafaga)
+    fin = acumulada + np.maximum.accumulate(holgura)
+    inicio = fin - rafaga
+    retorno = fin - llegada
+    return {
+        "pid": pid[orden],
+        "tiempo_llegada": llegada,
+        "rafaga_cpu": rafaga,
+        "prioridad": prioridad[orden],
+        "tiempo_inicio": inicio,
+        "tiempo_finalizacion": fin,
+        "tiempo_espera": inicio - llegada,
+        "tiempo_retorno": retorno,
+    }
+
+
+def fcfs_lote(pid, llegada, rafaga, prioridad=None):
+    """
+    FCFS por lotes sobre columnas. Devuelve un dict de arreglos en orden de ejecución.
+    Mismo desempate que el simulador: (tiempo_llegada, pid).
+    """
+    pid, llegada, rafaga, prioridad = _columnas(pid, llegada, rafaga, prioridad)
+    orden = np.lexsort((pid, llegada))
+    return _metricas_en_orden(orden, pid, llegada, rafaga, prioridad)
+
+
+def sjf_lote(pid, llegada, rafaga, prioridad=None):
+    """
+    SJF no expropiativo por lotes. El orden depende de qué procesos ya llegaron,
+    así que se arma con un heap sobre enteros (sin objetos Proceso/PCB);
+    las métricas se calculan después de forma vectorizada.
+    """
+    pid, llegada, rafaga, prioridad = _columnas(pid, llegada, rafaga, prioridad)
+    n = len(pid)
+    por_llegada = np.lexsort((pid, llegada))
+    llegadas = llegada[por_llegada].tolist()
+    rafagas = rafaga[por_llegada].tolist()
+    pids = pid[por_llegada].tolist()
+
+    orden = np.empty(n, dtype=np.int64)
+    listos = []
+    reloj = 0
+    siguiente = 0
+    for k in range(n):
+        if not listos and reloj < llegadas[siguiente]:
+            reloj = llegadas[siguiente]   # CPU ociosa hasta la próxima llegada
+        while siguiente < n and llegadas[siguiente] <= reloj:
+            heapq.heappush(listos, (rafagas[siguiente], pids[siguiente], siguiente))
+            siguiente += 1
+        r, _, i = heapq.heappop(listos)
+        orden[k] = i
+        reloj += r
+
+    return _metricas_en_orden(por_llegada[orden], pid, llegada, rafaga, prioridad)
+
+
+ALGORITMOS_LOTE = {
+    "fcfs": fcfs_lote,
+    "sjf": sjf_lote,
+}
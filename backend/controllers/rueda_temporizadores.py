@@ -0,0 +1,104 @@
+import heapq
+from itertools import count
+
+BITS = 8                    # 256 ranuras por nivel
+RANURAS = 1 << BITS
+MASCARA = RANURAS - 1
+NIVELES = 4                 # cubre 2**32 unidades por delante del reloj; lo demás desborda
+
+
+class RuedaTemporizadores:
+    """
+    Rueda de temporizadores jerárquica (Varghese y Lauck), para tiempos enteros absolutos.
+    - Un temporizador va al nivel del bloque de BITS más alto en el que su tiempo
+      difiere del reloj de la rueda, en la ranura que indica ese bloque. Programar es O(1).
+    - Cada nivel tiene un bitmap de ranuras ocupadas: el próximo vencimiento es la
+      ranura más baja del nivel más bajo con temporizadores (bit menos significativo),
+      sin recorrer ranuras vacías. Cada ranura recuerda su mínimo.
+    - Al avanzar el reloj, la ranura que pasa a contenerlo se reparte en los niveles
+      de abajo (cascada). Un temporizador baja a lo sumo NIVELES veces: vencer es O(1)
+      amortizado por temporizador.
+    - Los tiempos que difieren del reloj por encima de los NIVELES esperan en un heap
+      de desborde hasta que el reloj entra en su rango.
+    """
+
+    def __init__(self, inicio=0):
+        self.actual = inicio
+        self.ranuras = [[None] * RANURAS for _ in range(NIVELES)]   # [mínimo, [(tiempo, elemento)]]
+        self.bitmaps = [0] * NIVELES
+        self.desborde = []          # heap (tiempo, orden, elemento)
+        self._orden = count()
+        self._cantidad = 0
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def programar(self, tiempo: int, elemento) -> None:
+        """Agenda `elemento` para vencer en el instante `tiempo` (>= reloj de la rueda)."""
+        if tiempo < self.actual:
+            raise ValueError(f"El instante {tiempo} ya pasó (reloj de la rueda: {self.actual})")
+        self._cantidad += 1
+        self._ubicar(tiempo, elemento)
+
+    def _ubicar(self, tiempo, elemento) -> None:
+        nivel = ((tiempo ^ self.actual).bit_length() - 1) // BITS if tiempo != self.actual else 0
+        if nivel >= NIVELES:
+            heapq.heappush(self.desborde, (tiempo, next(self._orden), elemento))
+            return
+        indice = (tiempo >> (nivel * BITS)) & MASCARA
+        ranura = self.ranuras[nivel][indice]
+        if ranura is None:
+            self.ranuras[nivel][indice] = [tiempo, [(tiempo, elemento)]]
+            self.bitmaps[nivel] |= 1 << indice
+        else:
+            if tiempo < ranura[0]:
+                ranura[0] = tiempo
+            ranura[1].append((tiempo, elemento))
+
+    def proximo(self):
+        """Instante del próximo vencimiento (o None)."""
+        for nivel in range(NIVELES):
+            bitmap = self.bitmaps[nivel]
+            if bitmap:
+                indice = (bitmap & -bitmap).bit_length() - 1
+                return self.ranuras[nivel][indice][0]
+        return self.desborde[0][0] if self.desborde else None
+
+    def vencer(self, tiempo: int):
+        """Avanza el reloj de la rueda hasta `tiempo` y devuelve lo vencido, en orden de tiempo."""
+        vencidos = []
+        while True:
+            proximo = self.proximo()
+            if proximo is None or proximo > tiempo:
+                break
+            self._avanzar(proximo)
+            indice = proximo & MASCARA
+            _, entradas = self.ranuras[0][indice]
+            self.ranuras[0][indice] = None
+            self.bitmaps[0] &= ~(1 << indice)
+            self._cantidad -= len(entradas)
+            vencidos.extend(elemento for _, elemento in entradas)
+        if tiempo > self.actual:
+            self._avanzar(tiempo)
+        return vencidos
+
+    def _avanzar(self, tiempo) -> None:
+        """Mueve el reloj a `tiempo` (sin temporizadores anteriores) y baja las ranuras que lo contienen."""
+        # solo pueden tener ranuras que bajar los niveles cuyo bloque cambió
+        alto = ((tiempo ^ self.actual).bit_length() - 1) // BITS
+        self.actual = tiempo
+        if alto >= NIVELES:
+            techo = tiempo >> (NIVELES * BITS)
+            while self.desborde and self.desborde[0][0] >> (NIVELES * BITS) == techo:
+                t, _, elemento = heapq.heappop(self.desborde)
+                self._ubicar(t, elemento)
+            alto = NIVELES - 1
+        for nivel in range(alto, 0, -1):
+            indice = (tiempo >> (nivel * BITS)) & MASCARA
+            ranura = self.ranuras[nivel][indice]
+            if ranura is None:
+                continue
+            self.ranuras[nivel][indice] = None
+            self.bitmaps[nivel] &= ~(1 << indice)
+            for t, elemento in ranura[1]:
+                self._ubicar(t, elemento)
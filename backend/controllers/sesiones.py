@@ -0,0 +1,220 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, Optional
+from controllers.colas import instantanea_listos
+from controllers.comparador import ALGORITMOS_COMPARABLES
+from controllers.planificador import fabrica_politica
+from controllers.simulador import SimuladorEventos
+from controllers.simulador_smp import MAX_CPUS, SimuladorSMP
+
+router = APIRouter(prefix="/sesiones", tags=["Sesiones"])
+
+MAX_SESIONES = 32           # sesiones abiertas; se cierra la usada hace más tiempo
+MAX_PASOS = 1_000_000       # instantes simulados por petición
+
+
+class Sesion:
+    """
+    Simulación que queda abierta en el servidor y avanza de a poco.
+    Guarda el simulador a mitad de camino: cada petición continúa desde el último
+    instante procesado, sin volver a simular desde t=0. Se registran los tramos
+    (sin atajos de la política) para que cada paso sea un instante con eventos.
+    """
+
+    def __init__(self, ident, algoritmo, opciones, simulador, procesos):
+        self.id = ident
+        self.algoritmo = algoritmo
+        self.opciones = opciones
+        self.simulador = simulador
+        self.procesos = procesos
+        self.candado = threading.Lock()     # una petición a la vez por sesión
+        self.creada = time.time()
+
+    def _avance(self, pasos, terminados_antes) -> Dict[str, Any]:
+        """Lo ocurrido desde la petición anterior: tramos y procesos terminados."""
+        simulador = self.simulador
+        tramos, simulador.tramos = simulador.tramos, []
+        return {
+            "pasos": pasos,
+            "tramos": [
+                {"pid": pid, "cpu": cpu, "inicio": inicio, "fin": fin}
+                for pid, cpu, inicio, fin in tramos
+            ],
+            "terminados": [p.pcb.to_dict() for p in simulador.terminados[terminados_antes:]],
+            **self.inspeccionar(),
+        }
+
+    def avanzar(self, pasos: int) -> Dict[str, Any]:
+        """Procesa los eventos de los próximos `pasos` instantes."""
+        with self.candado:
+            terminados_antes = len(self.simulador.terminados)
+            hechos = 0
+            while hechos < pasos and self.simulador.paso():
+                hechos += 1
+            return self._avance(hechos, terminados_antes)
+
+    def avanzar_hasta(self, tiempo: int) -> Dict[str, Any]:
+        """Procesa los eventos con instante <= tiempo (a lo sumo MAX_PASOS instantes)."""
+        with self.candado:
+            simulador = self.simulador
+            terminados_antes = len(simulador.terminados)
+            hechos = 0
+            while hechos < MAX_PASOS:
+                proximo = simulador.proximo_evento()
+                if proximo is None or proximo > tiempo:
+                    break
+                simulador.paso()
+                hechos += 1
+            return self._avance(hechos, terminados_antes)
+
+    def inspeccionar(self, con_procesos=False) -> Dict[str, Any]:
+        simulador = self.simulador
+        datos = {
+            "id": self.id,
+            "algoritmo": self.algoritmo,
+            "opciones": self.opciones,
+            "reloj": simulador.reloj,
+            "proximo_evento": simulador.proximo_evento(),
+            "cpus": simulador.estado_cpus(),
+            "llegadas_pendientes": len(simulador.llegadas),
+            "bloqueados_io": len(simulador.bloqueados),
+            "cantidad_terminados": len(simulador.terminados),
+            "eventos_procesados": simulador.eventos_procesados,
+        }
+        datos["finalizada"] = datos["proximo_evento"] is None
+        if con_procesos:
+            # O(procesos): solo a pedido
+            datos["procesos"] = sorted(
+                (p.pcb.to_dict() for p in self.procesos),
+                key=lambda pcb: pcb["pid"],
+            )
+        return datos
+
+
+class GestorSesiones:
+    """Sesiones abiertas en orden de uso (LRU), con límite de sesiones simultáneas."""
+
+    def __init__(self, maximo=MAX_SESIONES):
+        self.maximo = maximo
+        self.sesiones = OrderedDict()
+        self._ids = itertools.count(1)
+        self._candado = threading.Lock()
+
+    def abrir(self, algoritmo, opciones, simulador, procesos) -> Sesion:
+        with self._candado:
+            sesion = Sesion(str(next(self._ids)), algoritmo, opciones, simulador, procesos)
+            self.sesiones[sesion.id] = sesion
+            while len(self.sesiones) > self.maximo:
+                self.sesiones.popitem(last=False)
+        return sesion
+
+    def obtener(self, ident) -> Optional[Sesion]:
+        with self._candado:
+            sesion = self.sesiones.get(ident)
+            if sesion is not None:
+                self.sesiones.move_to_end(ident)
+            return sesion
+
+    def cerrar(self, ident) -> Optional[Sesion]:
+        with self._candado:
+            return self.sesiones.pop(ident, None)
+
+
+gestor = GestorSesiones()
+
+
+def _opciones(cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+    """Opciones de la sesión con sus valores por defecto; TypeError o ValueError si no son válidas."""
+    opciones = {
+        "quantum": cuerpo.get("quantum", 2),
+        "envejecimiento": cuerpo.get("envejecimiento", 0),
+        "quantums": list(cuerpo.get("quantums", [2, 4, 8])),
+        "periodo_boost": cuerpo.get("periodo_boost", 0),
+        "cpus": cuerpo.get("cpus", 1),
+        "periodo_balance": cuerpo.get("periodo_balance", 0),
+        "robo": bool(cuerpo.get("robo", True)),
+    }
+    cpus = opciones["cpus"]
+    if not isinstance(cpus, int) or isinstance(cpus, bool) or not 1 <= cpus <= MAX_CPUS:
+        raise ValueError(f"Se admiten entre 1 y {MAX_CPUS} CPUs")
+    if not isinstance(opciones["periodo_balance"], int) or opciones["periodo_balance"] < 0:
+        raise ValueError("El periodo de balanceo no puede ser negativo")
+    return opciones
+
+
+def _sesion(ident: str) -> Sesion:
+    sesion = gestor.obtener(ident)
+    if sesion is None:
+        raise HTTPException(status_code=404, detail=f"No existe la sesión {ident}")
+    return sesion
+
+
+# --- Rutas de API ---
+
+@router.post("")
+def abrir_sesion(cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Abre una sesión sobre una instantánea de la cola de listos, en t=0 sin eventos procesados.
+    Cuerpo: {"algoritmo": "rr", "quantum": 2, "envejecimiento": 0, "quantums": [2, 4, 8],
+             "periodo_boost": 0, "cpus": 1, "periodo_balance": 0, "robo": true}
+    """
+    algoritmo = cuerpo.get("algoritmo")
+    if algoritmo not in ALGORITMOS_COMPARABLES:
+        raise HTTPException(status_code=400, detail="Algoritmo no válido")
+    try:
+        opciones = _opciones(cuerpo)
+        fabrica = fabrica_politica(
+            algoritmo, opciones["quantum"], opciones["envejecimiento"],
+            opciones["quantums"], opciones["periodo_boost"],
+        )
+        fabrica()   # valida los parámetros antes de copiar la cola
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Configuración inválida: {e}")
+    procesos = instantanea_listos()
+    if not procesos:
+        raise HTTPException(status_code=400, detail="No hay procesos para planificar")
+    for p in procesos:
+        p.reset()
+    if opciones["cpus"] == 1:
+        simulador = SimuladorEventos(fabrica(), procesos, registrar_tramos=True)
+    else:
+        simulador = SimuladorSMP(
+            fabrica, procesos, opciones["cpus"], opciones["periodo_balance"], opciones["robo"]
+        )
+    return gestor.abrir(algoritmo, opciones, simulador, procesos).inspeccionar()
+
+
+@router.get("/{ident}")
+def inspeccionar_sesion(ident: str, procesos: bool = False) -> Dict[str, Any]:
+    """Estado actual: reloj, CPUs, pendientes; con ?procesos=true también cada PCB."""
+    sesion = _sesion(ident)
+    with sesion.candado:
+        return sesion.inspeccionar(con_procesos=procesos)
+
+
+@router.post("/{ident}/paso")
+def avanzar_sesion(ident: str, n: int = 1) -> Dict[str, Any]:
+    """Avanza `n` instantes con eventos. Devuelve los tramos y terminados de ese avance."""
+    if not 1 <= n <= MAX_PASOS:
+        raise HTTPException(status_code=400, detail=f"n debe estar entre 1 y {MAX_PASOS}")
+    return _sesion(ident).avanzar(n)
+
+
+@router.post("/{ident}/hasta")
+def avanzar_sesion_hasta(ident: str, t: int) -> Dict[str, Any]:
+    """
+    Procesa todos los eventos hasta el instante t inclusive.
+    Si hicieron falta más de MAX_PASOS instantes se detiene antes: el reloj indica dónde.
+    """
+    return _sesion(ident).avanzar_hasta(t)
+
+
+@router.delete("/{ident}")
+def cerrar_sesion(ident: str) -> Dict[str, Any]:
+    sesion = gestor.cerrar(ident)
+    if sesion is None:
+        raise HTTPException(status_code=404, detail=f"No existe la sesión {ident}")
+    return {"mensaje": f"Sesión {ident} cerrada"}
@@ -0,0 +1,771 @@
+import heapq
+from collections import deque
+from itertools import count
+from controllers.heap_indexado import HeapIndexado
+from controllers.rueda_temporizadores import RuedaTemporizadores
+
+
+class SimuladorEventos:
+    """
+    Núcleo de simulación por eventos discretos compartido por los algoritmos.
+    1. Las llegadas, los fines de tramo y los temporizadores de la política
+       (p. ej. envejecimiento) se ordenan por tiempo.
+    2. El reloj salta directamente al siguiente evento (sin ciclos vacíos).
+    3. La política decide qué proceso entra a CPU y por cuánto tiempo.
+    4. Al terminar, se calculan finalización, retorno y espera en el PCB.
+
+    En un mismo instante se procesan primero las llegadas: un proceso que llega
+    justo cuando vence un quantum queda en la cola delante del expropiado.
+
+    Un proceso con ráfagas [CPU, E/S, CPU, ...] se bloquea al terminar cada ráfaga
+    de CPU y vuelve a la política (como una llegada) al completar su E/S. Las E/S
+    pendientes esperan en una rueda de temporizadores jerárquica.
+
+    Con `registrar_tramos` se guarda cada tramo ejecutado (pid, cpu, inicio, fin)
+    y no se usan los atajos de la política (comprimir/drenar), que no generan tramos.
+    Con `metricas` (MetricasAgregadas) se registra cada PCB apenas se cierra.
+
+    `fuente` es un iterador de procesos (sin E/S) en orden de llegada que se lee a
+    medida que avanza el reloj: en el heap solo están las llegadas del próximo instante
+    (todas, así los empates se resuelven por PID como con la carga completa). Junto con
+    `guardar_terminados=False` la memoria depende de los procesos vivos, no del largo de la carga.
+    """
+
+    def __init__(self, politica, procesos, registrar_tramos=False, metricas=None, fuente=None,
+                 guardar_terminados=True):
+        self.politica = politica
+        self.registrar_tramos = registrar_tramos
+        self.metricas = metricas
+        self.guardar_terminados = guardar_terminados
+        self.tramos = []              # tramos aún no consumidos por linea_de_tiempo()
+        self.reloj = 0
+        self.en_cpu = None
+        self.inicio_tramo = 0
+        self.tramo_actual = None      # id del tramo vigente (invalida eventos viejos)
+        self.terminados = []
+        self.cambios_contexto = 0
+        self.eventos_procesados = 0
+        self._ultimo_en_cpu = None
+        self._seq = count()
+
+        # Heap de llegadas: (tiempo_llegada, pid, proceso)
+        self.llegadas = [(p.pcb.tiempo_llegada, p.pcb.pid, p) for p in procesos]
+        heapq.heapify(self.llegadas)
+        self.con_io = any(p.pcb.siguiente_io() is not None for _, _, p in self.llegadas)
+        self.fuente = fuente
+        self._pendiente = reponer_llegada(self.llegadas, fuente) if fuente is not None else None
+        # Heap de fines de tramo: (tiempo, tramo, proceso)
+        self.finales = []
+        # Procesos bloqueados, por instante de fin de su E/S
+        self.bloqueados = RuedaTemporizadores()
+
+    # ---------------------------------------------------------------
+    #   Consultas
+    # ---------------------------------------------------------------
+    def proxima_llegada(self):
+        """Instante de la próxima llegada a la política, de afuera o desde E/S (o None)."""
+        llegada = self.llegadas[0][0] if self.llegadas else None
+        if not self.con_io:
+            return llegada
+        despertar = self.bloqueados.proximo()
+        if despertar is not None and (llegada is None or despertar < llegada):
+            return despertar
+        return llegada
+
+    def proximo_evento(self):
+        """Instante del siguiente evento (o None si ya no quedan)."""
+        # descartar fines de tramos cancelados por expropiación
+        while self.finales and self.finales[0][1] != self.tramo_actual:
+            heapq.heappop(self.finales)
+        proximo = self.proxima_llegada()
+        if self.finales and (proximo is None or self.finales[0][0] < proximo):
+            proximo = self.finales[0][0]
+        temporizador = self.politica.proximo_temporizador()
+        if temporizador is not None and (proximo is None or temporizador < proximo):
+            proximo = temporizador
+        return proximo
+
+    def restante_en_cpu(self) -> int:
+        """Ráfaga restante del proceso en CPU, descontando lo ejecutado en el tramo actual."""
+        return self.en_cpu.pcb.tiempo_restante - (self.reloj - self.inicio_tramo)
+
+    def terminado(self) -> bool:
+        return self.proximo_evento() is None and self.en_cpu is None and len(self.politica) == 0
+
+    def estado_cpus(self):
+        """Proceso en CPU y largo de la cola de listos (para inspeccionar a mitad de simulación)."""
+        return [{
+            "cpu": 0,
+            "pid": self.en_cpu.pcb.pid if self.en_cpu is not None else None,
+            "listos": len(self.politica),
+        }]
+
+    # ---------------------------------------------------------------
+    #   Ciclo principal
+    # ---------------------------------------------------------------
+    def paso(self) -> bool:
+        """Procesa todos los eventos del siguiente instante. Devuelve False al terminar."""
+        tiempo = self.proximo_evento()
+        if tiempo is None:
+            return False
+        self.reloj = tiempo
+
+        if self._pendiente is not None and self._pendiente.pcb.tiempo_llegada == tiempo:
+            self._pendiente = reponer_llegada(self.llegadas, self.fuente, tiempo)
+        while self.llegadas and self.llegadas[0][0] == tiempo:
+            _, _, proceso = heapq.heappop(self.llegadas)
+            self._llegada(proceso)
+            self.eventos_procesados += 1
+
+        if self.con_io and self.bloqueados.proximo() == tiempo:
+            for proceso in self.bloqueados.vencer(tiempo):
+                self._llegada(proceso)
+                self.eventos_procesados += 1
+
+        if self.finales and self.finales[0][0] == tiempo:
+            _, _, proceso = heapq.heappop(self.finales)
+            self._fin_tramo(proceso)
+            self.eventos_procesados += 1
+
+        if self.politica.proximo_temporizador() == tiempo:
+            self.politica.temporizador(tiempo)
+            self.eventos_procesados += 1
+
+        if self.en_cpu is not None and self.politica.expropia(self.en_cpu, self.restante_en_cpu(), tiempo):
+            self._expropiar()
+
+        if self.en_cpu is None:
+            self._despachar()
+        return True
+
+    def ejecutar(self):
+        while self.paso():
+            pass
+        return self.terminados
+
+    def linea_de_tiempo(self):
+        """Ejecuta la simulación entregando los tramos a medida que se producen."""
+        while self.paso():
+            if self.tramos:
+                tramos, self.tramos = self.tramos, []
+                yield from tramos
+
+    # ---------------------------------------------------------------
+    #   Manejo de eventos
+    # ---------------------------------------------------------------
+    def _llegada(self, proceso) -> None:
+        proceso.cambiar_estado("Listo")
+        self.politica.agregar(proceso, self.reloj)
+
+    def _descontar_tramo(self, proceso) -> None:
+        ejecutado = self.reloj - self.inicio_tramo
+        proceso.pcb.tiempo_restante -= ejecutado
+        proceso.pcb.contador += ejecutado
+        if self.registrar_tramos and ejecutado > 0:
+            self.tramos.append((proceso.pcb.pid, 0, self.inicio_tramo, self.reloj))
+        self.en_cpu = None
+        self.tramo_actual = None
+
+    def _expropiar(self) -> None:
+        proceso = self.en_cpu
+        self._descontar_tramo(proceso)
+        proceso.cambiar_estado("Listo")
+        self.politica.reencolar(proceso, self.reloj)
+
+    def _fin_tramo(self, proceso) -> None:
+        self._descontar_tramo(proceso)
+        if proceso.pcb.tiempo_restante <= 0:
+            io = proceso.pcb.siguiente_io()
+            if io is None:
+                self._terminar(proceso)
+            else:
+                bloquear(proceso, io, self.reloj, self.bloqueados)
+        else:
+            proceso.cambiar_estado("Listo")
+            self.politica.reencolar(proceso, self.reloj)
+
+    def _atajo_politica(self) -> bool:
+        """Aplica drenar/comprimir si la política puede. True si ya no queda nada que despachar."""
+        if (self.proxima_llegada() is None and self.politica.proximo_temporizador() is None
+                and not self.con_io):
+            # sin llegadas pendientes, la política puede resolver el resto de una vez
+            drenado = self.politica.drenar(self.reloj)
+            if drenado is not None:
+                finales, cambios = drenado
+                for fin, proceso in finales:
+                    self.reloj = fin
+                    proceso.pcb.contador += proceso.pcb.tiempo_restante
+                    self._terminar(proceso)
+                    self._ultimo_en_cpu = proceso
+                self.cambios_contexto += cambios
+                return True
+
+        avance, cambios = self.politica.comprimir(self.reloj, self.proxima_llegada())
+        self.reloj += avance
+        self.cambios_contexto += cambios
+        return False
+
+    def _terminar(self, proceso) -> None:
+        cerrar_pcb(proceso, self.reloj)
+        if self.guardar_terminados:
+            self.terminados.append(proceso)
+        if self.metricas is not None:
+            self.metricas.registrar(proceso.pcb)
+
+    def _despachar(self) -> None:
+        if not self.registrar_tramos and self._atajo_politica():
+            return
+
+        proceso = self.politica.siguiente(self.reloj)
+        if proceso is None:
+            return  # CPU ociosa hasta el siguiente evento
+
+        pcb = proceso.pcb
+        if pcb.tiempo_inicio is None:
+            pcb.tiempo_inicio = self.reloj
+        if proceso is not self._ultimo_en_cpu:
+            self.cambios_contexto += 1
+        self._ultimo_en_cpu = proceso
+
+        duracion = self.politica.duracion(proceso, self.reloj, self.proxima_llegada())
+        proceso.cambiar_estado("Ejecutando")
+        self.en_cpu = proceso
+        self.inicio_tramo = self.reloj
+        self.tramo_actual = next(self._seq)
+        heapq.heappush(self.finales, (self.reloj + duracion, self.tramo_actual, proceso))
+
+
+def cerrar_pcb(proceso, reloj) -> None:
+    """Marca el proceso como terminado y calcula finalización, retorno y espera (sin contar la E/S)."""
+    pcb = proceso.pcb
+    pcb.tiempo_restante = 0
+    pcb.tiempo_finalizacion = reloj
+    pcb.tiempo_retorno = pcb.tiempo_finalizacion - pcb.tiempo_llegada
+    pcb.tiempo_espera = pcb.tiempo_retorno - pcb.rafaga_original - pcb.tiempo_io()
+    proceso.cambiar_estado("Terminado")
+
+
+def reponer_llegada(llegadas, fuente, instante=-1):
+    """
+    Pasa al heap de llegadas los procesos de la fuente que llegan hasta `instante` y el
+    primero que llega después. Devuelve ese último (None si la fuente se agotó): cuando
+    el reloj alcance su llegada hay que volver a reponer, por si otros llegan con él.
+    """
+    for proceso in fuente:
+        heapq.heappush(llegadas, (proceso.pcb.tiempo_llegada, proceso.pcb.pid, proceso))
+        if proceso.pcb.tiempo_llegada > instante:
+            return proceso
+    return None
+
+
+def bloquear(proceso, io, reloj, bloqueados) -> None:
+    """Terminó una ráfaga de CPU con E/S a continuación: bloquear hasta que la E/S termine."""
+    duracion_io, siguiente_cpu = io
+    pcb = proceso.pcb
+    pcb.rafaga_actual += 2
+    pcb.tiempo_restante = siguiente_cpu
+    proceso.cambiar_estado("Bloqueado")
+    bloqueados.programar(reloj + duracion_io, proceso)
+
+
+# ---------------------------------------------------------------
+#   Políticas
+# ---------------------------------------------------------------
+class Politica:
+    """Interfaz mínima que usa SimuladorEventos para elegir procesos."""
+
+    def agregar(self, proceso, reloj) -> None:
+        raise NotImplementedError
+
+    def reencolar(self, proceso, reloj) -> None:
+        self.agregar(proceso, reloj)
+
+    def siguiente(self, reloj):
+        raise NotImplementedError
+
+    def duracion(self, proceso, reloj, proxima_llegada) -> int:
+        # Por defecto, no expropiativo: ejecuta toda la ráfaga restante
+        return proceso.pcb.tiempo_restante
+
+    def expropia(self, en_cpu, restante, reloj) -> bool:
+        """True si algún proceso listo debe desplazar al que está en CPU."""
+        return False
+
+    def proximo_temporizador(self):
+        """Instante del próximo evento interno de la política (o None)."""
+        return None
+
+    def temporizador(self, reloj) -> None:
+        pass
+
+    def comprimir(self, reloj, proxima_llegada):
+        """Permite aplicar varios tramos de una vez. Devuelve (tiempo avanzado, cambios de contexto)."""
+        return 0, 0
+
+    def robar(self):
+        """Quita un proceso listo para migrarlo a otra CPU (el último en ser atendido)."""
+        raise NotImplementedError
+
+    def drenar(self, reloj):
+        """
+        Sin llegadas pendientes, puede calcular directamente la finalización de todos
+        los procesos listos. Devuelve ([(fin, proceso), ...] en orden, cambios de contexto)
+        o None si la política no lo soporta.
+        """
+        return None
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class PoliticaFCFS(Politica):
+    """Cola FIFO en orden de llegada."""
+
+    def __init__(self):
+        self.cola = deque()
+
+    def agregar(self, proceso, reloj) -> None:
+        self.cola.append(proceso)
+
+    def siguiente(self, reloj):
+        return self.cola.popleft() if self.cola else None
+
+    def robar(self):
+        return self.cola.pop()
+
+    def __len__(self) -> int:
+        return len(self.cola)
+
+
+class PoliticaSJF(Politica):
+    """
+    Entre los procesos que ya llegaron, elige la ráfaga más corta (no expropiativo).
+    Con ráfagas de E/S se compara la próxima ráfaga de CPU, no el total.
+    """
+
+    def __init__(self):
+        self.heap = []
+
+    def agregar(self, proceso, reloj) -> None:
+        # no expropiativo: al entrar a la cola el restante es la ráfaga de CPU completa
+        heapq.heappush(self.heap, (proceso.pcb.tiempo_restante, proceso.pcb.pid, proceso))
+
+    def siguiente(self, reloj):
+        return heapq.heappop(self.heap)[2] if self.heap else None
+
+    def robar(self):
+        # quitar la última hoja no rompe el invariante del heap
+        return self.heap.pop()[2]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class PoliticaSRTF(Politica):
+    """
+    Shortest Remaining Time First: SJF expropiativo.
+    Los listos viven en un heap indexado por (ráfaga restante, pid); una llegada
+    con menor restante que el proceso en CPU lo expropia.
+    """
+
+    def __init__(self):
+        self.heap = HeapIndexado()
+
+    def agregar(self, proceso, reloj) -> None:
+        pcb = proceso.pcb
+        self.heap.push(id(proceso), (pcb.tiempo_restante, pcb.pid), proceso)
+
+    def siguiente(self, reloj):
+        return self.heap.pop()[2] if self.heap else None
+
+    def expropia(self, en_cpu, restante, reloj) -> bool:
+        return len(self.heap) > 0 and self.heap.tope()[1] < (restante, en_cpu.pcb.pid)
+
+    def robar(self):
+        return self.heap.quitar(self.heap.ultimo())[1]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class PoliticaPrioridad(Politica):
+    """
+    Planificación por prioridad (menor número = mayor prioridad), con o sin expropiación.
+    Envejecimiento: cada `envejecimiento` unidades de espera la prioridad efectiva de un
+    proceso listo mejora en 1 (hasta 0) con un decrease-key en el heap indexado.
+    Mientras está en CPU conserva la prioridad efectiva con la que fue elegido;
+    al volver a la cola de listos retoma su prioridad base.
+    """
+
+    def __init__(self, expropiativa=False, envejecimiento=0):
+        if envejecimiento < 0:
+            raise ValueError("El intervalo de envejecimiento no puede ser negativo")
+        self.expropiativa = expropiativa
+        self.envejecimiento = envejecimiento
+        self.heap = HeapIndexado()
+        self.temporizadores = []   # heap (tiempo, sello, ident)
+        self._sellos = {}          # ident -> sello vigente (descarta temporizadores viejos)
+        self._seq = count()
+        self._clave_en_cpu = None
+
+    def agregar(self, proceso, reloj) -> None:
+        pcb = proceso.pcb
+        ident = id(proceso)
+        self.heap.push(ident, (pcb.prioridad, pcb.tiempo_llegada, pcb.pid), proceso)
+        self._programar(ident, pcb.prioridad, reloj)
+
+    def siguiente(self, reloj):
+        if not self.heap:
+            return None
+        ident, clave, proceso = self.heap.pop()
+        self._sellos.pop(ident, None)
+        self._clave_en_cpu = clave
+        return proceso
+
+    def expropia(self, en_cpu, restante, reloj) -> bool:
+        if not self.expropiativa or not self.heap:
+            return False
+        return self.heap.tope()[1] < self._clave_en_cpu
+
+    def robar(self):
+        ident = self.heap.ultimo()
+        self._sellos.pop(ident, None)
+        return self.heap.quitar(ident)[1]
+
+    # ---------------- envejecimiento ----------------
+    def _programar(self, ident, prioridad, reloj) -> None:
+        if self.envejecimiento > 0 and prioridad > 0:
+            sello = next(self._seq)
+            self._sellos[ident] = sello
+            heapq.heappush(self.temporizadores, (reloj + self.envejecimiento, sello, ident))
+
+    def proximo_temporizador(self):
+        # descartar temporizadores de procesos que ya salieron de la cola
+        while self.temporizadores:
+            _, sello, ident = self.temporizadores[0]
+            if self._sellos.get(ident) == sello:
+                return self.temporizadores[0][0]
+            heapq.heappop(self.temporizadores)
+        return None
+
+    def temporizador(self, reloj) -> None:
+        while self.temporizadores and self.temporizadores[0][0] <= reloj:
+            _, sello, ident = heapq.heappop(self.temporizadores)
+            if self._sellos.get(ident) != sello:
+                continue
+            prioridad, llegada, pid = self.heap.clave(ident)
+            self.heap.actualizar(ident, (prioridad - 1, llegada, pid))
+            self._programar(ident, prioridad - 1, reloj)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class PoliticaRR(Politica):
+    """
+    Cola circular con quantum fijo.
+    - Si el proceso está solo, su tramo se extiende hasta el quantum en que llega otro.
+    - Si varios procesos ya iniciados comparten la CPU y nadie termina ni llega,
+      las rondas completas se aplican de una vez (comprimir).
+    """
+
+    def __init__(self, quantum=2):
+        if quantum <= 0:
+            raise ValueError("El quantum debe ser positivo")
+        self.quantum = quantum
+        self.cola = deque()
+        self._sin_revisar = 0   # despachos restantes hasta volver a revisar la ronda
+
+    def agregar(self, proceso, reloj) -> None:
+        self.cola.append(proceso)
+
+    def siguiente(self, reloj):
+        return self.cola.popleft() if self.cola else None
+
+    def robar(self):
+        return self.cola.pop()
+
+    def duracion(self, proceso, reloj, proxima_llegada) -> int:
+        restante = proceso.pcb.tiempo_restante
+        if self.cola:
+            return min(self.quantum, restante)
+        if proxima_llegada is None:
+            return restante
+        # solo en CPU: seguir hasta el fin del quantum donde llega el próximo
+        quantums = -(-(proxima_llegada - reloj) // self.quantum)
+        return min(restante, max(1, quantums) * self.quantum)
+
+    def _revisar(self) -> bool:
+        """True si toca revisar la ronda: a lo sumo una vez por vuelta (O(1) amortizado)."""
+        k = len(self.cola)
+        if k < 2:
+            return False
+        if self._sin_revisar > 0:
+            self._sin_revisar -= 1
+            return False
+        self._sin_revisar = k
+        return all(p.pcb.tiempo_inicio is not None for p in self.cola)
+
+    def comprimir(self, reloj, proxima_llegada):
+        if not self._revisar():
+            return 0, 0
+        k = len(self.cola)
+        menor = min(p.pcb.tiempo_restante for p in self.cola)
+        # rondas completas sin que nadie termine...
+        rondas = (menor - 1) // self.quantum
+        if proxima_llegada is not None:
+            # ...y que acaben antes de la próxima llegada
+            rondas = min(rondas, (proxima_llegada - reloj - 1) // (k * self.quantum))
+        if rondas <= 0:
+            return 0, 0
+
+        ejecutado = rondas * self.quantum
+        for proceso in self.cola:
+            proceso.pcb.tiempo_restante -= ejecutado
+            proceso.pcb.contador += ejecutado
+        return rondas * k * self.quantum, rondas * k
+
+    def drenar(self, reloj):
+        """
+        Con la cola fija (sin llegadas), el proceso en la posición i necesita
+        c_i = ceil(restante_i / quantum) turnos. Agrupando por c_i:
+          fin_i = reloj + (ráfagas de los grupos ya terminados)
+                        + (c_i - 1) * quantum * vivos
+                        + quantum * (vivos de otros grupos antes de i en la ronda)
+                        + (últimos tramos del grupo antes de i) + último tramo de i
+        Ordenar y contar con un árbol de Fenwick deja todo en O(k log k).
+        """
+        if not self._revisar():
+            return None
+        q = self.quantum
+        orden = list(self.cola)
+        k = len(orden)
+        restantes = [p.pcb.tiempo_restante for p in orden]
+        turnos = [-(-r // q) for r in restantes]
+        por_turnos = sorted(range(k), key=lambda i: (turnos[i], i))
+
+        vivos_antes = _Fenwick(k)
+        terminado = 0       # ráfaga consumida por los grupos ya terminados
+        vivos = k
+        finales = []
+        inicio = 0
+        while inicio < k:
+            c = turnos[por_turnos[inicio]]
+            fin_grupo = inicio
+            while fin_grupo < k and turnos[por_turnos[fin_grupo]] == c:
+                fin_grupo += 1
+            grupo = por_turnos[inicio:fin_grupo]
+
+            base = reloj + terminado + (c - 1) * q * vivos
+            ultimos = 0
+            for g, i in enumerate(grupo):
+                ultimo = restantes[i] - (c - 1) * q
+                otros = vivos_antes.prefijo(i) - g
+                finales.append((base + q * otros + ultimos + ultimo, orden[i]))
+                ultimos += ultimo
+            for i in grupo:
+                vivos_antes.sumar(i, -1)
+                terminado += restantes[i]
+            vivos -= len(grupo)
+            inicio = fin_grupo
+
+        # Cambios de contexto: un despacho por turno, salvo que el último proceso
+        # quede solo y encadene sus turnos finales en un único tramo.
+        cambios = sum(turnos)
+        ultimo = por_turnos[-1]
+        if turnos[por_turnos[-2]] < turnos[ultimo]:
+            c2 = turnos[por_turnos[-2]]
+            cambios -= turnos[ultimo] - c2
+            grupo_c2 = [i for i in por_turnos if turnos[i] == c2]
+            if ultimo < max(grupo_c2):
+                cambios += 1
+
+        self.cola.clear()
+        return finales, cambios
+
+    def __len__(self) -> int:
+        return len(self.cola)
+
+
+class PoliticaMLFQ(Politica):
+    """
+    Multi-level feedback queue.
+    - Los procesos nuevos entran al nivel 0 (el de mayor prioridad).
+    - Quien agota el quantum de su nivel baja un nivel; si es expropiado
+      conserva lo consumido y vuelve al final de su mismo nivel.
+    - Cada `periodo_boost` unidades todos los procesos vuelven al nivel 0 con su
+      asignación reiniciada; el que está en CPU la conserva.
+    - Un bitmap marca los niveles no vacíos: elegir el siguiente es O(1)
+      (bit menos significativo encendido), sin recorrer los niveles.
+
+    Cada nivel es una deque de tramos (deques); el boost mueve tramos enteros
+    al nivel 0 en O(niveles) y lo consumido se reinicia al sacar la entrada.
+    """
+
+    def __init__(self, quantums=(2, 4, 8), periodo_boost=0):
+        if not quantums or any(q <= 0 for q in quantums):
+            raise ValueError("Cada nivel necesita un quantum positivo")
+        if periodo_boost < 0:
+            raise ValueError("El periodo de boost no puede ser negativo")
+        self.quantums = list(quantums)
+        self.periodo_boost = periodo_boost
+        self.niveles = [deque() for _ in self.quantums]   # tramos de (proceso, consumido, boosts)
+        self.tamanos = [0] * len(self.quantums)
+        self.bitmap = 0
+        self.boosts = 0
+        self._ultimo_nivel = len(self.quantums) - 1
+        self._proximo_boost = periodo_boost
+        # estado del proceso en CPU: nivel, consumido, época de boost e inicio del tramo
+        self._en_cpu = None
+
+    # ---------------- niveles ----------------
+    def _poner(self, nivel, proceso, consumido, al_frente=False) -> None:
+        tramos = self.niveles[nivel]
+        if not tramos:
+            tramos.append(deque())
+        entrada = (proceso, consumido, self.boosts)
+        if al_frente:
+            tramos[0].appendleft(entrada)
+        else:
+            tramos[-1].append(entrada)
+        self.tamanos[nivel] += 1
+        self.bitmap |= 1 << nivel
+
+    def _sacar(self, nivel):
+        tramos = self.niveles[nivel]
+        tramo = tramos[0]
+        proceso, consumido, boosts = tramo.popleft()
+        if not tramo:
+            tramos.popleft()
+        self.tamanos[nivel] -= 1
+        if not self.tamanos[nivel]:
+            self.bitmap &= ~(1 << nivel)
+        if boosts < self.boosts:
+            consumido = 0   # hubo un boost mientras esperaba
+        return proceso, consumido
+
+    def _mejor_nivel(self) -> int:
+        return (self.bitmap & -self.bitmap).bit_length() - 1
+
+    def robar(self):
+        # el último del nivel más bajo con procesos; en la otra CPU entra como nuevo
+        nivel = self.bitmap.bit_length() - 1
+        tramos = self.niveles[nivel]
+        proceso = tramos[-1].pop()[0]
+        if not tramos[-1]:
+            tramos.pop()
+        self.tamanos[nivel] -= 1
+        if not self.tamanos[nivel]:
+            self.bitmap &= ~(1 << nivel)
+        return proceso
+
+    def _epoca(self, reloj) -> int:
+        return reloj // self.periodo_boost if self.periodo_boost else 0
+
+    def _nivel_en_cpu(self, reloj) -> int:
+        nivel, _, epoca, _ = self._en_cpu
+        return 0 if self._epoca(reloj) > epoca else nivel
+
+    # ---------------- interfaz de política ----------------
+    def agregar(self, proceso, reloj) -> None:
+        self._alcanzar_boost(reloj)
+        self._poner(0, proceso, 0)
+
+    def reencolar(self, proceso, reloj) -> None:
+        self._alcanzar_boost(reloj)
+        nivel, consumido, epoca, inicio = self._en_cpu
+        self._en_cpu = None
+        if self._epoca(reloj) > epoca:
+            # el tramo se cortó por el boost: sigue en CPU desde el nivel 0
+            self._poner(0, proceso, 0, al_frente=True)
+            return
+        consumido += reloj - inicio
+        if nivel == self._ultimo_nivel:
+            # en el último nivel un tramo extendido equivale a varios quantums seguidos
+            self._poner(nivel, proceso, consumido % self.quantums[nivel])
+        elif consumido >= self.quantums[nivel]:
+            self._poner(nivel + 1, proceso, 0)
+        else:
+            self._poner(nivel, proceso, consumido)
+
+    def siguiente(self, reloj):
+        if not self.bitmap:
+            return None
+        nivel = self._mejor_nivel()
+        proceso, consumido = self._sacar(nivel)
+        self._en_cpu = (nivel, consumido, self._epoca(reloj), reloj)
+        return proceso
+
+    def duracion(self, proceso, reloj, proxima_llegada) -> int:
+        nivel, consumido, _, _ = self._en_cpu
+        restante = proceso.pcb.tiempo_restante
+        duracion = self.quantums[nivel] - consumido
+        if not self.bitmap and nivel == self._ultimo_nivel:
+            # solo en el último nivel: nadie lo desplaza salvo una llegada (nivel 0)
+            if self._ultimo_nivel > 0 or proxima_llegada is None:
+                duracion = restante
+            else:
+                # un único nivel es round robin: respetar el quantum donde llega el próximo
+                quantums = -(-(proxima_llegada - reloj) // self.quantums[0])
+                duracion = max(1, quantums) * self.quantums[0] - consumido
+        if self.periodo_boost:
+            # el boost reinicia nivel y asignación: cortar el tramo en ese instante
+            duracion = min(duracion, (self._epoca(reloj) + 1) * self.periodo_boost - reloj)
+        return min(duracion, restante)
+
+    def expropia(self, en_cpu, restante, reloj) -> bool:
+        return bool(self.bitmap) and self._mejor_nivel() < self._nivel_en_cpu(reloj)
+
+    # ---------------- boost ----------------
+    def proximo_temporizador(self):
+        # solo hace falta si hay procesos esperando por debajo del nivel 0
+        if not self.periodo_boost or self.bitmap <= 1:
+            return None
+        return self._proximo_boost
+
+    def temporizador(self, reloj) -> None:
+        if reloj < self._proximo_boost:
+            return
+        nivel0 = self.niveles[0]
+        for nivel in range(1, len(self.niveles)):
+            nivel0.extend(self.niveles[nivel])
+            self.niveles[nivel] = deque()
+            self.tamanos[0] += self.tamanos[nivel]
+            self.tamanos[nivel] = 0
+        self.bitmap = 1 if self.tamanos[0] else 0
+        self.boosts += 1
+        self._proximo_boost = (self._epoca(reloj) + 1) * self.periodo_boost
+
+    def _alcanzar_boost(self, reloj) -> None:
+        """Mantiene el próximo boost en el futuro mientras no hizo falta programarlo."""
+        if self.periodo_boost and self._proximo_boost < reloj:
+            self._proximo_boost = -(-reloj // self.periodo_boost) * self.periodo_boost
+
+    def __len__(self) -> int:
+        return sum(self.tamanos)
+
+
+class _Fenwick:
+    """Árbol de Fenwick con todas las posiciones en 1 (cuenta de vivos por prefijo)."""
+
+    def __init__(self, n):
+        self.arbol = [0] * (n + 1)
+        for i in range(1, n + 1):
+            self.arbol[i] += 1
+            padre = i + (i & -i)
+            if padre <= n:
+                self.arbol[padre] += self.arbol[i]
+
+    def sumar(self, i, delta) -> None:
+        i += 1
+        while i < len(self.arbol):
+            self.arbol[i] += delta
+            i += i & -i
+
+    def prefijo(self, i) -> int:
+        """Suma de las posiciones [0, i)."""
+        total = 0
+        while i > 0:
+            total += self.arbol[i]
+            i -= i & -i
+        return total
@@ -0,0 +1,331 @@
+import heapq
+from itertools import count
+from controllers.simulador import Politica, bloquear, cerrar_pcb, reponer_llegada
+from controllers.rueda_temporizadores import RuedaTemporizadores
+
+# núcleos simulados como máximo: cada CPU tiene su propia política y cada llegada las recorre todas
+MAX_CPUS = 64
+
+
+class CPU:
+    """Estado de un núcleo: su propia cola de listos (política) y el proceso en ejecución."""
+
+    def __init__(self, indice, politica):
+        self.indice = indice
+        self.politica = politica
+        self.en_cpu = None
+        self.inicio_tramo = 0
+        self.tramo_actual = None
+        self.ultimo_en_cpu = None
+        self.ocupado = 0            # tiempo total ejecutando
+        self.cambios_contexto = 0
+        self.robos = 0              # procesos que robó estando ociosa
+        self.migrados = 0           # procesos recibidos por balanceo
+
+    def carga(self) -> int:
+        return len(self.politica) + (1 if self.en_cpu is not None else 0)
+
+
+class SimuladorSMP:
+    """
+    Simulación multiprocesador por eventos discretos.
+    1. Cada CPU tiene su propia cola de listos (una instancia de la política).
+    2. Cada llegada va a la CPU menos cargada.
+    3. Cada `periodo_balance` unidades se reparten las colas para igualar su largo.
+    4. Una CPU que queda ociosa roba un proceso de la cola más larga (work stealing).
+    5. Se registra cada tramo ejecutado como (pid, cpu, inicio, fin).
+    6. Al terminar una ráfaga de CPU seguida de E/S el proceso se bloquea; al
+       completar la E/S vuelve como una llegada (a la CPU menos cargada).
+    Con `metricas` (MetricasAgregadas) se registra cada PCB apenas se cierra.
+    `fuente`, `guardar_terminados` y `registrar_tramos` funcionan como en SimuladorEventos
+    (sin tramos registrados la memoria no crece con la duración).
+    """
+
+    def __init__(self, fabrica_politica, procesos, num_cpus=2, periodo_balance=0, robo=True,
+                 metricas=None, fuente=None, guardar_terminados=True, registrar_tramos=True):
+        if num_cpus <= 0:
+            raise ValueError("Se necesita al menos una CPU")
+        if num_cpus > MAX_CPUS:
+            raise ValueError(f"Se admiten a lo sumo {MAX_CPUS} CPUs")
+        if periodo_balance < 0:
+            raise ValueError("El periodo de balanceo no puede ser negativo")
+        self.cpus = [CPU(i, fabrica_politica()) for i in range(num_cpus)]
+        self.periodo_balance = periodo_balance
+        self.robo = robo
+        self.metricas = metricas
+        self.guardar_terminados = guardar_terminados
+        self.registrar_tramos = registrar_tramos
+        self.reloj = 0
+        self.terminados = []
+        self.tramos = []
+        self.eventos_procesados = 0
+        self._seq = count()
+        self._proximo_balance = periodo_balance
+        self.en_colas = 0                         # procesos listos sumando todas las colas
+        self.ociosas = set(range(num_cpus))       # índices de CPUs sin proceso
+        # solo algunas políticas usan temporizadores (envejecimiento, boost)
+        self._con_temporizador = [
+            cpu for cpu in self.cpus
+            if type(cpu.politica).proximo_temporizador is not Politica.proximo_temporizador
+        ]
+
+        # Heap de llegadas: (tiempo_llegada, pid, proceso)
+        self.llegadas = [(p.pcb.tiempo_llegada, p.pcb.pid, p) for p in procesos]
+        heapq.heapify(self.llegadas)
+        self.fuente = fuente
+        self._pendiente = reponer_llegada(self.llegadas, fuente) if fuente is not None else None
+        # Heap de fines de tramo: (tiempo, tramo, cpu, proceso)
+        self.finales = []
+        # Procesos bloqueados, por instante de fin de su E/S
+        self.bloqueados = RuedaTemporizadores()
+
+    # ---------------------------------------------------------------
+    #   Consultas
+    # ---------------------------------------------------------------
+    def _balance_pendiente(self):
+        if not self.periodo_balance or len(self.cpus) < 2 or not self.en_colas:
+            return None
+        if self._proximo_balance <= self.reloj:
+            # no hizo falta balancear por un tiempo: saltar al siguiente múltiplo
+            self._proximo_balance = (self.reloj // self.periodo_balance + 1) * self.periodo_balance
+        return self._proximo_balance
+
+    def proximo_evento(self):
+        # descartar fines de tramos cancelados por expropiación
+        while self.finales and self.finales[0][1] != self.cpus[self.finales[0][2]].tramo_actual:
+            heapq.heappop(self.finales)
+        tiempos = []
+        if self.llegadas:
+            tiempos.append(self.llegadas[0][0])
+        if self.finales:
+            tiempos.append(self.finales[0][0])
+        despertar = self.bloqueados.proximo()
+        if despertar is not None:
+            tiempos.append(despertar)
+        for cpu in self._con_temporizador:
+            temporizador = cpu.politica.proximo_temporizador()
+            if temporizador is not None:
+                tiempos.append(temporizador)
+        balance = self._balance_pendiente()
+        if balance is not None:
+            tiempos.append(balance)
+        return min(tiempos) if tiempos else None
+
+    def _limite_externo(self):
+        """Próximo instante en que una cola puede recibir procesos de afuera."""
+        tiempos = []
+        if self.llegadas:
+            tiempos.append(self.llegadas[0][0])
+        despertar = self.bloqueados.proximo()
+        if despertar is not None:
+            tiempos.append(despertar)
+        balance = self._balance_pendiente()
+        if balance is not None:
+            tiempos.append(balance)
+        return min(tiempos) if tiempos else None
+
+    # ---------------------------------------------------------------
+    #   Ciclo principal
+    # ---------------------------------------------------------------
+    def paso(self) -> bool:
+        tiempo = self.proximo_evento()
+        if tiempo is None:
+            return False
+        self.reloj = tiempo
+        tocadas = set()   # CPUs cuya cola o estado cambió en este instante
+
+        if self._pendiente is not None and self._pendiente.pcb.tiempo_llegada == tiempo:
+            self._pendiente = reponer_llegada(self.llegadas, self.fuente, tiempo)
+        while self.llegadas and self.llegadas[0][0] == tiempo:
+            _, _, proceso = heapq.heappop(self.llegadas)
+            tocadas.add(self._llegada(proceso))
+
+        if self.bloqueados.proximo() == tiempo:
+            for proceso in self.bloqueados.vencer(tiempo):
+                tocadas.add(self._llegada(proceso))
+
+        while self.finales and self.finales[0][0] == tiempo:
+            _, tramo, indice, proceso = heapq.heappop(self.finales)
+            cpu = self.cpus[indice]
+            if tramo != cpu.tramo_actual:
+                continue  # tramo cancelado por una expropiación
+            self._fin_tramo(cpu, proceso)
+            tocadas.add(cpu)
+            self.eventos_procesados += 1
+
+        for cpu in self._con_temporizador:
+            if cpu.politica.proximo_temporizador() == tiempo:
+                cpu.politica.temporizador(tiempo)
+                tocadas.add(cpu)
+                self.eventos_procesados += 1
+
+        if self.periodo_balance and self._proximo_balance == tiempo and self.en_colas:
+            self._balancear()
+            self._proximo_balance = tiempo + self.periodo_balance
+            tocadas.update(self.cpus)
+            self.eventos_procesados += 1
+
+        for cpu in tocadas:
+            if cpu.en_cpu is not None:
+                restante = cpu.en_cpu.pcb.tiempo_restante - (tiempo - cpu.inicio_tramo)
+                if cpu.politica.expropia(cpu.en_cpu, restante, tiempo):
+                    self._expropiar(cpu)
+
+        # primero las CPUs con cola propia; después las ociosas intentan robar
+        for cpu in sorted(tocadas, key=lambda cpu: cpu.indice):
+            if cpu.en_cpu is None:
+                self._despachar(cpu)
+        if self.robo and self.en_colas:
+            for indice in sorted(self.ociosas):
+                if not self.en_colas:
+                    break
+                self._despachar(self.cpus[indice])
+        return True
+
+    def ejecutar(self):
+        while self.paso():
+            pass
+        return self.terminados
+
+    def linea_de_tiempo(self):
+        """Ejecuta la simulación entregando los tramos a medida que se producen."""
+        while self.paso():
+            if self.tramos:
+                tramos, self.tramos = self.tramos, []
+                yield from tramos
+
+    # ---------------------------------------------------------------
+    #   Tramos
+    # ---------------------------------------------------------------
+    def _descontar_tramo(self, cpu, proceso) -> None:
+        ejecutado = self.reloj - cpu.inicio_tramo
+        proceso.pcb.tiempo_restante -= ejecutado
+        proceso.pcb.contador += ejecutado
+        cpu.ocupado += ejecutado
+        if self.registrar_tramos and ejecutado > 0:
+            self.tramos.append((proceso.pcb.pid, cpu.indice, cpu.inicio_tramo, self.reloj))
+        cpu.en_cpu = None
+        cpu.tramo_actual = None
+        self.ociosas.add(cpu.indice)
+
+    def _llegada(self, proceso) -> CPU:
+        proceso.cambiar_estado("Listo")
+        destino = min(self.cpus, key=lambda cpu: (cpu.carga(), cpu.indice))
+        self._encolar(destino, proceso)
+        self.eventos_procesados += 1
+        return destino
+
+    def _encolar(self, cpu, proceso) -> None:
+        cpu.politica.agregar(proceso, self.reloj)
+        self.en_colas += 1
+
+    def _reencolar(self, cpu, proceso) -> None:
+        proceso.cambiar_estado("Listo")
+        cpu.politica.reencolar(proceso, self.reloj)
+        self.en_colas += 1
+
+    def _expropiar(self, cpu) -> None:
+        proceso = cpu.en_cpu
+        self._descontar_tramo(cpu, proceso)
+        self._reencolar(cpu, proceso)
+
+    def _fin_tramo(self, cpu, proceso) -> None:
+        self._descontar_tramo(cpu, proceso)
+        if proceso.pcb.tiempo_restante <= 0:
+            io = proceso.pcb.siguiente_io()
+            if io is not None:
+                bloquear(proceso, io, self.reloj, self.bloqueados)
+                return
+            cerrar_pcb(proceso, self.reloj)
+            if self.guardar_terminados:
+                self.terminados.append(proceso)
+            if self.metricas is not None:
+                self.metricas.registrar(proceso.pcb)
+        else:
+            self._reencolar(cpu, proceso)
+
+    def _despachar(self, cpu) -> None:
+        if len(cpu.politica) == 0 and self.robo and self.en_colas:
+            self._robar(cpu)
+
+        proceso = cpu.politica.siguiente(self.reloj)
+        if proceso is None:
+            return
+        self.en_colas -= 1
+        self.ociosas.discard(cpu.indice)
+
+        pcb = proceso.pcb
+        if pcb.tiempo_inicio is None:
+            pcb.tiempo_inicio = self.reloj
+        if proceso is not cpu.ultimo_en_cpu:
+            cpu.cambios_contexto += 1
+        cpu.ultimo_en_cpu = proceso
+
+        duracion = cpu.politica.duracion(proceso, self.reloj, self._limite_externo())
+        proceso.cambiar_estado("Ejecutando")
+        cpu.en_cpu = proceso
+        cpu.inicio_tramo = self.reloj
+        cpu.tramo_actual = next(self._seq)
+        heapq.heappush(self.finales, (self.reloj + duracion, cpu.tramo_actual, cpu.indice, proceso))
+
+    # ---------------------------------------------------------------
+    #   Balanceo de carga
+    # ---------------------------------------------------------------
+    def _robar(self, ladrona) -> None:
+        victima = max(self.cpus, key=lambda cpu: (len(cpu.politica), -cpu.indice))
+        if victima is ladrona or len(victima.politica) == 0:
+            return
+        proceso = victima.politica.robar()
+        ladrona.politica.agregar(proceso, self.reloj)
+        ladrona.robos += 1
+
+    def _balancear(self) -> None:
+        """Iguala el largo de las colas: los excedentes pasan a las CPUs con menos procesos."""
+        largos = [len(cpu.politica) for cpu in self.cpus]
+        total = sum(largos)
+        base, sobrantes = divmod(total, len(self.cpus))
+        # las CPUs más cargadas conservan el "+1" del reparto
+        por_carga = sorted(range(len(self.cpus)), key=lambda i: -largos[i])
+        objetivo = [base] * len(self.cpus)
+        for i in por_carga[:sobrantes]:
+            objetivo[i] += 1
+
+        excedentes = []
+        for i, cpu in enumerate(self.cpus):
+            for _ in range(largos[i] - objetivo[i]):
+                excedentes.append(cpu.politica.robar())
+        for i, cpu in enumerate(self.cpus):
+            for _ in range(objetivo[i] - largos[i]):
+                cpu.politica.agregar(excedentes.pop(), self.reloj)
+                cpu.migrados += 1
+
+    # ---------------------------------------------------------------
+    #   Resultados
+    # ---------------------------------------------------------------
+    def estado_cpus(self):
+        """Proceso en cada CPU y el largo de su cola de listos."""
+        return [
+            {
+                "cpu": cpu.indice,
+                "pid": cpu.en_cpu.pcb.pid if cpu.en_cpu is not None else None,
+                "listos": len(cpu.politica),
+            }
+            for cpu in self.cpus
+        ]
+
+    def total_cambios_contexto(self) -> int:
+        return sum(cpu.cambios_contexto for cpu in self.cpus)
+
+    def resumen_cpus(self):
+        duracion = self.reloj if self.reloj > 0 else 1
+        return [
+            {
+                "cpu": cpu.indice,
+                "tiempo_ocupado": cpu.ocupado,
+                "utilizacion": cpu.ocupado / duracion,
+                "cambios_contexto": cpu.cambios_contexto,
+                "robos": cpu.robos,
+                "migrados": cpu.migrados,
+            }
+            for cpu in self.cpus
+        ]
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, Optional
+from controllers.colas import instantanea_listos
+from controllers.comparador import ALGORITMOS_COMPARABLES, enviar, resumen_simulacion
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.simulador import SimuladorEventos
+from controllers.simulador_smp import MAX_CPUS
+
+router = APIRouter(prefix="/trabajos", tags=["Trabajos"])
+
+MAX_TRABAJOS = 256      # trabajos recordados; se olvidan primero los terminados más viejos.
+                        # También es el tope de trabajos sin terminar: los siguientes se rechazan
+MAX_ESPERA = 60         # segundos que puede bloquear GET ?esperar=
+
+
+def ejecutar_trabajo(algoritmo, opciones, procesos):
+    """
+    Tarea de un worker (otro proceso): simula sobre su propia copia de los procesos.
+    Devuelve los PCB finales y el resumen (o el resultado SMP si hay varias CPUs).
+    """
+    fabrica = fabrica_politica(
+        algoritmo,
+        quantum=opciones["quantum"],
+        envejecimiento=opciones["envejecimiento"],
+        quantums=opciones["quantums"],
+        periodo_boost=opciones["periodo_boost"],
+    )
+    if opciones["cpus"] > 1:
+        return Planificador().smp(
+            procesos, fabrica, opciones["cpus"], opciones["periodo_balance"], opciones["robo"]
+        )
+    simulador = SimuladorEventos(fabrica(), procesos)
+    terminados = simulador.ejecutar()
+    return {
+        "procesos": [proceso.pcb.to_dict() for proceso in terminados],
+        "resumen": resumen_simulacion(simulador, terminados),
+    }
+
+
+class Trabajo:
+    def __init__(self, ident, algoritmo, opciones, futuro):
+        self.id = ident
+        self.algoritmo = algoritmo
+        self.opciones = opciones
+        self.futuro = futuro
+        self.creado = time.time()
+
+    def estado(self) -> str:
+        if self.futuro.cancelled():
+            return "cancelado"
+        if not self.futuro.done():
+            return "ejecutando" if self.futuro.running() else "pendiente"
+        return "error" if self.futuro.exception() is not None else "terminado"
+
+    def to_dict(self, con_resultado=False) -> Dict[str, Any]:
+        datos = {
+            "id": self.id,
+            "algoritmo": self.algoritmo,
+            "opciones": self.opciones,
+            "estado": self.estado(),
+            "creado": self.creado,
+        }
+        if datos["estado"] == "error":
+            datos["error"] = str(self.futuro.exception())
+        elif datos["estado"] == "terminado" and con_resultado:
+            datos["resultado"] = self.futuro.result()
+        return datos
+
+
+class DemasiadosTrabajos(Exception):
+    """Ya hay `maximo` trabajos sin terminar: no se acepta otro hasta que alguno termine."""
+
+
+class GestorTrabajos:
+    """
+    Registro de trabajos enviados al pool de procesos, con límite de trabajos recordados.
+    Los terminados se olvidan solos; los pendientes no, así que a lo sumo se aceptan
+    `maximo` trabajos sin terminar a la vez.
+    """
+
+    def __init__(self, maximo=MAX_TRABAJOS):
+        self.maximo = maximo
+        self.trabajos = OrderedDict()
+        self._ids = itertools.count(1)
+        self._candado = threading.Lock()
+
+    def en_curso(self) -> int:
+        """Trabajos pendientes o ejecutándose."""
+        return sum(1 for trabajo in list(self.trabajos.values()) if not trabajo.futuro.done())
+
+    def enviar(self, algoritmo, opciones, procesos) -> Trabajo:
+        with self._candado:
+            if self.en_curso() >= self.maximo:
+                raise DemasiadosTrabajos(f"Hay {self.maximo} trabajos sin terminar; intente más tarde")
+            futuro = enviar(ejecutar_trabajo, algoritmo, opciones, procesos)
+            trabajo = Trabajo(str(next(self._ids)), algoritmo, opciones, futuro)
+            self.trabajos[trabajo.id] = trabajo
+            self._olvidar_viejos()
+        return trabajo
+
+    def obtener(self, ident) -> Optional[Trabajo]:
+        return self.trabajos.get(ident)
+
+    def _olvidar_viejos(self) -> None:
+        if len(self.trabajos) <= self.maximo:
+            return
+        for ident in [i for i, t in self.trabajos.items() if t.futuro.done()]:
+            del self.trabajos[ident]
+            if len(self.trabajos) <= self.maximo:
+                break
+
+
+gestor = GestorTrabajos()
+
+
+def _opciones(cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+    opciones = {
+        "quantum": cuerpo.get("quantum", 2),
+        "envejecimiento": cuerpo.get("envejecimiento", 0),
+        "quantums": list(cuerpo.get("quantums", [2, 4, 8])),
+        "periodo_boost": cuerpo.get("periodo_boost", 0),
+        "cpus": cuerpo.get("cpus", 1),
+        "periodo_balance": cuerpo.get("periodo_balance", 0),
+        "robo": bool(cuerpo.get("robo", True)),
+    }
+    if not isinstance(opciones["cpus"], int) or opciones["cpus"] <= 0:
+        raise ValueError("Se necesita al menos una CPU")
+    if opciones["cpus"] > MAX_CPUS:
+        raise ValueError(f"Se admiten a lo sumo {MAX_CPUS} CPUs")
+    if not isinstance(opciones["periodo_balance"], int) or opciones["periodo_balance"] < 0:
+        raise ValueError("El periodo de balanceo no puede ser negativo")
+    return opciones
+
+
+# --- Rutas de API ---
+
+@router.post("")
+def crear_trabajo(cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Envía una simulación en segundo plano sobre una instantánea de la cola de listos.
+    Cuerpo: {"algoritmo": "rr", "quantum": 2, "envejecimiento": 0, "quantums": [2, 4, 8],
+             "periodo_boost": 0, "cpus": 1, "periodo_balance": 0, "robo": true}
+    Devuelve el id para consultar con GET /trabajos/{id}.
+    """
+    algoritmo = cuerpo.get("algoritmo")
+    if algoritmo not in ALGORITMOS_COMPARABLES:
+        raise HTTPException(status_code=400, detail="Algoritmo no válido")
+    try:
+        opciones = _opciones(cuerpo)
+        fabrica_politica(
+            algoritmo, opciones["quantum"], opciones["envejecimiento"],
+            opciones["quantums"], opciones["periodo_boost"],
+        )()   # valida los parámetros antes de encolar el trabajo
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Configuración inválida: {e}")
+    procesos = instantanea_listos()
+    if not procesos:
+        raise HTTPException(status_code=400, detail="No hay procesos para planificar")
+    try:
+        return gestor.enviar(algoritmo, opciones, procesos).to_dict()
+    except DemasiadosTrabajos as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@router.get("")
+def listar_trabajos():
+    return [trabajo.to_dict() for trabajo in list(gestor.trabajos.values())]
+
+
+@router.get("/{ident}")
+async def consultar_trabajo(ident: str, esperar: float = 0) -> Dict[str, Any]:
+    """
+    Estado del trabajo y, si terminó, su resultado.
+    Con ?esperar=S espera hasta S segundos a que termine sin ocupar un hilo.
+    """
+    trabajo = gestor.obtener(ident)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail=f"No existe el trabajo {ident}")
+    if esperar > 0 and not trabajo.futuro.done():
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(trabajo.futuro)), min(esperar, MAX_ESPERA)
+            )
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            if not trabajo.futuro.cancelled():
+                raise   # se canceló la petición, no el trabajo
+        except Exception:
+            pass    # el error del trabajo se informa en su estado
+    return trabajo.to_dict(con_resultado=True)
+
+
+@router.delete("/{ident}")
+def cancelar_trabajo(ident: str) -> Dict[str, Any]:
+    """Cancela el trabajo si todavía no empezó a ejecutarse."""
+    trabajo = gestor.obtener(ident)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail=f"No existe el trabajo {ident}")
+    if not trabajo.futuro.cancel() and not trabajo.futuro.done():
+        raise HTTPException(status_code=409, detail="El trabajo ya se está ejecutando")
+    return trabajo.to_dict()
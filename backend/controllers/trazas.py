@@ -0,0 +1,289 @@
+import csv
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, HTTPException, Request
+from controllers.ingesta import MAX_LARGO_LINEA, campos_proceso, fila_csv, fila_ndjson, lineas
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.simulador_smp import MAX_CPUS
+from models.process import Proceso
+
+router = APIRouter(prefix="/trazas", tags=["Trazas"])
+
+DIRECTORIO_TRAZAS = os.environ.get("DIRECTORIO_TRAZAS", "trazas")
+NOMBRE_VALIDO = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$")
+
+# Formato binario: cabecera y registros de ancho fijo, little-endian
+MAGIA = b"TRZ1"
+VERSION = 1
+CABECERA = struct.Struct("<4sHHQ")      # magia, versión, tamaño de registro, cantidad
+REGISTRO = struct.Struct("<qqqi4x")     # pid, tiempo_llegada, rafaga_cpu, prioridad (32 bytes)
+TAMANO_BUFFER = 1 << 20                 # bytes acumulados antes de escribir al archivo
+MAX_PID_MAPA = 1 << 26                  # PIDs por debajo se marcan en un mapa de bits (8 MiB como máximo)
+
+
+class EscritorTraza:
+    """
+    Escribe una traza binaria registro a registro, sin retener los anteriores.
+    Los registros deben venir ordenados por tiempo de llegada: así la reproducción
+    los lee en secuencia sin ordenar nada. Se escribe en un archivo temporal que
+    reemplaza al destino recién al cerrar (una traza a medias nunca queda visible).
+    Un PID repetido se rechaza: de cada PID se guarda un bit (o, si es muy grande,
+    el PID en un set), no el registro.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        # temporal único: dos subidas con el mismo nombre no se pisan
+        descriptor, self._temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", suffix=".tmp")
+        self._archivo = os.fdopen(descriptor, "wb")
+        self._archivo.write(CABECERA.pack(MAGIA, VERSION, REGISTRO.size, 0))
+        self._buffer = bytearray()
+        self.cantidad = 0
+        self._ultima_llegada = 0
+        self._mapa_pids = bytearray()
+        self._otros_pids = set()
+
+    def agregar(self, pid: int, llegada: int, rafaga: int, prioridad: int = 1) -> None:
+        if llegada < self._ultima_llegada:
+            raise ValueError(
+                f"La traza debe estar ordenada por tiempo de llegada ({llegada} después de {self._ultima_llegada})"
+            )
+        if self._marcar_pid(pid):
+            raise ValueError(f"PID {pid} repetido")
+        try:
+            self._buffer += REGISTRO.pack(pid, llegada, rafaga, prioridad)
+        except struct.error:
+            raise ValueError("Valor fuera del rango del formato binario")
+        self._ultima_llegada = llegada
+        self.cantidad += 1
+        if len(self._buffer) >= TAMANO_BUFFER:
+            self._archivo.write(self._buffer)
+            self._buffer.clear()
+
+    def _marcar_pid(self, pid: int) -> bool:
+        """Registra el PID; True si ya estaba en la traza."""
+        if not 0 <= pid < MAX_PID_MAPA:
+            visto = pid in self._otros_pids
+            self._otros_pids.add(pid)
+            return visto
+        indice, bit = pid >> 3, 1 << (pid & 7)
+        if indice >= len(self._mapa_pids):
+            # crece al doble (o hasta el índice) para no copiar el mapa en cada PID nuevo
+            self._mapa_pids.extend(bytes(max(indice + 1, 2 * len(self._mapa_pids)) - len(self._mapa_pids)))
+        visto = bool(self._mapa_pids[indice] & bit)
+        self._mapa_pids[indice] |= bit
+        return visto
+
+    def cerrar(self) -> None:
+        self._archivo.write(self._buffer)
+        self._archivo.seek(0)
+        self._archivo.write(CABECERA.pack(MAGIA, VERSION, REGISTRO.size, self.cantidad))
+        self._archivo.close()
+        os.replace(self._temporal, self.ruta)
+
+    def descartar(self) -> None:
+        self._archivo.close()
+        os.remove(self._temporal)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+
+class TrazaBinaria:
+    """
+    Traza binaria abierta con mmap (solo lectura).
+    Los registros se decodifican a medida que se recorren: el archivo no se copia
+    a memoria y las páginas ya leídas las puede descartar el sistema operativo.
+    """
+
+    def __init__(self, ruta: str):
+        with open(ruta, "rb") as archivo:
+            tamano = os.fstat(archivo.fileno()).st_size
+            if tamano < CABECERA.size:
+                raise ValueError("El archivo no es una traza (muy corto)")
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, tamano_registro, cantidad = CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA or version != VERSION or tamano_registro != REGISTRO.size:
+            self.cerrar()
+            raise ValueError("El archivo no es una traza de este formato")
+        if tamano != CABECERA.size + cantidad * REGISTRO.size:
+            self.cerrar()
+            raise ValueError("La traza está truncada")
+        self.cantidad = cantidad
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mapa.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __len__(self) -> int:
+        return self.cantidad
+
+    def registros(self):
+        """(pid, llegada, ráfaga, prioridad) de cada registro, en orden."""
+        desempaquetar = REGISTRO.unpack_from
+        mapa = self._mapa
+        for desplazamiento in range(CABECERA.size, CABECERA.size + self.cantidad * REGISTRO.size, REGISTRO.size):
+            yield desempaquetar(mapa, desplazamiento)
+
+    def procesos(self):
+        """Un Proceso por registro, creado recién cuando el simulador lo pide."""
+        for pid, llegada, rafaga, prioridad in self.registros():
+            yield Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad,
+                          usuario="traza")
+
+    def cerrar(self) -> None:
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def _agregar_fila(escritor: EscritorTraza, fila: Dict[str, Any]) -> None:
+    pid, llegada, rafaga, prioridad, rafagas = campos_proceso(fila)
+    if rafagas:
+        raise ValueError("El formato de traza no admite ráfagas de E/S")
+    escritor.agregar(pid, llegada, rafaga, prioridad)
+
+
+def convertir_csv(origen, ruta: str) -> int:
+    """
+    Convierte un CSV con encabezado (los campos de /colas/agregar/lote, ordenado por
+    tiempo_llegada) a una traza binaria. `origen` es un iterable de líneas de texto,
+    p. ej. un archivo abierto. Devuelve la cantidad de registros.
+    """
+    lector = csv.reader(origen)
+    encabezado = [nombre.strip() for nombre in next(lector, [])]
+    with EscritorTraza(ruta) as escritor:
+        for valores in lector:
+            if not valores:
+                continue
+            if len(valores) != len(encabezado):
+                raise ValueError(
+                    f"Línea {lector.line_num}: se esperaban {len(encabezado)} columnas y hay {len(valores)}"
+                )
+            try:
+                _agregar_fila(escritor, dict(zip(encabezado, valores)))
+            except (ValueError, TypeError, OverflowError) as e:
+                raise ValueError(f"Línea {lector.line_num}: {e}")
+    return escritor.cantidad
+
+
+async def convertir_cuerpo(fragmentos, formato: str, ruta: str) -> int:
+    """Como convertir_csv, pero leyendo el cuerpo de una petición (CSV o NDJSON) en streaming."""
+    encabezado = None
+    with EscritorTraza(ruta) as escritor:
+        async for numero, linea in lineas(fragmentos):
+            try:
+                if linea is None:
+                    raise ValueError(f"Línea de más de {MAX_LARGO_LINEA} bytes")
+                if not linea.strip():
+                    continue
+                if formato == "csv":
+                    if encabezado is None:
+                        encabezado = [nombre.strip() for nombre in next(csv.reader([linea]))]
+                        continue
+                    fila = fila_csv(linea, encabezado)
+                else:
+                    fila = fila_ndjson(linea)
+                _agregar_fila(escritor, fila)
+            except (ValueError, TypeError, OverflowError) as e:
+                raise ValueError(f"Línea {numero}: {e}")
+    return escritor.cantidad
+
+
+def _ruta(nombre: str) -> str:
+    if not NOMBRE_VALIDO.match(nombre) or nombre.endswith(".tmp"):
+        raise HTTPException(status_code=400, detail="Nombre de traza no válido")
+    return os.path.join(DIRECTORIO_TRAZAS, nombre)
+
+
+def _abrir(nombre: str) -> TrazaBinaria:
+    ruta = _ruta(nombre)
+    if not os.path.isfile(ruta):
+        raise HTTPException(status_code=404, detail=f"No existe la traza {nombre}")
+    try:
+        return TrazaBinaria(ruta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# --- Rutas de API ---
+
+@router.get("")
+def listar_trazas():
+    if not os.path.isdir(DIRECTORIO_TRAZAS):
+        return []
+    resultado = []
+    for nombre in sorted(os.listdir(DIRECTORIO_TRAZAS)):
+        if nombre.endswith(".tmp"):
+            continue
+        try:
+            with TrazaBinaria(os.path.join(DIRECTORIO_TRAZAS, nombre)) as traza:
+                resultado.append({"nombre": nombre, "registros": len(traza)})
+        except (OSError, ValueError):
+            continue
+    return resultado
+
+
+@router.put("/{nombre}")
+async def subir_traza(nombre: str, request: Request, formato: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convierte el cuerpo (CSV con encabezado o NDJSON, ordenado por tiempo_llegada) a una
+    traza binaria guardada con ese nombre. Se lee en streaming y se escribe registro a
+    registro: del cuerpo solo se retiene un bit por PID (para rechazar los repetidos).
+    Reemplaza una traza existente.
+    """
+    ruta = _ruta(nombre)
+    if formato is None:
+        formato = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    if formato not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Formato no soportado (use ndjson o csv)")
+    os.makedirs(DIRECTORIO_TRAZAS, exist_ok=True)
+    try:
+        cantidad = await convertir_cuerpo(request.stream(), formato, ruta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"nombre": nombre, "registros": cantidad, "bytes": os.path.getsize(ruta)}
+
+
+@router.post("/{nombre}/reproducir/{algoritmo}")
+def reproducir_traza(nombre: str, algoritmo: str, quantum: int = 2, envejecimiento: int = 0,
+                     cpus: int = 1, periodo_balance: int = 0, robo: bool = True) -> Dict[str, Any]:
+    """
+    Reproduce la traza con el algoritmo pedido y devuelve las métricas agregadas
+    (las mismas que ?resumen=true en /planificar). No pasa por la cola de listos.
+    """
+    fabrica = fabrica_politica(algoritmo, quantum, envejecimiento)
+    if fabrica is None:
+        raise HTTPException(status_code=400, detail="Algoritmo no válido")
+    if not 1 <= cpus <= MAX_CPUS:
+        raise HTTPException(status_code=400, detail=f"Se admiten entre 1 y {MAX_CPUS} CPUs")
+    with _abrir(nombre) as traza:
+        inicio = time.perf_counter()
+        try:
+            resultado = Planificador().reproducir(traza.procesos(), fabrica, cpus, periodo_balance, robo)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Configuración inválida: {e}")
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+@router.delete("/{nombre}")
+def borrar_traza(nombre: str) -> Dict[str, Any]:
+    ruta = _ruta(nombre)
+    if not os.path.isfile(ruta):
+        raise HTTPException(status_code=404, detail=f"No existe la traza {nombre}")
+    os.remove(ruta)
+    return {"mensaje": f"Traza {nombre} borrada"}
@@ -1,10 +1,31 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from controllers.colas import router as colas_router
-from controllers.colas import cola_listos
-from controllers.planificador import Planificador
+from controllers.colas import cola_listos, cola_bloqueados, cache_planificacion, instantanea_listos
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.planificador_lote import ALGORITMOS_LOTE
+from controllers.simulador_smp import MAX_CPUS
+from controllers.exportacion import escribir_npz
+from controllers.comparador import ALGORITMOS_COMPARABLES, barrido_quantum, comparar, instantanea
 from models.process import Proceso
 from controllers.filesystem import router as filesystem_router
+from controllers.filesystem import get_fs
+from controllers.trabajos import router as trabajos_router
+from controllers.sesiones import router as sesiones_router
+from controllers.trazas import router as trazas_router
+from controllers.sesiones import gestor as gestor_sesiones
+from controllers.trabajos import gestor as gestor_trabajos
+from controllers.instrumentacion import REGISTRO, MedirPeticiones, configurar_logging
+from controllers.instrumentacion import router as instrumentacion_router
+from controllers.perfilador import router as perfilador_router
+from models.filesystem.sistema_de_archivos import CONTADORES as CONTADORES_FS
+from models.tabla_procesos import TABLA_PROCESOS
+
+configurar_logging()
 
 app = FastAPI(
     title="Simulador de Planificación de Procesos",
@@ -24,32 +45,360 @@ app.add_middleware(
 )
 
 app.include_router(filesystem_router)
+app.include_router(trabajos_router)
+app.include_router(sesiones_router)
+app.include_router(trazas_router)
+app.include_router(instrumentacion_router)
+# Perfilador por muestreo: solo si se pide al arrancar (PERFILADOR=1)
+if os.environ.get("PERFILADOR") == "1":
+    app.include_router(perfilador_router)
+# El último middleware agregado es el más externo: mide también el de CORS
+app.add_middleware(MedirPeticiones)
+
+
+def _metricas_internas():
+    """Valores que ya llevan otros módulos, leídos al exponer /metrics."""
+    cache = cache_planificacion.estadisticas()
+    cache_rutas = get_fs().cache_rutas
+    cache_permisos = get_fs().cache_permisos
+    return [
+        ("cache_planificacion_aciertos_total", "counter", "Aciertos del cache de /planificar", cache["aciertos"]),
+        ("cache_planificacion_fallos_total", "counter", "Fallos del cache de /planificar", cache["fallos"]),
+        ("cache_planificacion_desalojos_total", "counter", "Entradas desalojadas por LRU", cache["desalojos"]),
+        ("cache_planificacion_entradas", "gauge", "Resultados guardados en el cache", cache["entradas"]),
+        ("cache_planificacion_bytes", "gauge", "Bytes aproximados de los resultados en cache", cache["bytes"]),
+        ("cola_listos_procesos", "gauge", "Procesos en la cola de listos", len(cola_listos)),
+        ("cola_bloqueados_procesos", "gauge", "Procesos en la cola de bloqueados", len(cola_bloqueados)),
+        ("tabla_procesos_filas", "gauge", "Filas en uso de la tabla de procesos", len(TABLA_PROCESOS)),
+        ("trabajos_registrados", "gauge", "Trabajos asíncronos recordados", len(gestor_trabajos.trabajos)),
+        ("sesiones_abiertas", "gauge", "Sesiones de simulación abiertas", len(gestor_sesiones.sesiones)),
+        ("fs_resoluciones_ruta_total", "counter", "Rutas de directorio resueltas",
+         CONTADORES_FS["resoluciones_ruta"]),
+        ("fs_componentes_recorridos_total", "counter", "Componentes de ruta recorridos al resolver",
+         CONTADORES_FS["componentes_recorridos"]),
+        ("fs_chequeos_permisos_total", "counter", "Chequeos de permisos",
+         CONTADORES_FS["chequeos_permisos"]),
+        ("fs_cache_rutas_aciertos_total", "counter", "Rutas resueltas por el cache de rutas", cache_rutas.aciertos),
+        ("fs_cache_rutas_fallos_total", "counter", "Rutas que hubo que recorrer", cache_rutas.fallos),
+        ("fs_cache_rutas_entradas", "gauge", "Rutas en el cache (incluye las ausentes)", len(cache_rutas)),
+    ] + ([
+        ("fs_cache_permisos_aciertos_total", "counter", "Decisiones de acceso tomadas del cache",
+         cache_permisos.aciertos),
+        ("fs_cache_permisos_fallos_total", "counter", "Decisiones de acceso calculadas", cache_permisos.fallos),
+        ("fs_cache_permisos_entradas", "gauge", "Decisiones en el cache de permisos", len(cache_permisos)),
+    ] if cache_permisos is not None else [])
+
+
+REGISTRO.registrar_recolector(_metricas_internas)
 
 @app.get("/")
 def home():
     return {"mensaje": "Servidor FastAPI funcionando correctamente 🚀"}
 
-lista_procesos = list(cola_listos.queue)
+lista_procesos = list(cola_listos)
 
 planificador = Planificador()
 
-@app.post("/planificar/{algoritmo}")
-def planificar(algoritmo: str):
-    # copiamos los procesos de la cola como lista
-    procesos = list(cola_listos.queue)
+def procesos_a_planificar():
+    # copiamos los procesos de la cola (con PCB propio) para no tocar la cola real
+    procesos = instantanea_listos()
 
     for p in procesos:
         p.reset()
+    return procesos
 
-    if len(procesos) == 0:
+def consultar_cache(*parametros):
+    """
+    Busca el resultado de `parametros` para la cola de listos actual.
+    La huella y, si no hay resultado guardado, la instantánea a simular se toman
+    con el lock de la cola: un /colas/agregar en el medio no puede dejar guardado
+    un resultado bajo la huella de otra carga.
+    Devuelve (clave, resultado o None, procesos a simular o None).
+    """
+    with cola_listos.candado:
+        clave = (cache_planificacion.huella(cola_listos),) + parametros
+        resultado = cache_planificacion.obtener(clave)
+        procesos = procesos_a_planificar() if resultado is None else None
+    return clave, resultado, procesos
+
+# Debe registrarse antes de /planificar/{algoritmo} para que "mlfq" no caiga ahí
+@app.post("/planificar/mlfq")
+def planificar_mlfq(configuracion: Optional[Dict[str, Any]] = None, resumen: bool = False):
+    """
+    MLFQ configurable. Cuerpo opcional:
+        {"quantums": [2, 4, 8], "periodo_boost": 50}
+    Un nivel por cada quantum (el primero es el de mayor prioridad).
+    Con ?resumen=true devuelve solo las métricas agregadas.
+    """
+    configuracion = configuracion or {}
+    quantums = configuracion.get("quantums", [2, 4, 8])
+    periodo_boost = configuracion.get("periodo_boost", 0)
+    if len(cola_listos) == 0:
+        return {"error": "No hay procesos para planificar"}
+    try:
+        parametros = ("mlfq", tuple(quantums), periodo_boost, resumen)
+        hash(parametros)
+    except TypeError as e:
+        return {"error": f"Configuración MLFQ inválida: {e}"}
+    clave, resultado, procesos = consultar_cache(*parametros)
+    if resultado is not None:
+        return resultado
+    try:
+        resultado = planificador.mlfq(
+            procesos, quantums=quantums, periodo_boost=periodo_boost, resumen=resumen
+        )
+    except (TypeError, ValueError) as e:
+        return {"error": f"Configuración MLFQ inválida: {e}"}
+    cache_planificacion.guardar(clave, resultado)
+    return resultado
+
+# También antes de /planificar/{algoritmo}
+@app.post("/planificar/comparar")
+def planificar_comparar(configuracion: Optional[Dict[str, Any]] = None):
+    """
+    Compara varios algoritmos sobre una misma instantánea de la cola de listos.
+    Cuerpo opcional:
+        {"algoritmos": ["fcfs", "rr", "sjf"], "quantum": 2, "envejecimiento": 0,
+         "quantums": [2, 4, 8], "periodo_boost": 0}
+    Devuelve por algoritmo: espera, retorno y respuesta promedio, throughput
+    y cambios de contexto.
+    """
+    configuracion = configuracion or {}
+    algoritmos = configuracion.get("algoritmos", list(ALGORITMOS_COMPARABLES))
+    if not isinstance(algoritmos, list) or not all(isinstance(a, str) for a in algoritmos):
+        return {"error": "'algoritmos' debe ser una lista de nombres de algoritmo"}
+    if not algoritmos:
+        return {"error": "Indique al menos un algoritmo"}
+    invalidos = [a for a in algoritmos if a not in ALGORITMOS_COMPARABLES]
+    if invalidos:
+        return {"error": f"Algoritmos no válidos: {', '.join(map(str, invalidos))}"}
+    carga = instantanea(cola_listos)
+    if len(carga) == 0:
         return {"error": "No hay procesos para planificar"}
+    opciones = {
+        "quantum": configuracion.get("quantum", 2),
+        "envejecimiento": configuracion.get("envejecimiento", 0),
+        "quantums": configuracion.get("quantums", [2, 4, 8]),
+        "periodo_boost": configuracion.get("periodo_boost", 0),
+    }
+    try:
+        return comparar(carga, list(dict.fromkeys(algoritmos)), opciones)
+    except (TypeError, ValueError) as e:
+        return {"error": f"Configuración inválida: {e}"}
 
+ALGORITMOS_PLANIFICAR = ("fcfs", "rr", "sjf", "srtf", "prioridad", "prioridad_expropiativo")
+
+@app.get("/planificar/cache")
+def estadisticas_cache():
+    """Aciertos, fallos y desalojos del cache de resultados de /planificar."""
+    return cache_planificacion.estadisticas()
+
+@app.post("/planificar/{algoritmo}")
+def planificar(algoritmo: str, envejecimiento: int = 0, resumen: bool = False):
+    """
+    Planifica la cola de listos con el algoritmo dado.
+    Con ?resumen=true devuelve solo métricas agregadas (promedio, p50, p95 y p99 de
+    espera, retorno y respuesta, throughput, utilización y cambios de contexto).
+    """
+    if len(cola_listos) == 0:
+        return {"error": "No hay procesos para planificar"}
+    if envejecimiento < 0:
+        return {"error": "El intervalo de envejecimiento no puede ser negativo"}
+    if algoritmo not in ALGORITMOS_PLANIFICAR:
+        return {"error": "Algoritmo no válido"}
+
+    if not algoritmo.startswith("prioridad"):
+        envejecimiento = 0   # no afecta al resultado: no separar entradas del cache
+    clave, resultado, procesos = consultar_cache(algoritmo, envejecimiento, resumen)
+    if resultado is None:
+        resultado = ejecutar_algoritmo(algoritmo, procesos, envejecimiento, resumen)
+        cache_planificacion.guardar(clave, resultado)
+    return resultado
+
+def ejecutar_algoritmo(algoritmo, procesos, envejecimiento=0, resumen=False):
     if algoritmo == "fcfs":
-        return planificador.fcfs(procesos)
+        return planificador.fcfs(procesos, resumen=resumen)
     elif algoritmo == "rr":
-        return planificador.round_robin(procesos, quantum=2)
+        return planificador.round_robin(procesos, quantum=2, resumen=resumen)
     elif algoritmo == "sjf":
-        return planificador.sjf(procesos)
+        return planificador.sjf(procesos, resumen=resumen)
+    elif algoritmo == "srtf":
+        return planificador.srtf(procesos, resumen=resumen)
+    elif algoritmo == "prioridad":
+        return planificador.prioridad(
+            procesos, expropiativo=False, envejecimiento=envejecimiento, resumen=resumen
+        )
+    elif algoritmo == "prioridad_expropiativo":
+        return planificador.prioridad(
+            procesos, expropiativo=True, envejecimiento=envejecimiento, resumen=resumen
+        )
+    else:
+        return {"error": "Algoritmo no válido"}
+
+
+
+def _ndjson(registros, por_bloque=1000):
+    """Serializa un iterable de dicts como NDJSON, en bloques de varias líneas por envío."""
+    bloque = []
+    for registro in registros:
+        bloque.append(json.dumps(registro))
+        if len(bloque) >= por_bloque:
+            yield "\n".join(bloque) + "\n"
+            bloque = []
+    if bloque:
+        yield "\n".join(bloque) + "\n"
+
+
+@app.post("/planificar/{algoritmo}/linea_de_tiempo")
+def planificar_linea_de_tiempo(
+    algoritmo: str,
+    cpus: int = 1,
+    periodo_balance: int = 0,
+    robo: bool = True,
+    quantum: int = 2,
+    envejecimiento: int = 0,
+):
+    """
+    Diagrama de Gantt en streaming (NDJSON): una línea {"pid", "cpu", "inicio", "fin"}
+    por tramo ejecutado, enviada mientras la simulación avanza.
+    """
+    fabrica = fabrica_politica(algoritmo, quantum=quantum, envejecimiento=envejecimiento)
+    if fabrica is None:
+        return {"error": "Algoritmo no válido"}
+    if cpus <= 0:
+        return {"error": "Se necesita al menos una CPU"}
+    if cpus > MAX_CPUS:
+        return {"error": f"Se admiten a lo sumo {MAX_CPUS} CPUs"}
+    if periodo_balance < 0:
+        return {"error": "El periodo de balanceo no puede ser negativo"}
+    try:
+        fabrica()   # valida los parámetros antes de empezar a transmitir
+    except ValueError as e:
+        return {"error": str(e)}
+    procesos = procesos_a_planificar()
+    if len(procesos) == 0:
+        return {"error": "No hay procesos para planificar"}
+    tramos = planificador.linea_de_tiempo(procesos, fabrica, cpus, periodo_balance, robo)
+    return StreamingResponse(_ndjson(tramos), media_type="application/x-ndjson")
+
+
+@app.post("/planificar/{algoritmo}/exportar")
+def planificar_exportar(
+    algoritmo: str,
+    cpus: int = 1,
+    periodo_balance: int = 0,
+    robo: bool = True,
+    quantum: int = 2,
+    envejecimiento: int = 0,
+):
+    """
+    Resultados por proceso y línea de tiempo en un .npz sin comprimir, una columna
+    int64 por miembro: procesos/{pid, tiempo_llegada, rafaga_cpu, prioridad,
+    tiempo_inicio, tiempo_finalizacion, tiempo_espera, tiempo_retorno} (en orden de
+    finalización) y tramos/{pid, cpu, inicio, fin}. Se abre con np.load o, sin
+    copiar, con controllers.exportacion.abrir_exportacion.
+    """
+    fabrica = fabrica_politica(algoritmo, quantum=quantum, envejecimiento=envejecimiento)
+    if fabrica is None:
+        return {"error": "Algoritmo no válido"}
+    if cpus <= 0:
+        return {"error": "Se necesita al menos una CPU"}
+    if cpus > MAX_CPUS:
+        return {"error": f"Se admiten a lo sumo {MAX_CPUS} CPUs"}
+    procesos = procesos_a_planificar()
+    if len(procesos) == 0:
+        return {"error": "No hay procesos para planificar"}
+    try:
+        resultado = planificador.exportar(procesos, fabrica, cpus, periodo_balance, robo)
+    except ValueError as e:
+        return {"error": str(e)}
+    return StreamingResponse(
+        escribir_npz(resultado.tablas()),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{algoritmo}.npz"'},
+    )
+
+
+@app.post("/planificar/rr/barrido")
+def planificar_rr_barrido(configuracion: Dict[str, Any]):
+    """
+    Barrido del quantum de Round Robin en una sola petición. Cuerpo:
+        {"quantums": [1, 2, 4, 8]}   o   {"desde": 1, "hasta": 20, "paso": 1}
+    Devuelve las curvas de espera, retorno, respuesta, cambios de contexto y
+    throughput en el mismo orden que los quantums.
+    """
+    if "quantums" not in configuracion and not ("desde" in configuracion and "hasta" in configuracion):
+        return {"error": "Indique 'quantums' o el rango 'desde'/'hasta'"}
+    carga = instantanea(cola_listos)
+    if len(carga) == 0:
+        return {"error": "No hay procesos para planificar"}
+    if "quantums" in configuracion:
+        quantums = configuracion["quantums"]
+        if not isinstance(quantums, list):
+            return {"error": "'quantums' debe ser una lista de enteros"}
     else:
+        desde, hasta, paso = configuracion["desde"], configuracion["hasta"], configuracion.get("paso", 1)
+        if not all(isinstance(v, int) and not isinstance(v, bool) for v in (desde, hasta, paso)):
+            return {"error": "'desde', 'hasta' y 'paso' deben ser enteros"}
+        if paso <= 0:
+            return {"error": "El paso debe ser positivo"}
+        # el range no se materializa: su largo se conoce sin recorrerlo
+        quantums = range(desde, hasta + 1, paso)
+    try:
+        return barrido_quantum(carga, quantums)
+    except (TypeError, ValueError) as e:
+        return {"error": f"Barrido inválido: {e}"}
+
+
+@app.post("/planificar/smp/{algoritmo}")
+def planificar_smp(
+    algoritmo: str,
+    cpus: int = 2,
+    periodo_balance: int = 0,
+    robo: bool = True,
+    quantum: int = 2,
+    envejecimiento: int = 0,
+    resumen: bool = False,
+):
+    """
+    Simula la cola de listos en `cpus` núcleos con colas por CPU, balanceo y robo de trabajo.
+    Con ?resumen=true omite procesos y tramos y devuelve solo las métricas agregadas.
+    """
+    fabrica = fabrica_politica(algoritmo, quantum=quantum, envejecimiento=envejecimiento)
+    if fabrica is None:
         return {"error": "Algoritmo no válido"}
+    if cpus <= 0:
+        return {"error": "Se necesita al menos una CPU"}
+    if cpus > MAX_CPUS:
+        return {"error": f"Se admiten a lo sumo {MAX_CPUS} CPUs"}
+    procesos = procesos_a_planificar()
+    if len(procesos) == 0:
+        return {"error": "No hay procesos para planificar"}
+    try:
+        return planificador.smp(procesos, fabrica, cpus, periodo_balance, robo, resumen)
+    except ValueError as e:
+        return {"error": str(e)}
+
 
+@app.post("/planificar/lote/{algoritmo}")
+def planificar_lote(algoritmo: str, columnas: Dict[str, List[int]]):
+    """
+    Modo por lotes para cargas sintéticas grandes (sin pasar por la cola de listos).
+    Recibe columnas {"pid", "tiempo_llegada", "rafaga_cpu", "prioridad"} y devuelve
+    columnas con inicio, finalización, espera y retorno.
+    """
+    if algoritmo not in ALGORITMOS_LOTE:
+        return {"error": "Algoritmo no válido para modo por lotes"}
+    faltantes = [c for c in ("pid", "tiempo_llegada", "rafaga_cpu") if c not in columnas]
+    if faltantes:
+        return {"error": f"Faltan columnas: {', '.join(faltantes)}"}
+    try:
+        resultado = ALGORITMOS_LOTE[algoritmo](
+            columnas["pid"],
+            columnas["tiempo_llegada"],
+            columnas["rafaga_cpu"],
+            columnas.get("prioridad"),
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    return {nombre: valores.tolist() for nombre, valores in resultado.items()}
@@ -1,16 +1,40 @@
-from typing import Any
+from typing import Any, Iterator, Optional
+from .bloques import ContenidoBloques
+from .permisos import NodoConPermisos
 
-class Archivo:
+class Archivo(NodoConPermisos):
     def __init__(self, nombre: str, propietario: Any, permisos: str = "644"):
         self.nombre = nombre
-        self.propietario = propietario   # Usuario
-        self.permisos = permisos         # "644" (numeric)
-        self.contenido = ""
-        self.tamanio = 0
+        self._iniciar_permisos(propietario, permisos)   # Usuario; "644" se guarda como modo 0o644
+        self.datos = ContenidoBloques()  # contenido en bloques (bytes, UTF-8 para texto)
+
+    @property
+    def tamanio(self) -> int:
+        """Tamaño en bytes."""
+        return self.datos.tamanio
+
+    @property
+    def contenido(self) -> str:
+        return self.leer()
 
     def escribir(self, texto: str):
-        self.contenido = texto
-        self.tamanio = len(texto)
+        self.datos.reemplazar(texto.encode("utf-8"))
 
     def leer(self) -> str:
-        return self.contenido
+        return self.datos.leer().decode("utf-8", errors="replace")
+
+    # --- E/S por desplazamiento (bytes) ---
+    def leer_en(self, desplazamiento: int, cantidad: Optional[int] = None) -> bytes:
+        return self.datos.leer(desplazamiento, cantidad)
+
+    def vistas(self, desplazamiento: int = 0, cantidad: Optional[int] = None) -> Iterator[memoryview]:
+        return self.datos.vistas(desplazamiento, cantidad)
+
+    def escribir_en(self, desplazamiento: int, datos: bytes) -> int:
+        return self.datos.escribir_en(desplazamiento, datos)
+
+    def agregar(self, datos: bytes) -> int:
+        return self.datos.agregar(datos)
+
+    def truncar(self, tamanio: int) -> None:
+        self.datos.truncar(tamanio)
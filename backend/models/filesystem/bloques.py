@@ -0,0 +1,107 @@
+from typing import Iterator, List, Optional
+
+TAMANO_BLOQUE = 4096                # bytes por bloque
+MAX_TAMANO_ARCHIVO = 1 << 30        # un archivo no puede crecer más allá de 1 GiB
+_CEROS = memoryview(bytes(TAMANO_BLOQUE))   # contenido de un bloque no asignado (hueco)
+
+
+class ContenidoBloques:
+    """
+    Contenido de un archivo en bloques fijos de TAMANO_BLOQUE bytes (bytearray),
+    con un mapa de bloques como el de un inodo: bloques[i] es el bloque i del
+    archivo, o None si es un hueco (se lee como ceros y no ocupa memoria).
+    Leer o escribir en un desplazamiento solo toca los bloques de ese rango:
+    una edición chica en un archivo grande no copia el archivo.
+    Invariante: dentro de un bloque, los bytes después del final del archivo son cero.
+    """
+
+    def __init__(self, datos: bytes = b""):
+        self.bloques: List[Optional[bytearray]] = []
+        self.tamanio = 0
+        if datos:
+            self.escribir_en(0, datos)
+
+    def __len__(self) -> int:
+        return self.tamanio
+
+    def vistas(self, desplazamiento: int = 0, cantidad: Optional[int] = None) -> Iterator[memoryview]:
+        """
+        El rango pedido como memoryviews sobre los bloques, sin copiar (un trozo por bloque).
+        Las vistas reflejan escrituras posteriores: conviene consumirlas enseguida.
+        Si el archivo se achica mientras se recorre, el recorrido termina en el nuevo final.
+        """
+        if desplazamiento < 0:
+            raise ValueError("El desplazamiento no puede ser negativo")
+        fin = self.tamanio if cantidad is None else min(self.tamanio, desplazamiento + cantidad)
+        posicion = desplazamiento
+        while posicion < min(fin, self.tamanio):
+            indice, desde = divmod(posicion, TAMANO_BLOQUE)
+            hasta = min(TAMANO_BLOQUE, desde + min(fin, self.tamanio) - posicion)
+            try:
+                bloque = self.bloques[indice]
+            except IndexError:
+                return
+            yield (_CEROS if bloque is None else memoryview(bloque))[desde:hasta]
+            posicion += hasta - desde
+
+    def leer(self, desplazamiento: int = 0, cantidad: Optional[int] = None) -> bytes:
+        """Como pread: hasta `cantidad` bytes desde `desplazamiento` (menos si llega al final)."""
+        return b"".join(self.vistas(desplazamiento, cantidad))
+
+    def escribir_en(self, desplazamiento: int, datos) -> int:
+        """Como pwrite: escribe en `desplazamiento`; si queda más allá del final, lo intermedio es un hueco."""
+        vista = memoryview(datos).cast("B")
+        fin = desplazamiento + len(vista)
+        if desplazamiento < 0:
+            raise ValueError("El desplazamiento no puede ser negativo")
+        if fin > MAX_TAMANO_ARCHIVO:
+            raise ValueError(f"El archivo no puede superar {MAX_TAMANO_ARCHIVO} bytes")
+        if not vista:
+            # como pwrite con 0 bytes: no cambia el tamaño aunque el desplazamiento pase el final
+            return 0
+        faltan = -(-fin // TAMANO_BLOQUE) - len(self.bloques)
+        if faltan > 0:
+            self.bloques.extend([None] * faltan)
+        posicion = desplazamiento
+        escrito = 0
+        while escrito < len(vista):
+            indice, desde = divmod(posicion, TAMANO_BLOQUE)
+            largo = min(TAMANO_BLOQUE - desde, len(vista) - escrito)
+            bloque = self.bloques[indice]
+            if bloque is None:
+                bloque = self.bloques[indice] = bytearray(TAMANO_BLOQUE)
+            bloque[desde:desde + largo] = vista[escrito:escrito + largo]
+            posicion += largo
+            escrito += largo
+        self.tamanio = max(self.tamanio, fin)
+        return escrito
+
+    def agregar(self, datos) -> int:
+        """Escribe al final del archivo."""
+        return self.escribir_en(self.tamanio, datos)
+
+    def truncar(self, tamanio: int) -> None:
+        """Achica (descarta los bloques sobrantes) o agranda con un hueco hasta `tamanio` bytes."""
+        if tamanio < 0:
+            raise ValueError("El tamaño no puede ser negativo")
+        if tamanio > MAX_TAMANO_ARCHIVO:
+            raise ValueError(f"El archivo no puede superar {MAX_TAMANO_ARCHIVO} bytes")
+        if tamanio < self.tamanio:
+            # primero el tamaño: quien esté leyendo deja de pedir los bloques que se descartan
+            self.tamanio = tamanio
+            del self.bloques[-(-tamanio // TAMANO_BLOQUE):]
+            resto = tamanio % TAMANO_BLOQUE
+            if resto and self.bloques[-1] is not None:
+                # la cola del último bloque vuelve a cero (ver invariante)
+                self.bloques[-1][resto:] = bytes(TAMANO_BLOQUE - resto)
+        else:
+            faltan = -(-tamanio // TAMANO_BLOQUE) - len(self.bloques)
+            if faltan > 0:
+                self.bloques.extend([None] * faltan)
+        self.tamanio = tamanio
+
+    def reemplazar(self, datos) -> None:
+        """Reemplaza todo el contenido."""
+        self.bloques = []
+        self.tamanio = 0
+        self.escribir_en(0, datos)
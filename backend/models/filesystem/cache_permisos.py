@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import Tuple
+from .permisos import NodoConPermisos, busqueda_permitida, derechos
+
+MAX_ENTRADAS = 4096     # decisiones recordadas por tipo; se descarta la usada hace más tiempo
+
+
+class CachePermisos:
+    """
+    Cache opcional de decisiones de acceso por (uid, nodo).
+    - derechos: el dígito rwx del usuario sobre el nodo, junto con la generación de
+      permisos del nodo; un chmod/chown del nodo la cambia y la entrada deja de valer.
+    - búsqueda: si el usuario tiene x en el directorio y en todos sus ancestros.
+      Depende de varios nodos, así que se valida con la época global de permisos
+      (cualquier chmod/chown la cambia). Con un acierto, verificar una ruta entera es O(1).
+    """
+
+    def __init__(self, maximo=MAX_ENTRADAS):
+        self.maximo = maximo
+        self.decisiones: "OrderedDict[Tuple, Tuple[int, int]]" = OrderedDict()    # (uid, nodo) -> (generación, rwx)
+        self.busquedas: "OrderedDict[Tuple, Tuple[int, bool]]" = OrderedDict()    # (uid, dir) -> (época, permitido)
+        self.aciertos = 0
+        self.fallos = 0
+        self._candado = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.decisiones) + len(self.busquedas)
+
+    def derechos(self, usuario, nodo) -> int:
+        clave = (usuario.uid, nodo)
+        with self._candado:
+            entrada = self.decisiones.get(clave)
+            if entrada is not None and entrada[0] == nodo.generacion_permisos:
+                self.decisiones.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[1]
+            self.fallos += 1
+        valor = derechos(usuario, nodo)
+        self._agregar(self.decisiones, clave, (nodo.generacion_permisos, valor))
+        return valor
+
+    def busqueda(self, usuario, directorio) -> bool:
+        clave = (usuario.uid, directorio)
+        with self._candado:
+            epoca = NodoConPermisos.epoca
+            entrada = self.busquedas.get(clave)
+            if entrada is not None and entrada[0] == epoca:
+                self.busquedas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[1]
+            self.fallos += 1
+        valor = busqueda_permitida(usuario, directorio)
+        self._agregar(self.busquedas, clave, (epoca, valor))
+        return valor
+
+    def _agregar(self, entradas, clave, entrada) -> None:
+        with self._candado:
+            entradas[clave] = entrada
+            entradas.move_to_end(clave)
+            if len(entradas) > self.maximo:
+                entradas.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._candado:
+            self.decisiones.clear()
+            self.busquedas.clear()
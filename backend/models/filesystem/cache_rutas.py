@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+MAX_ENTRADAS = 4096     # rutas recordadas; se descarta la usada hace más tiempo
+
+
+class CacheRutas:
+    """
+    Cache de resolución de rutas (como el dcache de Linux): ruta absoluta
+    normalizada -> Directorio, con LRU acotado. También guarda entradas negativas
+    (la ruta no existe) junto con el directorio más profundo que sí existía y su
+    generación: crear o quitar un subdirectorio ahí cambia la generación y la
+    entrada deja de valer, sin recorrer el cache.
+    Una entrada positiva vale mientras el directorio siga en el árbol.
+    """
+
+    def __init__(self, maximo=MAX_ENTRADAS):
+        self.maximo = maximo
+        self.entradas: "OrderedDict[str, Tuple]" = OrderedDict()   # ruta -> (nodo, None) | (None, (ancestro, gen))
+        self.aciertos = 0
+        self.fallos = 0
+        # las rutas de /fs corren en varios hilos: leer también reordena el LRU
+        self._candado = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def buscar(self, ruta: str) -> Tuple[bool, Optional[object]]:
+        """(True, directorio o None) si la ruta está en el cache y sigue vigente; (False, None) si no."""
+        with self._candado:
+            entrada = self.entradas.get(ruta)
+            if entrada is not None:
+                nodo, negativa = entrada
+                if nodo is not None:
+                    vigente = nodo.en_arbol
+                else:
+                    ancestro, generacion = negativa
+                    vigente = ancestro.generacion == generacion
+                if vigente:
+                    self.entradas.move_to_end(ruta)
+                    self.aciertos += 1
+                    return True, nodo
+                del self.entradas[ruta]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, ruta: str, nodo) -> None:
+        self._agregar(ruta, (nodo, None))
+
+    def guardar_ausente(self, ruta: str, ancestro) -> None:
+        """La ruta no existe; `ancestro` es el último directorio existente del recorrido."""
+        self._agregar(ruta, (None, (ancestro, ancestro.generacion)))
+
+    def _agregar(self, ruta, entrada) -> None:
+        with self._candado:
+            self.entradas[ruta] = entrada
+            self.entradas.move_to_end(ruta)
+            if len(self.entradas) > self.maximo:
+                self.entradas.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._candado:
+            self.entradas.clear()
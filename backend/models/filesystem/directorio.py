@@ -1,19 +1,31 @@
 from typing import Dict, Optional, Any
 from .archivo import Archivo
+from .permisos import NodoConPermisos
 
-class Directorio:
+class Directorio(NodoConPermisos):
     def __init__(self, nombre: str, propietario: Any, permisos: str = "755", parent: Optional["Directorio"] = None):
         self.nombre = nombre
-        self.propietario = propietario
-        self.permisos = permisos  # numeric, e.g. "755"
+        self._iniciar_permisos(propietario, permisos)  # numeric, e.g. "755" (se guarda como modo 0o755)
         self.subdirectorios: Dict[str, "Directorio"] = {}
         self.archivos: Dict[str, Archivo] = {}
         self.parent = parent  # referencia al directorio padre (None si es root)
+        # ruta absoluta, armada una sola vez: un directorio nunca cambia de nombre ni de padre
+        if parent is None:
+            self.ruta = "/"
+        elif parent.parent is None:
+            self.ruta = "/" + nombre
+        else:
+            self.ruta = parent.ruta + "/" + nombre
+        # False si se quitó del árbol (o se creó dentro de uno quitado)
+        self.en_arbol = parent is None or parent.en_arbol
+        # cambia cada vez que se agrega o quita un subdirectorio (invalida el cache de rutas)
+        self.generacion = 0
 
     def agregar_directorio(self, nombre: str, propietario: Any, permisos: str = "755") -> "Directorio":
         if nombre not in self.subdirectorios:
             d = Directorio(nombre, propietario, permisos=permisos, parent=self)
             self.subdirectorios[nombre] = d
+            self.generacion += 1
         return self.subdirectorios[nombre]
 
     def agregar_archivo(self, archivo: Archivo):
@@ -25,4 +37,7 @@ class Directorio:
 
     def quitar_directorio(self, nombre: str):
         if nombre in self.subdirectorios:
-            del self.subdirectorios[nombre]
+            quitado = self.subdirectorios.pop(nombre)
+            quitado.en_arbol = False
+            # las rutas que no existían debajo del quitado dejan de estar en el cache
+            quitado.generacion += 1
@@ -0,0 +1,80 @@
+from typing import Any
+
+# bits de cada permiso dentro de un dígito (rwx)
+LECTURA, ESCRITURA, EJECUCION = 4, 2, 1
+BITS = {"r": LECTURA, "w": ESCRITURA, "x": EJECUCION}
+
+
+def modo_desde_texto(permisos: Any) -> int:
+    """'755' -> 0o755. Se toman los últimos tres dígitos, que deben ser octales."""
+    texto = str(permisos).strip().zfill(3)[-3:]
+    if any(d not in "01234567" for d in texto):
+        raise ValueError(f"permisos inválidos: {permisos}")
+    return int(texto, 8)
+
+
+class NodoConPermisos:
+    """
+    Propietario y permisos de un archivo o directorio, guardados ya convertidos:
+    `modo` (bits, p. ej. 0o755), `uid` y `gid` del propietario. Chequear un acceso
+    son solo operaciones de bits, sin volver a interpretar el texto "755".
+    `permisos` y `propietario` se siguen leyendo y asignando como antes.
+    """
+
+    # cambia con cada chmod/chown del nodo (invalida sus decisiones en el cache)
+    generacion_permisos = 0
+    # cambia con cada chmod/chown de cualquier nodo (invalida las búsquedas cacheadas)
+    epoca = 0
+
+    def _iniciar_permisos(self, propietario, permisos) -> None:
+        """Propietario y modo de un nodo nuevo: no es un chmod/chown, no toca la época."""
+        self._propietario = propietario
+        self.uid = propietario.uid
+        self.gid = propietario.gid
+        self.modo = modo_desde_texto(permisos)
+
+    @property
+    def propietario(self):
+        return self._propietario
+
+    @propietario.setter
+    def propietario(self, usuario) -> None:
+        self._propietario = usuario
+        self.uid = usuario.uid
+        self.gid = usuario.gid
+        self._cambio()
+
+    @property
+    def permisos(self) -> str:
+        return format(self.modo, "03o")
+
+    @permisos.setter
+    def permisos(self, permisos) -> None:
+        self.modo = modo_desde_texto(permisos)
+        self._cambio()
+
+    def _cambio(self) -> None:
+        self.generacion_permisos += 1
+        NodoConPermisos.epoca += 1
+
+
+def derechos(usuario, nodo) -> int:
+    """Dígito rwx que le corresponde al usuario sobre el nodo (7 para root)."""
+    if usuario.uid == 0:
+        return 7
+    if usuario.uid == nodo.uid:
+        return nodo.modo >> 6
+    if usuario.gid == nodo.gid:
+        return (nodo.modo >> 3) & 7
+    return nodo.modo & 7
+
+
+def busqueda_permitida(usuario, directorio) -> bool:
+    """Permiso x en el directorio y en cada uno de sus ancestros."""
+    if usuario.uid == 0:
+        return True
+    while directorio is not None:
+        if not derechos(usuario, directorio) & EJECUCION:
+            return False
+        directorio = directorio.parent
+    return True
@@ -2,6 +2,12 @@ from typing import Optional, Tuple, List, Dict, Any
 from .usuario import Usuario
 from .directorio import Directorio
 from .archivo import Archivo
+from .cache_rutas import CacheRutas
+from .cache_permisos import CachePermisos
+from .permisos import BITS, EJECUCION, LECTURA, ESCRITURA, busqueda_permitida, derechos, modo_desde_texto
+
+# Contadores de actividad (los expone /metrics)
+CONTADORES = {"resoluciones_ruta": 0, "componentes_recorridos": 0, "chequeos_permisos": 0}
 
 # ---------- helpers permisos ----------
 _NUM_TO_RWX = {
@@ -13,41 +19,17 @@ def numeric_to_rwx(numeric: str) -> str:
     n = str(numeric).zfill(3)[-3:]
     return ''.join(_NUM_TO_RWX[d] for d in n)
 
-def can_access(user: Usuario, owner: Usuario, owner_group: str, perm_numeric: str, mode: str) -> bool:
-    """
-    mode: 'r'|'w'|'x'
-    reglas:
-      - root (uid==0) -> siempre true
-      - si user==owner -> primer dígito
-      - elif user.grupo == owner_group -> segundo dígito
-      - else -> tercero
-    """
-    if user.uid == 0:
-        return True
-
-    perm_numeric = str(perm_numeric).zfill(3)[-3:]
-    owner_dig = int(perm_numeric[0])
-    group_dig = int(perm_numeric[1])
-    other_dig = int(perm_numeric[2])
-
-    if user.nombre == owner.nombre:
-        digit = owner_dig
-    elif user.grupo == owner_group:
-        digit = group_dig
-    else:
-        digit = other_dig
-
-    if mode == 'r':
-        return bool(digit & 4)
-    if mode == 'w':
-        return bool(digit & 2)
-    if mode == 'x':
-        return bool(digit & 1)
-    return False
+def _es_normal(ruta: str) -> bool:
+    """Ruta absoluta ya normalizada ('/a/b'): sin '.', '..', barras dobles ni barra final."""
+    return (
+        ruta.startswith("/") and not ruta.endswith("/") and "//" not in ruta
+        and "/./" not in ruta and "/../" not in ruta
+        and not ruta.endswith("/.") and not ruta.endswith("/..") and ruta == ruta.strip()
+    )
 
 # ---------- Sistema de archivos ----------
 class SistemaArchivos:
-    def __init__(self):
+    def __init__(self, verificar_busqueda: bool = False, cache_permisos: bool = False):
         # usuarios de ejemplo
         self.usuarios: Dict[str, Usuario] = {
             "root": Usuario("root", 0, "root"),
@@ -69,6 +51,29 @@ class SistemaArchivos:
         self.usuario_actual: Usuario = self.usuarios["root"]
         self.cwd: Directorio = self.root
         self.cwd_path: str = "/"
+        # ruta absoluta normalizada -> Directorio (o ausente)
+        self.cache_rutas = CacheRutas()
+        # exigir x en cada ancestro al resolver una ruta (como la búsqueda en Unix)
+        self.verificar_busqueda = verificar_busqueda
+        # decisiones de acceso por (uid, nodo); opcional
+        self.cache_permisos: Optional[CachePermisos] = CachePermisos() if cache_permisos else None
+
+    # -------------- PERMISOS --------------
+    def _puede(self, nodo, bit: int) -> bool:
+        """Permiso del usuario actual sobre el nodo: solo bits (LECTURA, ESCRITURA, EJECUCION)."""
+        CONTADORES["chequeos_permisos"] += 1
+        if self.cache_permisos is not None:
+            return bool(self.cache_permisos.derechos(self.usuario_actual, nodo) & bit)
+        return bool(derechos(self.usuario_actual, nodo) & bit)
+
+    def _busqueda_permitida(self, directorio: Optional[Directorio]) -> bool:
+        """x en el directorio y en todos sus ancestros (siempre True sin verificar_busqueda)."""
+        if directorio is None or not self.verificar_busqueda:
+            return True
+        CONTADORES["chequeos_permisos"] += 1
+        if self.cache_permisos is not None:
+            return self.cache_permisos.busqueda(self.usuario_actual, directorio)
+        return busqueda_permitida(self.usuario_actual, directorio)
 
     # -------------- RUTAS & RESOLUCIÓN --------------
     def _ruta_a_partes(self, ruta: str) -> List[str]:
@@ -85,16 +90,74 @@ class SistemaArchivos:
     def _obtener_dir_por_ruta(self, ruta: str) -> Optional[Directorio]:
         """
         Soporta rutas absolutas y relativas, y los componentes '.' y '..'
+        Con verificar_busqueda, None también si falta x en algún ancestro.
         """
+        dir_obj = self._ubicar_dir(ruta)
+        if dir_obj is not None and not self._busqueda_permitida(dir_obj.parent):
+            return None
+        return dir_obj
+
+    def _ubicar_dir(self, ruta: str) -> Optional[Directorio]:
         if ruta is None or ruta.strip() == "" or ruta == ".":
+            CONTADORES["resoluciones_ruta"] += 1
             return self.cwd
         if ruta == "/":
+            CONTADORES["resoluciones_ruta"] += 1
             return self.root
+        if _es_normal(ruta):
+            CONTADORES["resoluciones_ruta"] += 1
+            return self._buscar(ruta)
+        return self._resolver(self._ruta_a_partes(ruta), ruta.startswith("/"))
 
-        partes = self._ruta_a_partes(ruta)
-        # seleccionar punto de inicio
-        actual = self.root if ruta.startswith("/") else self.cwd
+    def _resolver(self, partes: List[str], absoluta: bool) -> Optional[Directorio]:
+        """
+        Directorio de una ruta ya partida. Si la ruta tiene forma normal (sin '..') se
+        busca primero en el cache por su ruta absoluta; si no, se recorre el árbol.
+        """
+        CONTADORES["resoluciones_ruta"] += 1
+        clave = self._clave_cache(partes, absoluta)
+        if clave is None:
+            return self._recorrer(self.root if absoluta else self.cwd, partes)
+        return self._buscar(clave)
+
+    def _buscar(self, clave: str) -> Optional[Directorio]:
+        """Directorio de una ruta absoluta normalizada: O(1) si está en el cache."""
+        encontrado, nodo = self.cache_rutas.buscar(clave)
+        if encontrado:
+            return nodo
+        # las rutas del cache empiezan en la raíz: se recorre desde ahí
+        actual = self.root
+        componentes = clave.split("/")[1:]
+        CONTADORES["componentes_recorridos"] += len(componentes)
+        for p in componentes:
+            siguiente = actual.subdirectorios.get(p)
+            if siguiente is None:
+                self.cache_rutas.guardar_ausente(clave, actual)
+                return None
+            actual = siguiente
+        self.cache_rutas.guardar(clave, actual)
+        return actual
+
+    def _clave_cache(self, partes: List[str], absoluta: bool) -> Optional[str]:
+        """Ruta absoluta normalizada para el cache, o None si la ruta no se puede cachear."""
+        if ".." in partes:
+            # 'a/x/..' exige que exista x: no equivale a 'a'
+            return None
+        if absoluta:
+            base = ""
+        elif self.cwd is self.root:
+            base = ""
+        elif not self.cwd.en_arbol:
+            return None   # se borró el cwd: las rutas relativas se resuelven desde el nodo, como siempre
+        else:
+            base = self.cwd.ruta
+        partes = [p for p in partes if p != "."]
+        if not partes:
+            return None
+        return base + "/" + "/".join(partes)
 
+    def _recorrer(self, actual: Directorio, partes: List[str]) -> Optional[Directorio]:
+        CONTADORES["componentes_recorridos"] += len(partes)
         for p in partes:
             if p == ".":
                 continue
@@ -109,23 +172,34 @@ class SistemaArchivos:
     def _resolve_parent_and_name(self, ruta: str) -> Tuple[Optional[Directorio], Optional[str]]:
         """
         devuelve (directorio_padre, nombre)
+        Con verificar_busqueda, el padre es None si falta x en él o en algún ancestro.
         """
+        parent, nombre = self._ubicar_padre(ruta)
+        if parent is not None and not self._busqueda_permitida(parent):
+            return (None, nombre)
+        return (parent, nombre)
+
+    def _ubicar_padre(self, ruta: str) -> Tuple[Optional[Directorio], Optional[str]]:
         if ruta is None or ruta.strip() == "":
             return (self.cwd, None)
+        if _es_normal(ruta):
+            # '/a/b/c': el padre es el prefijo tal cual, sin partir ni volver a unir
+            corte = ruta.rfind("/")
+            if corte == 0:
+                return (self.root, ruta[1:])
+            CONTADORES["resoluciones_ruta"] += 1
+            return (self._buscar(ruta[:corte]), ruta[corte + 1:])
         partes = self._ruta_a_partes(ruta)
         if ruta.startswith("/"):
             if len(partes) == 0:
                 return (self.root, None)
             if len(partes) == 1:
                 return (self.root, partes[0])
-            parent_path = "/" + "/".join(partes[:-1])
-            parent = self._obtener_dir_por_ruta(parent_path)
-            return (parent, partes[-1])
+            return (self._resolver(partes[:-1], True), partes[-1])
         else:
             if len(partes) == 1:
                 return (self.cwd, partes[0])
-            parent = self._obtener_dir_por_ruta("/".join(partes[:-1]))
-            return (parent, partes[-1])
+            return (self._resolver(partes[:-1], False), partes[-1])
 
     # ---------------- USUARIO ----------------
     def su(self, username: str) -> dict:
@@ -137,22 +211,15 @@ class SistemaArchivos:
 
     # ---------------- NAVEGACIÓN / INFO ----------------
     def pwd(self) -> str:
-        # reconstruye path desde cwd
-        node = self.cwd
-        if node.parent is None:
-            return "/"
-        partes = []
-        while node.parent is not None:
-            partes.append(node.nombre)
-            node = node.parent
-        return "/" + "/".join(reversed(partes))
+        # cada directorio guarda su ruta absoluta: O(1)
+        return self.cwd.ruta
 
     def ls(self, ruta: str = ".") -> dict:
         dir_obj = self._obtener_dir_por_ruta(ruta)
         if dir_obj is None:
             return {"error": "Directorio no encontrado"}
         # verificar permiso de lectura de ese directorio
-        if not can_access(self.usuario_actual, dir_obj.propietario, dir_obj.propietario.grupo, dir_obj.permisos, 'r'):
+        if not self._puede(dir_obj, LECTURA):
             return {"error": "permiso denegado para listar este directorio"}
         directorios = []
         archivos = []
@@ -172,6 +239,10 @@ class SistemaArchivos:
         return {"path": self.pwd() if ruta == "." else ruta, "directorios": directorios, "archivos": archivos}
 
     def mkdir(self, ruta: str, permisos: str = "755") -> dict:
+        try:
+            modo_desde_texto(permisos)
+        except ValueError as e:
+            return {"error": str(e)}
         parent, nombre = self._resolve_parent_and_name(ruta)
         if parent is None or nombre is None:
             return {"error": "ruta inválida"}
@@ -181,7 +252,7 @@ class SistemaArchivos:
             return {"error": f"El directorio '{nombre}' ya existe"}
         
         # escribir en parent: permiso w
-        if not can_access(self.usuario_actual, parent.propietario, parent.propietario.grupo, parent.permisos, 'w'):
+        if not self._puede(parent, ESCRITURA):
             return {"error": f"permiso denegado para crear en {self.pwd()}. Usuario: {self.usuario_actual.nombre}, Propietario: {parent.propietario.nombre}, Permisos: {parent.permisos}"}
         
         parent.agregar_directorio(nombre, self.usuario_actual, permisos=permisos)
@@ -192,7 +263,7 @@ class SistemaArchivos:
         if dir_obj is None:
             return {"error": "ruta inválida"}
         # permiso de ejecución (x) para entrar
-        if not can_access(self.usuario_actual, dir_obj.propietario, dir_obj.propietario.grupo, dir_obj.permisos, 'x'):
+        if not self._puede(dir_obj, EJECUCION):
             return {"error": "permiso denegado para entrar a ese directorio"}
         self.cwd = dir_obj
         self.cwd_path = self.pwd()
@@ -200,6 +271,10 @@ class SistemaArchivos:
 
     # ---------------- ARCHIVOS ----------------
     def crear_archivo(self, ruta: str, contenido: str = "", permisos: str = "644") -> dict:
+        try:
+            modo_desde_texto(permisos)
+        except ValueError as e:
+            return {"error": str(e)}
         parent, nombre = self._resolve_parent_and_name(ruta)
         if parent is None or nombre is None:
             return {"error": "ruta inválida"}
@@ -209,7 +284,7 @@ class SistemaArchivos:
             return {"error": f"El archivo '{nombre}' ya existe"}
         
         # permiso de escritura en parent
-        if not can_access(self.usuario_actual, parent.propietario, parent.propietario.grupo, parent.permisos, 'w'):
+        if not self._puede(parent, ESCRITURA):
             return {"error": f"permiso denegado para crear archivo en {self.pwd()}"}
         
         archivo = Archivo(nombre, self.usuario_actual, permisos=permisos)
@@ -218,27 +293,71 @@ class SistemaArchivos:
         parent.agregar_archivo(archivo)
         return {"ok": f"Archivo '{nombre}' creado", "permisos": permisos}
 
-    def read(self, ruta: str) -> dict:
+    def abrir(self, ruta: str, modo: str = "r") -> Tuple[Optional[Archivo], Optional[dict]]:
+        """(archivo, None) si existe y el usuario tiene el permiso ('r' o 'w'); si no, (None, error)."""
+        bit = BITS[modo]
         parent, nombre = self._resolve_parent_and_name(ruta)
         if parent is None or nombre is None or nombre not in parent.archivos:
-            return {"error": "archivo no encontrado"}
+            return None, {"error": "archivo no encontrado"}
         archivo = parent.archivos[nombre]
-        # permiso lectura
-        if not can_access(self.usuario_actual, archivo.propietario, archivo.propietario.grupo, archivo.permisos, 'r'):
-            return {"error": "permiso denegado para leer"}
+        if not self._puede(archivo, bit):
+            accion = "leer" if bit == LECTURA else "escribir"
+            return None, {"error": f"permiso denegado para {accion}"}
+        return archivo, None
+
+    def read(self, ruta: str) -> dict:
+        archivo, error = self.abrir(ruta, "r")
+        if error:
+            return error
         return {"contenido": archivo.leer()}
 
     def write(self, ruta: str, texto: str) -> dict:
-        parent, nombre = self._resolve_parent_and_name(ruta)
-        if parent is None or nombre is None or nombre not in parent.archivos:
-            return {"error": "archivo no encontrado"}
-        archivo = parent.archivos[nombre]
-        # permiso escritura
-        if not can_access(self.usuario_actual, archivo.propietario, archivo.propietario.grupo, archivo.permisos, 'w'):
-            return {"error": "permiso denegado para escribir"}
+        archivo, error = self.abrir(ruta, "w")
+        if error:
+            return error
         archivo.escribir(texto)
         return {"ok": "archivo modificado"}
 
+    # E/S por desplazamiento, en bytes: solo se tocan los bloques del rango
+    def pread(self, ruta: str, desplazamiento: int, cantidad: Optional[int] = None) -> dict:
+        archivo, error = self.abrir(ruta, "r")
+        if error:
+            return error
+        try:
+            return {"datos": archivo.leer_en(desplazamiento, cantidad), "tamanio": archivo.tamanio}
+        except ValueError as e:
+            return {"error": str(e)}
+
+    def pwrite(self, ruta: str, desplazamiento: int, datos: bytes) -> dict:
+        archivo, error = self.abrir(ruta, "w")
+        if error:
+            return error
+        try:
+            escritos = archivo.escribir_en(desplazamiento, datos)
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"ok": "archivo modificado", "escritos": escritos, "tamanio": archivo.tamanio}
+
+    def append(self, ruta: str, datos: bytes) -> dict:
+        archivo, error = self.abrir(ruta, "w")
+        if error:
+            return error
+        try:
+            escritos = archivo.agregar(datos)
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"ok": "archivo modificado", "escritos": escritos, "tamanio": archivo.tamanio}
+
+    def truncate(self, ruta: str, tamanio: int) -> dict:
+        archivo, error = self.abrir(ruta, "w")
+        if error:
+            return error
+        try:
+            archivo.truncar(tamanio)
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"ok": "archivo modificado", "tamanio": archivo.tamanio}
+
     def rm(self, ruta: str) -> dict:
         parent, nombre = self._resolve_parent_and_name(ruta)
         if parent is None or nombre is None:
@@ -247,7 +366,7 @@ class SistemaArchivos:
         if nombre in parent.archivos:
             archivo = parent.archivos[nombre]
             # permiso escritura en parent o ser propietario/root
-            if not can_access(self.usuario_actual, parent.propietario, parent.propietario.grupo, parent.permisos, 'w'):
+            if not self._puede(parent, ESCRITURA):
                 return {"error": "permiso denegado para eliminar"}
             parent.quitar_archivo(nombre)
             return {"ok": f"Archivo '{nombre}' eliminado"}
@@ -257,13 +376,17 @@ class SistemaArchivos:
             # debe estar vacío
             if d.subdirectorios or d.archivos:
                 return {"error": "directorio no vacío"}
-            if not can_access(self.usuario_actual, parent.propietario, parent.propietario.grupo, parent.permisos, 'w'):
+            if not self._puede(parent, ESCRITURA):
                 return {"error": "permiso denegado para eliminar directorio"}
             parent.quitar_directorio(nombre)
             return {"ok": f"Directorio '{nombre}' eliminado"}
         return {"error": "no existe"}
 
     def chmod(self, ruta: str, permisos: str) -> dict:
+        try:
+            modo_desde_texto(permisos)
+        except ValueError as e:
+            return {"error": str(e)}
         parent, nombre = self._resolve_parent_and_name(ruta)
         # si nombre es None significa que ruta apunta a un directorio directo (o '/')
         if parent is None:
@@ -271,21 +394,21 @@ class SistemaArchivos:
         if nombre is None:
             # cambiar permisos del parent
             dir_obj = parent
-            if self.usuario_actual.nombre != dir_obj.propietario.nombre and self.usuario_actual.uid != 0:
+            if self.usuario_actual.uid != dir_obj.uid and self.usuario_actual.uid != 0:
                 return {"error": "permiso denegado para chmod en directorio"}
             dir_obj.permisos = permisos
             return {"ok": f"permisos de directorio cambiados a {permisos}"}
         # archivo
         if nombre in parent.archivos:
             archivo = parent.archivos[nombre]
-            if self.usuario_actual.nombre != archivo.propietario.nombre and self.usuario_actual.uid != 0:
+            if self.usuario_actual.uid != archivo.uid and self.usuario_actual.uid != 0:
                 return {"error": "solo propietario o root puede cambiar permisos"}
             archivo.permisos = permisos
             return {"ok": f"permisos de '{nombre}' cambiados a {permisos}"}
         # subdir
         if nombre in parent.subdirectorios:
             dir_obj = parent.subdirectorios[nombre]
-            if self.usuario_actual.nombre != dir_obj.propietario.nombre and self.usuario_actual.uid != 0:
+            if self.usuario_actual.uid != dir_obj.uid and self.usuario_actual.uid != 0:
                 return {"error": "solo propietario o root puede cambiar permisos en subdirectorio"}
             dir_obj.permisos = permisos
             return {"ok": f"permisos del directorio '{nombre}' a {permisos}"}
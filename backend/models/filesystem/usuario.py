@@ -1,10 +1,20 @@
-from typing import Optional
+from typing import Dict, Optional
+
+# nombre de grupo -> gid numérico, asignado la primera vez que aparece
+_GIDS: Dict[str, int] = {"root": 0}
+
+def gid_de_grupo(grupo: str) -> int:
+    gid = _GIDS.get(grupo)
+    if gid is None:
+        gid = _GIDS[grupo] = 1000 + len(_GIDS)
+    return gid
 
 class Usuario:
     def __init__(self, nombre: str, uid: int, grupo: str, password: Optional[str] = None):
         self.nombre = nombre
         self.uid = uid
         self.grupo = grupo
+        self.gid = gid_de_grupo(grupo)
         self.password = password  # opcional: no usado en esta simulación simple
 
     def __repr__(self):
@@ -1,12 +1,85 @@
 # models/pcb.py
 from typing import Any, Dict, List, Optional
+from models.tabla_procesos import NULO, TABLA_PROCESOS, TablaProcesos
+
+
+def _campo_entero(nombre):
+    datos = TABLA_PROCESOS.columnas[nombre]
+
+    def leer(self):
+        return datos[self.fila]
+
+    def escribir(self, valor):
+        datos[self.fila] = valor
+
+    return property(leer, escribir)
+
+
+def _campo_opcional(nombre):
+    """Campo entero que puede ser None (guardado como NULO en la columna)."""
+    datos = TABLA_PROCESOS.columnas[nombre]
+
+    def leer(self):
+        valor = datos[self.fila]
+        return None if valor == NULO else valor
+
+    def escribir(self, valor):
+        datos[self.fila] = NULO if valor is None else valor
+
+    return property(leer, escribir)
+
+
+def _campo_texto(nombre):
+    datos = TABLA_PROCESOS.columnas[nombre]
+    textos = TABLA_PROCESOS.textos
+    indice_texto = TABLA_PROCESOS.indice_texto
+
+    def leer(self):
+        return textos[datos[self.fila]]
+
+    def escribir(self, valor):
+        datos[self.fila] = indice_texto(valor)
+
+    return property(leer, escribir)
+
+
+def _campo_extra(nombre, vacio):
+    """Contenedor que solo ocupa memoria en los procesos que lo usan."""
+    valores = TABLA_PROCESOS.extras[nombre]
+
+    def leer(self):
+        valor = valores.get(self.fila)
+        if valor is None:
+            # se guarda al pedirlo, así las modificaciones del llamador persisten
+            valor = valores[self.fila] = vacio()
+        return valor
+
+    def escribir(self, valor):
+        if valor:
+            valores[self.fila] = valor
+        else:
+            valores.pop(self.fila, None)
+
+    return property(leer, escribir)
+
 
 class PCB:
     """
     Bloque de control de proceso (PCB) con campos completos.
     Todos los campos tienen valores por defecto para facilitar la creación.
+    Los datos viven en la tabla de procesos (una fila por PCB); el objeto es
+    solo una vista sobre su fila, que se libera cuando el PCB deja de usarse.
     """
 
+    __slots__ = ("fila",)
+
+    CAMPOS = (
+        "pid", "estado", "contador", "tiempo_llegada", "rafaga_cpu", "prioridad",
+        "registros", "memoria", "archivos_abiertos", "usuario",
+        "tiempo_restante", "rafaga_original", "tiempo_inicio", "tiempo_finalizacion",
+        "tiempo_espera", "tiempo_retorno", "rafagas", "rafaga_actual",
+    )
+
     def __init__(
         self,
         pid: int,
@@ -20,59 +93,128 @@ class PCB:
         archivos_abiertos: Optional[List[str]] = None,
         usuario: str = "desconocido"
     ):
-        if registros is None:
-            registros = {}
-        if memoria is None:
-            memoria = {}
-        if archivos_abiertos is None:
-            archivos_abiertos = []
-
-        # Campos básicos
-        self.pid: int = pid
-        self.estado: str = estado
-        self.contador: int = contador
-        self.tiempo_llegada: int = tiempo_llegada
-        self.rafaga_cpu: int = rafaga_cpu
-        self.prioridad: int = prioridad
-        self.registros: Dict[str, Any] = registros
-        self.memoria: Dict[str, Any] = memoria
-        self.archivos_abiertos: List[str] = archivos_abiertos
-        self.usuario: str = usuario
-
-        # Campos para métricas / simulación
-        self.tiempo_restante: int = rafaga_cpu           # útil para Round Robin
-        self.rafaga_original: int = rafaga_cpu            # para métricas y visualización
-        self.tiempo_inicio: Optional[int] = None          # primer instante en CPU
-        self.tiempo_finalizacion: Optional[int] = None   # cuando termina
-        self.tiempo_espera: int = 0                       # acumulado en ready
-        self.tiempo_retorno: Optional[int] = None         # turnaround = finalizacion - llegada
+        indice_texto = TABLA_PROCESOS.indice_texto
+        self.fila: int = TABLA_PROCESOS.reservar({
+            # Campos básicos
+            "pid": pid,
+            "estado": indice_texto(estado),
+            "contador": contador,
+            "tiempo_llegada": tiempo_llegada,
+            "rafaga_cpu": rafaga_cpu,
+            "prioridad": prioridad,
+            "usuario": indice_texto(usuario),
+            # Campos para métricas / simulación
+            "tiempo_restante": rafaga_cpu,       # útil para Round Robin
+            "rafaga_original": rafaga_cpu,       # para métricas y visualización
+            "tiempo_inicio": NULO,               # primer instante en CPU
+            "tiempo_finalizacion": NULO,         # cuando termina
+            "tiempo_espera": 0,                  # acumulado en ready
+            "tiempo_retorno": NULO,              # turnaround = finalizacion - llegada
+            "rafaga_actual": 0,                  # índice en `rafagas` de la ráfaga de CPU en curso
+        })
+        self.registros = registros
+        self.memoria = memoria
+        self.archivos_abiertos = archivos_abiertos
+
+    def __del__(self, _liberar=TABLA_PROCESOS.liberar):
+        fila = getattr(self, "fila", None)
+        if fila is not None:
+            _liberar(fila)
+
+    pid = _campo_entero("pid")
+    estado = _campo_texto("estado")
+    contador = _campo_entero("contador")
+    tiempo_llegada = _campo_entero("tiempo_llegada")
+    rafaga_cpu = _campo_entero("rafaga_cpu")
+    prioridad = _campo_entero("prioridad")
+    registros = _campo_extra("registros", dict)
+    memoria = _campo_extra("memoria", dict)
+    archivos_abiertos = _campo_extra("archivos_abiertos", list)
+    usuario = _campo_texto("usuario")
+    tiempo_restante = _campo_entero("tiempo_restante")
+    rafaga_original = _campo_entero("rafaga_original")
+    tiempo_inicio = _campo_opcional("tiempo_inicio")
+    tiempo_finalizacion = _campo_opcional("tiempo_finalizacion")
+    tiempo_espera = _campo_entero("tiempo_espera")
+    tiempo_retorno = _campo_opcional("tiempo_retorno")
+    # Ráfagas alternadas [CPU, E/S, CPU, ..., CPU]; vacío = una sola ráfaga de CPU
+    rafagas = _campo_extra("rafagas", list)
+    rafaga_actual = _campo_entero("rafaga_actual")
+
+    def siguiente_io(self):
+        """(duración de la E/S, siguiente ráfaga de CPU) tras la ráfaga actual, o None si es la última."""
+        rafagas = _RAFAGAS.get(self.fila)
+        if rafagas is None:
+            return None
+        i = _ACTUAL[self.fila]
+        if i + 2 >= len(rafagas):
+            return None
+        return rafagas[i + 1], rafagas[i + 2]
+
+    def lista_rafagas(self) -> List[int]:
+        """Copia de las ráfagas (vacía si no tiene E/S) sin reservar lugar en la tabla."""
+        return list(_RAFAGAS.get(self.fila) or ())
+
+    def tiempo_io(self) -> int:
+        """E/S total del proceso (0 si no tiene ráfagas de E/S)."""
+        rafagas = _RAFAGAS.get(self.fila)
+        return sum(rafagas[1::2]) if rafagas else 0
 
     def to_dict(self) -> Dict[str, Any]:
         """Representación JSON-friendly del PCB."""
+        f = self.fila
+        inicio = _INICIO[f]
+        finalizacion = _FINALIZACION[f]
+        retorno = _RETORNO[f]
         return {
-            "pid": self.pid,
-            "estado": self.estado,
-            "contador": self.contador,
-            "tiempo_llegada": self.tiempo_llegada,
-            "rafaga_cpu": self.rafaga_cpu,
-            "rafaga_original": self.rafaga_original,
-            "tiempo_restante": self.tiempo_restante,
-            "prioridad": self.prioridad,
-            "registros": self.registros,
-            "memoria": self.memoria,
-            "archivos_abiertos": self.archivos_abiertos,
-            "usuario": self.usuario,
-            "tiempo_inicio": self.tiempo_inicio,
-            "tiempo_finalizacion": self.tiempo_finalizacion,
-            "tiempo_espera": self.tiempo_espera,
-            "tiempo_retorno": self.tiempo_retorno,
+            "pid": _PID[f],
+            "estado": _TEXTOS[_ESTADO[f]],
+            "contador": _CONTADOR[f],
+            "tiempo_llegada": _LLEGADA[f],
+            "rafaga_cpu": _RAFAGA[f],
+            "rafaga_original": _ORIGINAL[f],
+            "tiempo_restante": _RESTANTE[f],
+            "prioridad": _PRIORIDAD[f],
+            "registros": _REGISTROS.get(f) or {},
+            "memoria": _MEMORIA.get(f) or {},
+            "archivos_abiertos": _ARCHIVOS.get(f) or [],
+            "usuario": _TEXTOS[_USUARIO[f]],
+            "tiempo_inicio": None if inicio == NULO else inicio,
+            "tiempo_finalizacion": None if finalizacion == NULO else finalizacion,
+            "tiempo_espera": _ESPERA[f],
+            "tiempo_retorno": None if retorno == NULO else retorno,
+            "rafagas": list(_RAFAGAS.get(f) or ()),
+            "rafaga_actual": _ACTUAL[f],
         }
 
+    def __reduce__(self):
+        # copiar o serializar crea un PCB con su propia fila (nunca comparten fila)
+        return _pcb_desde_dict, (self.to_dict(),)
+
     def update_from_dict(self, data: Dict[str, Any]) -> None:
         """Actualizar campos del PCB a partir de un dict (útil al recibir JSON)."""
         for k, v in data.items():
-            if hasattr(self, k):
+            if k in self.CAMPOS:
                 setattr(self, k, v)
 
     def __repr__(self) -> str:
         return f"PCB(pid={self.pid}, estado={self.estado}, rafaga_cpu={self.rafaga_cpu})"
+
+
+
+def _pcb_desde_dict(datos: Dict[str, Any]) -> PCB:
+    pcb = PCB(datos["pid"])
+    pcb.update_from_dict(datos)
+    return pcb
+
+
+# Columnas resueltas una sola vez para to_dict
+_C = TABLA_PROCESOS.columnas
+_PID, _ESTADO, _CONTADOR, _PRIORIDAD, _USUARIO = _C["pid"], _C["estado"], _C["contador"], _C["prioridad"], _C["usuario"]
+_LLEGADA, _RAFAGA, _ORIGINAL, _RESTANTE = _C["tiempo_llegada"], _C["rafaga_cpu"], _C["rafaga_original"], _C["tiempo_restante"]
+_INICIO, _FINALIZACION, _ESPERA, _RETORNO = (
+    _C["tiempo_inicio"], _C["tiempo_finalizacion"], _C["tiempo_espera"], _C["tiempo_retorno"]
+)
+_ACTUAL = _C["rafaga_actual"]
+_REGISTROS, _MEMORIA, _ARCHIVOS, _RAFAGAS = (TABLA_PROCESOS.extras[n] for n in TablaProcesos.EXTRAS)
+_TEXTOS = TABLA_PROCESOS.textos
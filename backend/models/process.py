@@ -8,6 +8,10 @@ class Proceso:
     Constructor detallado pero con valores por defecto para facilitar uso desde API.
     """
 
+    # _anterior / _siguiente / _cola: enlaces de la cola (ColaIndexada) en la que está
+    # _secuencia: número de orden con que entró a esa cola (cursores de paginación)
+    __slots__ = ("pcb", "_anterior", "_siguiente", "_cola", "_secuencia")
+
     def __init__(
         self,
         pid: int,
@@ -18,8 +22,13 @@ class Proceso:
         estado: str = "Nuevo",
         registros: Optional[Dict[str, Any]] = None,
         memoria: Optional[Dict[str, Any]] = None,
-        archivos_abiertos: Optional[List[str]] = None
+        archivos_abiertos: Optional[List[str]] = None,
+        rafagas: Optional[List[int]] = None
     ):
+        # Con ráfagas [CPU, E/S, CPU, ...] la ráfaga de CPU total es la suma de las de CPU
+        if rafagas:
+            rafagas = validar_rafagas(rafagas)
+            rafaga_cpu = sum(rafagas[0::2])
         # Crear el PCB con los valores (PCB ya gestiona valores por defecto)
         self.pcb = PCB(
             pid=pid,
@@ -33,9 +42,25 @@ class Proceso:
             archivos_abiertos=archivos_abiertos,
             usuario=usuario
         )
+        if rafagas:
+            self.pcb.rafagas = rafagas
+            self.pcb.tiempo_restante = rafagas[0]
+        self._anterior = self._siguiente = self._cola = None
+        self._secuencia = 0
+
+    # Copiar o serializar un proceso no arrastra la cola en la que está
+    def __getstate__(self):
+        return self.pcb
+
+    def __setstate__(self, pcb) -> None:
+        self.pcb = pcb
+        self._anterior = self._siguiente = self._cola = None
+        self._secuencia = 0
 
-        # Alias / atajos (opcional)
-        self.tiempo_restante = self.pcb.tiempo_restante
+    # Alias / atajo (opcional)
+    @property
+    def tiempo_restante(self) -> int:
+        return self.pcb.tiempo_restante
 
     # Cambiar estado con validación
     def cambiar_estado(self, nuevo_estado: str) -> None:
@@ -69,7 +94,10 @@ class Proceso:
 
     def reset(self) -> None:
         """Reinicia los campos dinámicos (útil en pruebas)."""
+        self.pcb.rafaga_actual = 0
         self.pcb.tiempo_restante = self.pcb.rafaga_original
+        if self.pcb.siguiente_io() is not None:   # sin crear la lista en procesos sin E/S
+            self.pcb.tiempo_restante = self.pcb.rafagas[0]
         self.pcb.tiempo_inicio = None
         self.pcb.tiempo_finalizacion = None
         self.pcb.tiempo_espera = 0
@@ -83,3 +111,13 @@ class Proceso:
 
     def __repr__(self) -> str:
         return f"Proceso(pid={self.pcb.pid}, estado={self.pcb.estado})"
+
+
+def validar_rafagas(rafagas) -> List[int]:
+    """Ráfagas alternadas CPU / E/S que empiezan y terminan en CPU, todas enteras positivas."""
+    if not isinstance(rafagas, (list, tuple)) or len(rafagas) % 2 == 0:
+        raise ValueError("Las ráfagas deben alternar CPU y E/S, empezando y terminando en CPU")
+    for rafaga in rafagas:
+        if not isinstance(rafaga, int) or isinstance(rafaga, bool) or rafaga <= 0:
+            raise ValueError("Cada ráfaga debe ser un entero positivo")
+    return list(rafagas)
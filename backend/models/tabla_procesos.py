@@ -0,0 +1,91 @@
+# models/tabla_procesos.py
+import sys
+import threading
+from array import array
+from typing import Any, Dict
+
+NULO = -1   # valor guardado en la columna cuando un campo opcional es None
+
+
+class TablaProcesos:
+    """
+    Tabla de procesos en columnas (struct of arrays).
+    Cada campo escalar del PCB es un arreglo tipado y cada proceso ocupa una fila;
+    el PCB solo guarda el número de fila. Los textos (estado, usuario) se guardan
+    como índices a una lista de textos únicos, y registros / memoria / archivos
+    abiertos / ráfagas de E/S solo ocupan lugar en los procesos que los usan.
+    Las filas liberadas se reutilizan.
+    """
+
+    COLUMNAS_ENTERAS = (
+        "pid", "contador", "tiempo_llegada", "rafaga_cpu", "rafaga_original",
+        "tiempo_restante", "tiempo_inicio", "tiempo_finalizacion", "tiempo_espera",
+        "tiempo_retorno",
+    )
+    COLUMNAS_CHICAS = ("prioridad", "estado", "usuario", "rafaga_actual")
+    EXTRAS = ("registros", "memoria", "archivos_abiertos", "rafagas")
+
+    def __init__(self):
+        self.columnas: Dict[str, array] = {nombre: array("q") for nombre in self.COLUMNAS_ENTERAS}
+        self.columnas.update({nombre: array("i") for nombre in self.COLUMNAS_CHICAS})
+        self.extras: Dict[str, Dict[int, Any]] = {nombre: {} for nombre in self.EXTRAS}
+        self.textos = []
+        self._indice_texto: Dict[str, int] = {}
+        self.libres = []
+        self._candado = threading.Lock()
+
+    def __len__(self) -> int:
+        """Cantidad de filas en uso."""
+        return len(self.columnas["pid"]) - len(self.libres)
+
+    def indice_texto(self, texto: str) -> int:
+        indice = self._indice_texto.get(texto)
+        if indice is None:
+            with self._candado:
+                indice = self._indice_texto.get(texto)
+                if indice is None:
+                    indice = len(self.textos)
+                    self.textos.append(texto)
+                    self._indice_texto[texto] = indice
+        return indice
+
+    def reservar(self, valores: Dict[str, int]) -> int:
+        """Ocupa una fila (reutilizando una libre si hay) con los valores dados por columna."""
+        with self._candado:
+            if self.libres:
+                fila = self.libres.pop()
+                try:
+                    for nombre, columna in self.columnas.items():
+                        columna[fila] = valores[nombre]
+                except (TypeError, OverflowError):
+                    self.libres.append(fila)
+                    raise
+                return fila
+            fila = len(self.columnas["pid"])
+            agregadas = []
+            try:
+                for nombre, columna in self.columnas.items():
+                    columna.append(valores[nombre])
+                    agregadas.append(columna)
+            except (TypeError, OverflowError):
+                # un valor no entra en su columna: deshacer para no desalinear las filas
+                for columna in agregadas:
+                    columna.pop()
+                raise
+        return fila
+
+    def liberar(self, fila: int) -> None:
+        for valores in self.extras.values():
+            valores.pop(fila, None)
+        self.libres.append(fila)
+
+    def memoria_bytes(self) -> int:
+        """Tamaño aproximado de las columnas y los extras en uso."""
+        total = sum(columna.itemsize * len(columna) for columna in self.columnas.values())
+        for valores in self.extras.values():
+            total += sys.getsizeof(valores) + sum(sys.getsizeof(v) for v in valores.values())
+        return total
+
+
+# Tabla única, como la tabla de procesos de un sistema operativo
+TABLA_PROCESOS = TablaProcesos()
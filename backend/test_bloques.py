@@ -0,0 +1,128 @@
+import pytest
+from models.filesystem.bloques import MAX_TAMANO_ARCHIVO, TAMANO_BLOQUE, ContenidoBloques
+from models.filesystem.sistema_de_archivos import SistemaArchivos
+
+
+def test_escritura_que_cruza_bloques():
+    contenido = ContenidoBloques()
+    datos = bytes(range(256)) * 40      # 10240 bytes: tres bloques
+    assert contenido.escribir_en(TAMANO_BLOQUE - 7, datos) == len(datos)
+    assert contenido.tamanio == TAMANO_BLOQUE - 7 + len(datos)
+    assert contenido.leer(TAMANO_BLOQUE - 7) == datos
+    assert contenido.leer(0, TAMANO_BLOQUE - 7) == bytes(TAMANO_BLOQUE - 7)
+    # cada vista es un trozo de un solo bloque
+    assert all(len(vista) <= TAMANO_BLOQUE for vista in contenido.vistas())
+
+
+def test_escritura_despues_del_final_deja_un_hueco():
+    contenido = ContenidoBloques(b"abc")
+    contenido.escribir_en(3 * TAMANO_BLOQUE + 1, b"z")
+    assert contenido.tamanio == 3 * TAMANO_BLOQUE + 2
+    # los bloques intermedios no se asignan y se leen como ceros
+    assert contenido.bloques[1] is None and contenido.bloques[2] is None
+    assert contenido.leer() == b"abc" + bytes(3 * TAMANO_BLOQUE - 2) + b"z"
+
+
+def test_escritura_vacia_no_cambia_el_archivo():
+    contenido = ContenidoBloques(b"abc")
+    assert contenido.escribir_en(10 * TAMANO_BLOQUE, b"") == 0
+    assert contenido.tamanio == 3
+    assert len(contenido.bloques) == 1
+
+
+@pytest.mark.parametrize("desplazamiento,cantidad,esperado", [
+    (0, None, b"0123456789"),
+    (4, 3, b"456"),
+    (8, 10, b"89"),          # pasa el final: se corta
+    (10, 5, b""),            # justo en el final
+    (25, None, b""),         # más allá del final
+    (3, 0, b""),
+])
+def test_lectura_en_los_bordes(desplazamiento, cantidad, esperado):
+    assert ContenidoBloques(b"0123456789").leer(desplazamiento, cantidad) == esperado
+
+
+def test_desplazamiento_negativo():
+    contenido = ContenidoBloques(b"abc")
+    with pytest.raises(ValueError):
+        contenido.leer(-1)
+    with pytest.raises(ValueError):
+        contenido.escribir_en(-1, b"x")
+
+
+def test_limite_de_tamanio():
+    contenido = ContenidoBloques()
+    with pytest.raises(ValueError):
+        contenido.escribir_en(MAX_TAMANO_ARCHIVO, b"x")
+    with pytest.raises(ValueError):
+        contenido.truncar(MAX_TAMANO_ARCHIVO + 1)
+    # el límite exacto se puede alcanzar (como hueco: no ocupa memoria)
+    contenido.truncar(MAX_TAMANO_ARCHIVO)
+    assert contenido.tamanio == MAX_TAMANO_ARCHIVO
+    assert all(bloque is None for bloque in contenido.bloques)
+
+
+@pytest.mark.parametrize("nuevo", [0, 1, TAMANO_BLOQUE - 1, TAMANO_BLOQUE, TAMANO_BLOQUE + 1])
+def test_truncar_y_volver_a_crecer_deja_ceros(nuevo):
+    datos = b"x" * (2 * TAMANO_BLOQUE + 100)
+    contenido = ContenidoBloques(datos)
+    contenido.truncar(nuevo)
+    assert contenido.tamanio == nuevo
+    assert len(contenido.bloques) == -(-nuevo // TAMANO_BLOQUE)
+    assert contenido.leer() == datos[:nuevo]
+    # lo que se descartó no reaparece al agrandar
+    contenido.truncar(len(datos))
+    assert contenido.leer() == datos[:nuevo] + bytes(len(datos) - nuevo)
+
+
+def test_truncar_negativo():
+    with pytest.raises(ValueError):
+        ContenidoBloques(b"abc").truncar(-1)
+
+
+def test_agregar_y_reemplazar():
+    contenido = ContenidoBloques(b"hola")
+    assert contenido.agregar(memoryview(b" mundo")) == 6
+    assert contenido.leer() == b"hola mundo"
+    contenido.reemplazar(b"chau")
+    assert contenido.leer() == b"chau"
+    assert len(contenido) == 4
+
+
+def test_vistas_terminan_si_el_archivo_se_achica():
+    contenido = ContenidoBloques(b"a" * (3 * TAMANO_BLOQUE))
+    vistas = contenido.vistas()
+    primera = next(vistas)
+    assert len(primera) == TAMANO_BLOQUE
+    contenido.truncar(TAMANO_BLOQUE + 10)
+    assert [len(vista) for vista in vistas] == [10]
+
+
+def test_tamanio_en_bytes_del_texto():
+    fs = SistemaArchivos()
+    fs.crear_archivo("/a.txt", "año")
+    assert fs.ls("/")["archivos"][0]["tamanio"] == 4    # la ñ ocupa dos bytes en UTF-8
+    assert fs.read("/a.txt")["contenido"] == "año"
+
+
+def test_lectura_y_escritura_por_desplazamiento():
+    fs = SistemaArchivos()
+    fs.crear_archivo("/a.bin", "0123456789")
+    assert fs.pwrite("/a.bin", 2, b"xy")["tamanio"] == 10
+    assert fs.pread("/a.bin", 1, 4)["datos"] == b"1xy4"
+    assert fs.append("/a.bin", b"!")["tamanio"] == 11
+    assert fs.truncate("/a.bin", 3)["tamanio"] == 3
+    assert fs.read("/a.bin")["contenido"] == "01x"
+    assert "error" in fs.pread("/a.bin", -1)
+    assert "error" in fs.truncate("/a.bin", -1)
+    assert "error" in fs.pwrite("/nada.bin", 0, b"x")
+
+
+def test_escritura_por_desplazamiento_respeta_permisos():
+    fs = SistemaArchivos()
+    fs.crear_archivo("/solo_lectura.txt", "hola", permisos="644")
+    fs.su("usuario1")
+    assert fs.pread("/solo_lectura.txt", 0)["datos"] == b"hola"
+    assert "error" in fs.pwrite("/solo_lectura.txt", 0, b"x")
+    assert "error" in fs.append("/solo_lectura.txt", b"x")
+    assert "error" in fs.truncate("/solo_lectura.txt", 0)
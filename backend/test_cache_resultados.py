@@ -0,0 +1,98 @@
+import threading
+import pytest
+from fastapi.testclient import TestClient
+import main
+from controllers.cache_resultados import CacheResultados, tamanio_aproximado
+from controllers.cola_indexada import ColaIndexada
+from controllers.colas import transformar_y_encolar
+from main import app, consultar_cache, procesos_a_planificar
+from models.process import Proceso
+
+
+def _filas(n):
+    return [{"pid": i, "tiempo_espera": i} for i in range(n)]
+
+
+def test_lru_por_cantidad_de_entradas():
+    cache = CacheResultados(capacidad=2)
+    cache.guardar("a", [1])
+    cache.guardar("b", [2])
+    assert cache.obtener("a") == [1]      # "b" pasa a ser el menos usado
+    cache.guardar("c", [3])
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == [1] and cache.obtener("c") == [3]
+    assert cache.estadisticas()["desalojos"] == 1
+
+
+def test_limite_de_bytes():
+    grande = _filas(1000)
+    cache = CacheResultados(capacidad=100, max_bytes=int(2.5 * tamanio_aproximado(grande)))
+    for clave in "abc":
+        cache.guardar(clave, _filas(1000))
+    assert cache.obtener("a") is None
+    assert cache.obtener("b") is not None and cache.obtener("c") is not None
+    assert cache.bytes <= cache.max_bytes
+    # uno que solo ya no entra no se guarda ni desaloja a los demás
+    cache.guardar("d", _filas(10000))
+    assert cache.obtener("d") is None and cache.obtener("c") is not None
+    cache.invalidar()
+    assert cache.bytes == 0 and cache.estadisticas()["entradas"] == 0
+
+
+def test_reemplazar_una_clave_no_duplica_los_bytes():
+    cache = CacheResultados()
+    cache.guardar("a", _filas(10))
+    cache.guardar("a", _filas(10))
+    assert cache.bytes == tamanio_aproximado(_filas(10))
+
+
+@pytest.mark.parametrize("capacidad,max_bytes", [(0, 1), (1, 0)])
+def test_limites_invalidos(capacidad, max_bytes):
+    with pytest.raises(ValueError):
+        CacheResultados(capacidad, max_bytes)
+
+
+def test_huella_sigue_a_la_cola_aunque_no_se_avise():
+    cache, cola = CacheResultados(), ColaIndexada()
+    cola.put(Proceso(pid=1, tiempo_llegada=0, rafaga_cpu=3))
+    antes = cache.huella(cola)
+    assert cache.huella(cola) == antes
+    cola.put(Proceso(pid=2, tiempo_llegada=0, rafaga_cpu=3))     # sin nueva_version()
+    assert cache.huella(cola) != antes
+
+
+def test_agregar_durante_la_consulta_no_deja_resultados_de_otra_carga(monkeypatch):
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9401, "tiempo_llegada": 0, "rafaga_cpu": 2, "usuario": "test"})
+    hilos = []
+
+    def instantanea_con_agregado_en_el_medio():
+        # otro hilo agrega un proceso justo entre la huella y la instantánea
+        hilo = threading.Thread(target=transformar_y_encolar, args=(
+            {"PID": 9402, "tiempo_llegada": 0, "rafaga_cpu": 7, "usuario": "test"},))
+        hilo.start()
+        hilo.join(timeout=0.5)
+        hilos.append(hilo)
+        return procesos_a_planificar()
+
+    monkeypatch.setattr(main, "procesos_a_planificar", instantanea_con_agregado_en_el_medio)
+    try:
+        cliente.post("/planificar/sjf")
+        monkeypatch.undo()
+        hilos[0].join()
+        cliente.delete("/colas/procesos/9402")
+        # misma carga que antes del agregado: no debe aparecer el proceso 9402
+        assert 9402 not in {p["pid"] for p in cliente.post("/planificar/sjf").json()}
+    finally:
+        for pid in (9401, 9402):
+            cliente.delete(f"/colas/procesos/{pid}")
+
+
+def test_consultar_cache_devuelve_la_instantanea_solo_si_falla():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9403, "tiempo_llegada": 0, "rafaga_cpu": 2, "usuario": "test"})
+    try:
+        _, resultado, procesos = consultar_cache("fcfs", 0, True, "prueba")
+        assert resultado is None and 9403 in {p.pcb.pid for p in procesos}
+    finally:
+        cliente.delete("/colas/procesos/9403")
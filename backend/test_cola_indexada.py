@@ -0,0 +1,74 @@
+import pytest
+from controllers.cola_indexada import ColaIndexada
+from models.process import Proceso
+
+
+def _cola(*pids):
+    cola = ColaIndexada()
+    for pid in pids:
+        cola.put(Proceso(pid=pid))
+    return cola
+
+
+def _pids(procesos):
+    return [p.pcb.pid for p in procesos]
+
+
+def test_fifo_y_quitar_en_cualquier_posicion():
+    cola = _cola(1, 2, 3, 4)
+    assert cola.get().pcb.pid == 1
+    assert cola.quitar(3).pcb.pid == 3
+    assert _pids(cola) == [2, 4] and len(cola) == 2
+    assert 3 not in cola and cola.buscar(4).pcb.pid == 4
+    cola.quitar(4)
+    cola.quitar(2)
+    assert cola.empty() and cola.primero() is None
+    with pytest.raises(IndexError):
+        cola.get()
+    with pytest.raises(KeyError):
+        cola.quitar(2)
+
+
+def test_se_puede_quitar_mientras_se_recorre():
+    cola = _cola(*range(6))
+    vistos = []
+    for proceso in cola:
+        vistos.append(proceso.pcb.pid)
+        if proceso.pcb.pid % 2 == 0:
+            cola.quitar(proceso.pcb.pid)
+    assert vistos == list(range(6))
+    assert _pids(cola) == [1, 3, 5]
+    assert _pids(cola.desde(1)) == [3, 5]
+
+
+def test_un_proceso_esta_en_una_sola_cola():
+    listos, bloqueados = _cola(1), ColaIndexada()
+    proceso = listos.buscar(1)
+    with pytest.raises(ValueError):
+        bloqueados.put(proceso)
+    with pytest.raises(ValueError):
+        listos.put(Proceso(pid=1))      # mismo PID, otro proceso
+    bloqueados.put(listos.quitar(1))
+    assert 1 in bloqueados and 1 not in listos
+
+
+def test_extend_es_todo_o_nada():
+    cola = _cola(1)
+    version = cola.version
+    with pytest.raises(ValueError):
+        cola.extend([Proceso(pid=2), Proceso(pid=3), Proceso(pid=2)])
+    with pytest.raises(ValueError):
+        cola.extend([Proceso(pid=4), Proceso(pid=1)])
+    assert _pids(cola) == [1] and cola.version == version
+    cola.extend([Proceso(pid=2), Proceso(pid=3)])
+    assert _pids(cola) == [1, 2, 3]
+
+
+def test_version_cambia_con_cada_modificacion():
+    cola = _cola()
+    versiones = [cola.version]
+    cola.put(Proceso(pid=1))
+    versiones.append(cola.version)
+    cola.get()
+    versiones.append(cola.version)
+    assert versiones == sorted(set(versiones))
@@ -0,0 +1,141 @@
+import threading
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from controllers.colas import bloquear_proceso, cola_bloqueados, cola_listos, transformar_y_encolar
+from main import app
+from models.process import Proceso
+
+PIDS = (9001, 9002)
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    yield cliente
+    for pid in PIDS:
+        cliente.delete(f"/colas/procesos/{pid}")
+
+
+def _pids_planificados(cliente, algoritmo="fcfs"):
+    respuesta = cliente.post(f"/planificar/{algoritmo}")
+    assert respuesta.status_code == 200
+    return {proceso["pid"] for proceso in respuesta.json()}
+
+
+def _agregar(cliente, pid, **campos):
+    cuerpo = {"PID": pid, "tiempo_llegada": 0, "rafaga_cpu": 3, "usuario": "test", **campos}
+    return cliente.post("/colas/agregar", json=cuerpo)
+
+
+def test_agregar_invalida_el_cache(cliente):
+    antes = _pids_planificados(cliente)
+    assert _pids_planificados(cliente) == antes     # segunda vez: acierto del cache
+    assert _agregar(cliente, PIDS[0]).status_code == 200
+    assert _pids_planificados(cliente) == antes | {PIDS[0]}
+
+
+def test_bloquear_y_desbloquear_invalidan_el_cache(cliente):
+    _agregar(cliente, PIDS[0])
+    _agregar(cliente, PIDS[1])
+    assert set(PIDS) <= _pids_planificados(cliente, "rr")
+    assert cliente.post("/colas/bloquear", params={"pid": PIDS[0]}).status_code == 200
+    assert PIDS[0] in cola_bloqueados
+    planificados = _pids_planificados(cliente, "rr")
+    assert PIDS[0] not in planificados and PIDS[1] in planificados
+    assert cliente.post("/colas/desbloquear", params={"pid": PIDS[0]}).status_code == 200
+    assert set(PIDS) <= _pids_planificados(cliente, "rr")
+
+
+def test_eliminar_invalida_el_cache(cliente):
+    _agregar(cliente, PIDS[0])
+    assert PIDS[0] in _pids_planificados(cliente, "sjf")
+    cliente.delete(f"/colas/procesos/{PIDS[0]}")
+    assert PIDS[0] not in _pids_planificados(cliente, "sjf")
+
+
+def test_mismo_pid_en_otro_algoritmo_no_reusa_el_resultado(cliente):
+    _agregar(cliente, PIDS[0], rafaga_cpu=50)
+    _agregar(cliente, PIDS[1], rafaga_cpu=1)
+    fcfs = cliente.post("/planificar/fcfs").json()
+    sjf = cliente.post("/planificar/sjf").json()
+    assert [p["pid"] for p in fcfs] != [p["pid"] for p in sjf]
+
+
+@pytest.mark.parametrize("llegada,estado", [(1.0, 200), ("2", 200), (1.5, 400), ("x", 400), (-1, 400)])
+def test_agregar_valida_el_tiempo_de_llegada(cliente, llegada, estado):
+    respuesta = _agregar(cliente, PIDS[0], tiempo_llegada=llegada)
+    assert respuesta.status_code == estado
+    if estado == 200:
+        assert respuesta.json()["Tiempo Llegada"] == int(llegada)
+        assert PIDS[0] in cola_listos
+
+
+def test_agregar_rechaza_pid_repetido(cliente):
+    assert _agregar(cliente, PIDS[0]).status_code == 200
+    assert _agregar(cliente, PIDS[0]).status_code == 400
+    cliente.post("/colas/bloquear", params={"pid": PIDS[0]})
+    assert _agregar(cliente, PIDS[0]).status_code == 400
+
+
+def _en_otro_hilo(funcion, *args):
+    """
+    Corre `funcion` en otro hilo y espera un rato: si necesita un candado que tiene
+    quien llama, queda esperando y termina después. Devuelve (hilo, resultados).
+    """
+    resultados = []
+
+    def correr():
+        try:
+            resultados.append(funcion(*args))
+        except (HTTPException, ValueError) as e:
+            resultados.append(e)
+
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    hilo.join(timeout=0.3)
+    return hilo, resultados
+
+
+def _interrumpir(monkeypatch, cola, metodo, funcion, *args):
+    """La primera llamada a cola.<metodo> corre antes `funcion` en otro hilo (ver _en_otro_hilo)."""
+    original = getattr(cola, metodo)
+    otro = []
+
+    def interrumpido(*a):
+        if not otro:
+            otro.append(None)       # la llamada del otro hilo no vuelve a interrumpir
+            otro[0] = _en_otro_hilo(funcion, *args)
+        return original(*a)
+
+    monkeypatch.setattr(cola, metodo, interrumpido)
+    return otro
+
+
+def test_no_se_puede_agregar_el_pid_mientras_se_mueve(cliente, monkeypatch):
+    _agregar(cliente, PIDS[0])
+    duplicado = {"PID": PIDS[0], "tiempo_llegada": 0, "rafaga_cpu": 1, "usuario": "test"}
+    # el alta llega justo cuando el proceso salió de listos y todavía no entró a bloqueados
+    otro = _interrumpir(monkeypatch, cola_bloqueados, "put", transformar_y_encolar, duplicado)
+    bloquear_proceso(PIDS[0])
+    hilo, resultados = otro[0]
+    hilo.join()
+    assert isinstance(resultados[0], ValueError)
+    assert PIDS[0] in cola_bloqueados and PIDS[0] not in cola_listos
+
+
+def test_bloquear_mientras_otro_vacia_la_cola(monkeypatch):
+    guardados = list(cola_listos)
+    cola_listos.limpiar()
+    try:
+        cola_listos.put(Proceso(pid=PIDS[0]))
+        # otro /bloquear se lleva el único proceso entre el chequeo de cola vacía y el get
+        otro = _interrumpir(monkeypatch, cola_listos, "get", bloquear_proceso)
+        assert bloquear_proceso()["PID"] == PIDS[0]
+        hilo, resultados = otro[0]
+        hilo.join()
+        assert resultados[0].status_code == 400
+    finally:
+        monkeypatch.undo()
+        cola_bloqueados.quitar(PIDS[0])
+        cola_listos.extend(guardados)
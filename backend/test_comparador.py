@@ -0,0 +1,110 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+import controllers.comparador as comparador
+from controllers.comparador import ALGORITMOS_COMPARABLES, barrido_quantum, comparar, instantanea, simular_resumen
+from controllers.planificador import Planificador
+from main import app
+from models.process import Proceso
+
+
+def _carga(semilla, n=30):
+    azar = random.Random(semilla)
+    procesos = [Proceso(pid=pid, tiempo_llegada=azar.randint(0, 20), rafaga_cpu=azar.randint(1, 9),
+                        prioridad=azar.randint(0, 4)) for pid in range(1, n + 1)]
+    return instantanea(procesos)
+
+
+OPCIONES = {"quantum": 2, "envejecimiento": 0, "quantums": [2, 4, 8], "periodo_boost": 0}
+
+
+def test_resumen_coincide_con_el_planificador():
+    carga = _carga(1)
+    resumen = simular_resumen("sjf", carga, OPCIONES)
+    resultados = Planificador().sjf(comparador.procesos_desde_instantanea(carga))
+    assert resumen["procesos"] == len(carga)
+    assert resumen["espera_promedio"] == sum(r["tiempo_espera"] for r in resultados) / len(carga)
+    assert resumen["tiempo_total"] == max(r["tiempo_finalizacion"] for r in resultados)
+
+
+def test_en_paralelo_da_lo_mismo_que_en_serie(monkeypatch):
+    carga = _carga(2)
+    algoritmos = ["fcfs", "rr", "mlfq"]
+    en_serie = comparar(carga, algoritmos, OPCIONES)
+    monkeypatch.setattr(comparador, "UMBRAL_PARALELO", 0)
+    assert comparar(carga, algoritmos, OPCIONES) == en_serie
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9201, "tiempo_llegada": 0, "rafaga_cpu": 3, "usuario": "test"})
+    cliente.post("/colas/agregar", json={"PID": 9202, "tiempo_llegada": 1, "rafaga_cpu": 1, "usuario": "test"})
+    yield cliente
+    for pid in (9201, 9202):
+        cliente.delete(f"/colas/procesos/{pid}")
+
+
+def test_endpoint_comparar(cliente):
+    datos = cliente.post("/planificar/comparar", json={"algoritmos": ["fcfs", "sjf", "fcfs"]}).json()
+    assert list(datos) == ["fcfs", "sjf"]
+    assert all(resumen["procesos"] >= 2 for resumen in datos.values())
+
+
+def test_endpoint_comparar_por_defecto_usa_todos(cliente):
+    assert list(cliente.post("/planificar/comparar").json()) == list(ALGORITMOS_COMPARABLES)
+
+
+@pytest.mark.parametrize("cuerpo", [
+    {"algoritmos": 5},
+    {"algoritmos": "fcfs"},
+    {"algoritmos": ["fcfs", 3]},
+    {"algoritmos": []},
+    {"algoritmos": ["fcfs", "lifo"]},
+    {"algoritmos": ["rr"], "quantum": 0},
+])
+def test_endpoint_comparar_errores(cliente, cuerpo):
+    respuesta = cliente.post("/planificar/comparar", json=cuerpo)
+    assert respuesta.status_code == 200
+    assert "error" in respuesta.json()
+
+
+def test_barrido_coincide_con_corridas_sueltas():
+    carga = _carga(3)
+    curvas = barrido_quantum(carga, [1, 3, 5])
+    assert curvas["quantums"] == [1, 3, 5]
+    for i, q in enumerate(curvas["quantums"]):
+        resumen = simular_resumen("rr", carga, {"quantum": q})
+        assert curvas["espera_promedio"][i] == resumen["espera_promedio"]
+        assert curvas["cambios_contexto"][i] == resumen["cambios_contexto"]
+
+
+def test_barrido_en_paralelo_conserva_el_orden(monkeypatch):
+    carga = _carga(4)
+    quantums = list(range(1, 9))
+    en_serie = barrido_quantum(carga, quantums)
+    monkeypatch.setattr(comparador, "UMBRAL_PARALELO", 0)
+    assert barrido_quantum(carga, quantums) == en_serie
+
+
+def test_endpoint_barrido(cliente):
+    por_lista = cliente.post("/planificar/rr/barrido", json={"quantums": [1, 2, 3]}).json()
+    por_rango = cliente.post("/planificar/rr/barrido", json={"desde": 1, "hasta": 3}).json()
+    assert por_lista == por_rango
+    assert len(por_lista["espera_promedio"]) == 3
+
+
+@pytest.mark.parametrize("cuerpo", [
+    {},
+    {"quantums": 5},
+    {"quantums": []},
+    {"quantums": [1, "2"]},
+    {"quantums": [0]},
+    {"desde": 1, "hasta": "9"},
+    {"desde": 1, "hasta": 9, "paso": 0},
+    {"desde": 1, "hasta": 10**9},
+])
+def test_endpoint_barrido_errores(cliente, cuerpo):
+    respuesta = cliente.post("/planificar/rr/barrido", json=cuerpo)
+    assert respuesta.status_code == 200
+    assert "error" in respuesta.json()
@@ -0,0 +1,123 @@
+import io
+import random
+import zipfile
+from array import array
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+import controllers.exportacion as exportacion
+from controllers.exportacion import ALINEACION, abrir_exportacion, escribir_npz
+from controllers.planificador import Planificador, fabrica_politica
+from main import app
+from models.process import Proceso
+
+
+def _procesos(cargas):
+    return [Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad, usuario="test")
+            for pid, llegada, rafaga, prioridad in cargas]
+
+
+def _cargas(semilla, n=25):
+    azar = random.Random(semilla)
+    return [(pid, azar.randint(0, 30), azar.randint(1, 12), azar.randint(0, 4)) for pid in range(1, n + 1)]
+
+
+def _npz(tablas):
+    return b"".join(escribir_npz(tablas))
+
+
+def test_npz_se_lee_con_np_load():
+    tablas = {"procesos": {"pid": array("q", [3, 1, 2]), "vacia": array("q")},
+              "tramos": {"inicio": array("q", [-5, 0, 2**40])}}
+    with np.load(io.BytesIO(_npz(tablas))) as datos:
+        assert sorted(datos.files) == ["procesos/pid", "procesos/vacia", "tramos/inicio"]
+        assert datos["procesos/pid"].tolist() == [3, 1, 2]
+        assert datos["procesos/vacia"].shape == (0,)
+        assert datos["tramos/inicio"].dtype == np.dtype("<i8")
+        assert datos["tramos/inicio"].tolist() == [-5, 0, 2**40]
+
+
+def test_miembros_sin_comprimir_y_alineados(monkeypatch):
+    monkeypatch.setattr(exportacion, "VALORES_POR_ENVIO", 4)
+    tablas = {"t": {nombre: array("q", range(n)) for nombre, n in (("a", 10), ("bb", 3), ("ccc", 0))}}
+    envios = list(escribir_npz(tablas))
+    assert len(envios) > 3   # la columna de 10 valores sale en varios fragmentos
+    contenido = b"".join(envios)
+    with zipfile.ZipFile(io.BytesIO(contenido)) as archivo:
+        for info in archivo.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED
+            largo_nombre = int.from_bytes(contenido[info.header_offset + 26:info.header_offset + 28], "little")
+            largo_extra = int.from_bytes(contenido[info.header_offset + 28:info.header_offset + 30], "little")
+            assert (info.header_offset + 30 + largo_nombre + largo_extra) % ALINEACION == 0
+
+
+def test_abrir_exportacion_mapea_sin_copiar(tmp_path):
+    tablas = {"procesos": {"pid": array("q", [7, 8, 9])}, "tramos": {"fin": array("q")}}
+    ruta = tmp_path / "resultado.npz"
+    ruta.write_bytes(_npz(tablas))
+    columnas = abrir_exportacion(ruta)
+    assert isinstance(columnas["procesos/pid"], np.memmap)
+    assert columnas["procesos/pid"].tolist() == [7, 8, 9]
+    assert columnas["tramos/fin"].shape == (0,)
+
+
+def test_abrir_exportacion_rechaza_comprimidos(tmp_path):
+    ruta = tmp_path / "comprimido.npz"
+    np.savez_compressed(ruta, pid=np.arange(5))
+    with pytest.raises(ValueError):
+        abrir_exportacion(ruta)
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "rr", "mlfq"])
+@pytest.mark.parametrize("cpus", [1, 3])
+def test_exportar_coincide_con_la_linea_de_tiempo(algoritmo, cpus):
+    cargas = _cargas(9)
+    fabrica = fabrica_politica(algoritmo)
+    columnas = Planificador().exportar(_procesos(cargas), fabrica, cpus).tablas()
+    tramos = list(Planificador().linea_de_tiempo(_procesos(cargas), fabrica, cpus))
+    for nombre in ("pid", "cpu", "inicio", "fin"):
+        assert list(columnas["tramos"][nombre]) == [tramo[nombre] for tramo in tramos]
+    procesos = columnas["procesos"]
+    assert sorted(procesos["pid"]) == [pid for pid, _, _, _ in cargas]
+    finales = {t["pid"]: t["fin"] for t in tramos}
+    assert dict(zip(procesos["pid"], procesos["tiempo_finalizacion"])) == finales
+    for llegada, fin, rafaga, espera, retorno in zip(procesos["tiempo_llegada"], procesos["tiempo_finalizacion"],
+                                                     procesos["rafaga_cpu"], procesos["tiempo_espera"],
+                                                     procesos["tiempo_retorno"]):
+        assert retorno == fin - llegada and espera == retorno - rafaga
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9401, "tiempo_llegada": 0, "rafaga_cpu": 4, "usuario": "test"})
+    cliente.post("/colas/agregar", json={"PID": 9402, "tiempo_llegada": 1, "rafaga_cpu": 2, "usuario": "test"})
+    yield cliente
+    for pid in (9401, 9402):
+        cliente.delete(f"/colas/procesos/{pid}")
+
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_endpoint_exportar(cliente, cpus):
+    respuesta = cliente.post("/planificar/rr/exportar", params={"cpus": cpus, "quantum": 1})
+    assert respuesta.headers["content-type"] == "application/octet-stream"
+    assert 'filename="rr.npz"' in respuesta.headers["content-disposition"]
+    with np.load(io.BytesIO(respuesta.content)) as datos:
+        pids = datos["procesos/pid"].tolist()
+        assert {9401, 9402} <= set(pids)
+        assert len(datos["procesos/tiempo_espera"]) == len(pids)
+        ejecutado = sum(int(fin - inicio) for pid, inicio, fin in
+                        zip(datos["tramos/pid"], datos["tramos/inicio"], datos["tramos/fin"]) if pid == 9401)
+        assert ejecutado == 4
+        assert all(0 <= cpu < cpus for cpu in datos["tramos/cpu"])
+
+
+@pytest.mark.parametrize("ruta,params", [
+    ("/planificar/lifo/exportar", {}),
+    ("/planificar/rr/exportar", {"quantum": 0}),
+    ("/planificar/rr/exportar", {"cpus": 2, "periodo_balance": -1}),
+])
+def test_endpoint_exportar_errores(cliente, ruta, params):
+    respuesta = cliente.post(ruta, params=params)
+    assert respuesta.status_code == 200
+    assert "error" in respuesta.json()
@@ -0,0 +1,118 @@
+import pytest
+from fastapi.testclient import TestClient
+from controllers.filesystem import get_fs
+from main import app
+from models.filesystem.bloques import TAMANO_BLOQUE
+
+RUTA = "/prueba-descarga.bin"
+DATOS = bytes(range(256)) * 40      # 10240 bytes: cruza bloques
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    get_fs().su("root")
+    assert cliente.put("/fs/upload", params={"ruta": RUTA}, content=DATOS).status_code == 200
+    yield cliente
+    get_fs().su("root")
+    get_fs().rm(RUTA)
+
+
+def _descargar(cliente, rango=None):
+    encabezados = {"Range": rango} if rango is not None else {}
+    return cliente.get("/fs/download", params={"ruta": RUTA}, headers=encabezados)
+
+
+def test_descarga_completa(cliente):
+    respuesta = _descargar(cliente)
+    assert respuesta.status_code == 200
+    assert respuesta.content == DATOS
+    assert respuesta.headers["content-length"] == str(len(DATOS))
+    assert respuesta.headers["accept-ranges"] == "bytes"
+
+
+@pytest.mark.parametrize("rango,inicio,fin", [
+    ("bytes=0-0", 0, 1),
+    ("bytes=10-19", 10, 20),
+    (f"bytes={TAMANO_BLOQUE - 2}-{TAMANO_BLOQUE + 1}", TAMANO_BLOQUE - 2, TAMANO_BLOQUE + 2),
+    ("bytes=10000-", 10000, len(DATOS)),
+    ("bytes=-16", len(DATOS) - 16, len(DATOS)),
+    ("bytes=-99999", 0, len(DATOS)),                # sufijo más largo que el archivo
+    ("bytes=10200-99999", 10200, len(DATOS)),       # fin más allá del final: se corta
+])
+def test_descarga_parcial(cliente, rango, inicio, fin):
+    respuesta = _descargar(cliente, rango)
+    assert respuesta.status_code == 206
+    assert respuesta.content == DATOS[inicio:fin]
+    assert respuesta.headers["content-range"] == f"bytes {inicio}-{fin - 1}/{len(DATOS)}"
+    assert respuesta.headers["content-length"] == str(fin - inicio)
+
+
+@pytest.mark.parametrize("rango", [f"bytes={len(DATOS)}-", f"bytes={len(DATOS) + 5}-{len(DATOS) + 10}"])
+def test_rango_no_satisfacible(cliente, rango):
+    respuesta = _descargar(cliente, rango)
+    assert respuesta.status_code == 416
+    assert respuesta.headers["content-range"] == f"bytes */{len(DATOS)}"
+
+
+@pytest.mark.parametrize("rango", ["bytes=5-2", "bytes=0-1,4-5", "items=0-4", "bytes=a-b", "bytes=-"])
+def test_rango_que_no_se_entiende_devuelve_todo(cliente, rango):
+    respuesta = _descargar(cliente, rango)
+    assert respuesta.status_code == 200
+    assert respuesta.content == DATOS
+
+
+def test_descarga_de_archivo_vacio(cliente):
+    cliente.post("/fs/truncate", params={"ruta": RUTA, "tamanio": 0})
+    assert _descargar(cliente).content == b""
+    assert _descargar(cliente, "bytes=0-").status_code == 416
+
+
+def test_descarga_sin_permiso_o_inexistente(cliente):
+    cliente.post("/fs/chmod", params={"ruta": RUTA, "permisos": "600"})
+    get_fs().su("usuario1")
+    assert _descargar(cliente).status_code == 403
+    get_fs().su("root")
+    assert cliente.get("/fs/download", params={"ruta": "/no-existe.bin"}).status_code == 404
+
+
+def test_subida_por_partes_y_append(cliente):
+    nuevo = b"z" * 10
+    respuesta = cliente.put("/fs/upload", params={"ruta": RUTA, "desplazamiento": 5}, content=nuevo)
+    assert respuesta.status_code == 200
+    assert _descargar(cliente).content == DATOS[:5] + nuevo + DATOS[15:]
+    cliente.post("/fs/append", params={"ruta": RUTA}, content=b"fin")
+    assert _descargar(cliente, "bytes=-3").content == b"fin"
+
+
+def test_subida_sin_desplazamiento_reemplaza(cliente):
+    respuesta = cliente.put("/fs/upload", params={"ruta": RUTA}, content=b"corto")
+    assert respuesta.json() == {"ok": "archivo modificado", "tamanio": 5}
+    assert _descargar(cliente).content == b"corto"
+
+
+def test_subida_crea_el_archivo(cliente):
+    ruta = "/prueba-nuevo.bin"
+    try:
+        respuesta = cliente.put("/fs/upload", params={"ruta": ruta, "permisos": "600"}, content=b"hola")
+        assert respuesta.json()["ok"] == "archivo creado"
+        assert cliente.get("/fs/download", params={"ruta": ruta}).content == b"hola"
+    finally:
+        get_fs().rm(ruta)
+
+
+@pytest.mark.parametrize("params,estado", [
+    ({"ruta": RUTA, "desplazamiento": -1}, 400),
+    ({"ruta": "/prueba-nuevo.bin", "permisos": "9x9"}, 400),
+    ({"ruta": "/no-existe/a.bin"}, 400),     # el directorio padre no existe
+])
+def test_subida_invalida(cliente, params, estado):
+    assert cliente.put("/fs/upload", params=params, content=b"x").status_code == estado
+    assert "/prueba-nuevo.bin" not in [a["nombre"] for a in get_fs().ls("/")["archivos"]]
+
+
+def test_subida_que_no_le_deja_escribir_a_quien_crea(cliente):
+    get_fs().su("usuario1")
+    respuesta = cliente.put("/fs/upload", params={"ruta": "/home/usuario1/x.bin", "permisos": "444"}, content=b"x")
+    assert respuesta.status_code == 403
+    assert "error" in get_fs().read("/home/usuario1/x.bin")
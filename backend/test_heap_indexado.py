@@ -0,0 +1,50 @@
+import random
+import pytest
+from controllers.heap_indexado import HeapIndexado
+
+
+def _invariante(heap):
+    for i, (clave, ident, _) in enumerate(heap.datos):
+        assert heap.posicion[ident] == i
+        if i:
+            assert not clave < heap.datos[(i - 1) >> 1][0]
+    assert len(heap.posicion) == len(heap.datos)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_operaciones_al_azar_contra_un_dict(semilla):
+    azar = random.Random(semilla)
+    heap, referencia = HeapIndexado(), {}
+    for paso in range(2000):
+        operacion = azar.random()
+        if operacion < 0.4 or not referencia:
+            ident = paso
+            referencia[ident] = azar.randint(0, 100)
+            heap.push(ident, (referencia[ident], ident), f"e{ident}")
+        elif operacion < 0.6:
+            ident = azar.choice(list(referencia))
+            referencia[ident] = azar.randint(0, 100)
+            heap.actualizar(ident, (referencia[ident], ident))
+        elif operacion < 0.8:
+            ident = azar.choice(list(referencia))
+            assert heap.quitar(ident) == ((referencia.pop(ident), ident), f"e{ident}")
+        else:
+            minimo = min(referencia, key=lambda i: (referencia[i], i))
+            assert heap.pop() == (minimo, (referencia.pop(minimo), minimo), f"e{minimo}")
+        _invariante(heap)
+    assert len(heap) == len(referencia)
+
+
+def test_id_repetido_y_consultas():
+    heap = HeapIndexado()
+    heap.push("a", 3)
+    heap.push("b", 1)
+    with pytest.raises(KeyError):
+        heap.push("a", 0)
+    assert "a" in heap and "z" not in heap
+    assert heap.tope() == ("b", 1, None)
+    assert heap.clave("a") == 3
+    ultimo = heap.ultimo()
+    heap.quitar(ultimo)
+    _invariante(heap)
+    assert len(heap) == 1
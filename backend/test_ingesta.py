@@ -0,0 +1,80 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from controllers.ingesta import MAX_LARGO_LINEA, ingerir, lineas
+from main import app
+
+PIDS = range(9501, 9511)
+
+
+async def _fragmentos(*partes):
+    for parte in partes:
+        yield parte
+
+
+async def _todas(fragmentos):
+    return [linea async for linea in fragmentos]
+
+
+def test_lineas_se_arman_a_traves_de_los_fragmentos():
+    resultado = asyncio.run(_todas(lineas(_fragmentos(b"uno\r\ndo", b"s\n", b"\ntres"))))
+    assert resultado == [(1, "uno"), (2, "dos"), (3, ""), (4, "tres")]
+
+
+def test_linea_demasiado_larga_se_descarta_sin_acumularla():
+    larga = b"x" * (MAX_LARGO_LINEA + 10)
+    resultado = asyncio.run(_todas(lineas(_fragmentos(b"a\n", larga[:MAX_LARGO_LINEA], larga, b"\nb"))))
+    assert resultado == [(1, "a"), (2, None), (3, "b")]
+
+
+def test_se_valida_y_encola_por_lotes():
+    lotes = []
+    cuerpo = "".join(json.dumps({"pid": pid, "tiempo_llegada": 0, "rafaga_cpu": 1}) + "\n" for pid in range(5))
+    resultado = asyncio.run(ingerir(_fragmentos(cuerpo.encode()), "ndjson", lotes.append,
+                                    lambda pid: False, tamano_lote=2))
+    assert resultado == {"aceptados": 5, "rechazados": 0, "errores": []}
+    assert [[p.pcb.pid for p in lote] for lote in lotes] == [[0, 1], [2, 3], [4]]
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    yield cliente
+    for pid in PIDS:
+        cliente.delete(f"/colas/procesos/{pid}")
+
+
+def test_ndjson_acepta_y_rechaza_por_linea(cliente):
+    cliente.post("/colas/agregar", json={"PID": 9501, "tiempo_llegada": 0, "rafaga_cpu": 1, "usuario": "test"})
+    filas = [
+        {"pid": 9502, "tiempo_llegada": 0, "rafaga_cpu": 3},
+        {"pid": 9503, "tiempoLlegada": 2.0, "rafaga_CPU": "4", "usuario": "ana"},
+        "{no es json",
+        {"pid": 9504, "tiempo_llegada": -1, "rafaga_cpu": 3},
+        {"pid": 9505, "tiempo_llegada": 0},
+        {"pid": 9502, "tiempo_llegada": 0, "rafaga_cpu": 3},      # repetido en el lote
+        {"pid": 9501, "tiempo_llegada": 0, "rafaga_cpu": 3},      # ya estaba en la cola
+        [1, 2],
+        {"pid": 9506, "tiempo_llegada": 1, "rafagas": [2, 5, 1]},
+    ]
+    cuerpo = "\n".join(f if isinstance(f, str) else json.dumps(f) for f in filas) + "\n\n"
+    datos = cliente.post("/colas/agregar/lote", content=cuerpo).json()
+    assert datos["aceptados"] == 3 and datos["rechazados"] == 6
+    assert [error["linea"] for error in datos["errores"]] == [3, 4, 5, 6, 7, 8]
+    assert cliente.get("/colas/procesos/9503").json()["usuario"] == "ana"
+    proceso = cliente.get("/colas/procesos/9506").json()
+    assert proceso["rafaga_cpu"] == 3 and proceso["rafagas"] == [2, 5, 1]
+
+
+def test_csv_con_encabezado(cliente):
+    cuerpo = "pid,tiempo_llegada,rafaga_cpu,prioridad,rafagas\n9507,0,2,3,\n9508,1,,0,4;2;1\n9509,1\n"
+    datos = cliente.post("/colas/agregar/lote", content=cuerpo, headers={"content-type": "text/csv"}).json()
+    assert datos["aceptados"] == 2
+    assert datos["errores"][0]["linea"] == 4
+    assert cliente.get("/colas/procesos/9507").json()["prioridad"] == 3
+    assert cliente.get("/colas/procesos/9508").json()["rafaga_cpu"] == 5
+
+
+def test_formato_no_soportado(cliente):
+    assert cliente.post("/colas/agregar/lote", params={"formato": "xml"}, content="<a/>").status_code == 400
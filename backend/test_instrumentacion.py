@@ -0,0 +1,121 @@
+import json
+import logging
+import sys
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controllers.instrumentacion import FormatoJSON, Registro, _EncoladorLogs
+from controllers.perfilador import PerfiladorMuestreo
+from controllers.perfilador import router as perfilador_router
+from main import app
+
+
+def test_histograma_acumula_las_cubetas():
+    registro = Registro()
+    histograma = registro.histograma("latencia", "Latencia", limites=(1, 5))
+    for valor in (0.5, 3, 3, 9):
+        histograma.observar(valor, ruta="/a")
+    lineas = registro.exponer().splitlines()
+    assert 'latencia_bucket{ruta="/a",le="1.0"} 1' in lineas
+    assert 'latencia_bucket{ruta="/a",le="5.0"} 3' in lineas
+    assert 'latencia_bucket{ruta="/a",le="+Inf"} 4' in lineas
+    assert 'latencia_sum{ruta="/a"} 15.5' in lineas
+    assert "# TYPE latencia histogram" in lineas
+
+
+def test_contador_medidor_y_recolectores():
+    registro = Registro()
+    contador = registro.contador("pedidos_total", "Pedidos")
+    medidor = registro.medidor("en_curso", "En curso")
+    contador.inc(metodo="GET")
+    contador.inc(2, metodo="GET")
+    medidor.inc()
+    medidor.dec()
+    registro.registrar_recolector(lambda: [("externo", "gauge", "Leído al exponer", 7)])
+    texto = registro.exponer()
+    assert 'pedidos_total{metodo="GET"} 3' in texto
+    assert "en_curso 0" in texto
+    assert "externo 7" in texto
+
+
+def test_etiquetas_se_escapan():
+    registro = Registro()
+    registro.contador("c", "C").inc(ruta='a"b\\c\nd')
+    assert 'c{ruta="a\\"b\\\\c\\nd"} 1' in registro.exponer()
+
+
+def test_metrics_mide_las_peticiones_por_plantilla_de_ruta():
+    cliente = TestClient(app)
+    cliente.get("/colas/procesos/123456789")
+    texto = cliente.get("/metrics").text
+    assert 'http_duracion_peticion_segundos_count{codigo="404",metodo="GET",ruta="/colas/procesos/{pid}"}' in texto
+    assert "cola_listos_procesos" in texto and "cache_planificacion_bytes" in texto
+
+
+def _registro(mensaje, *args, **extra):
+    registro = logging.LogRecord("controllers.prueba", logging.WARNING, __file__, 1, mensaje, args, None)
+    registro.__dict__.update(extra)
+    return registro
+
+
+def test_formato_json_incluye_los_campos_extra():
+    datos = json.loads(FormatoJSON().format(_registro("ruta %s", "/x", usuario="ana", bytes=3)))
+    assert datos["mensaje"] == "ruta /x" and datos["nivel"] == "WARNING"
+    assert datos["logger"] == "controllers.prueba"
+    assert datos["usuario"] == "ana" and datos["bytes"] == 3
+
+
+def test_la_excepcion_viaja_en_su_propio_campo():
+    class Cola(list):
+        def put_nowait(self, registro):
+            self.append(registro)
+
+    cola = Cola()
+    encolador = _EncoladorLogs(cola)
+    try:
+        raise ValueError("falló")
+    except ValueError:
+        registro = _registro("con error")
+        registro.exc_info = sys.exc_info()
+    encolador.emit(registro)
+    datos = json.loads(FormatoJSON().format(cola[0]))
+    assert datos["mensaje"] == "con error"
+    assert "ValueError: falló" in datos["excepcion"]
+
+
+def test_perfilador_cuenta_las_pilas_de_otros_hilos():
+    perfilador = PerfiladorMuestreo()
+    listo = threading.Event()
+
+    def ocupado():
+        while not listo.is_set():
+            sum(range(1000))
+
+    hilo = threading.Thread(target=ocupado)
+    hilo.start()
+    perfilador.iniciar(0.001)
+    try:
+        with pytest.raises(RuntimeError):
+            perfilador.iniciar(0.001)
+        time.sleep(0.1)
+    finally:
+        perfilador.detener()
+        listo.set()
+        hilo.join()
+    assert perfilador.muestras > 0 and not perfilador.activo()
+    lineas = perfilador.colapsado().splitlines()
+    assert any(";test_instrumentacion.py:ocupado" in linea for linea in lineas)
+    assert all(linea.rsplit(" ", 1)[1].isdigit() for linea in lineas)
+
+
+def test_rutas_del_perfilador():
+    aplicacion = FastAPI()
+    aplicacion.include_router(perfilador_router)
+    cliente = TestClient(aplicacion)
+    assert cliente.post("/perfil/iniciar", params={"intervalo_ms": 0}).status_code == 400
+    assert cliente.post("/perfil/iniciar", params={"intervalo_ms": 5}).status_code == 200
+    assert cliente.post("/perfil/iniciar").status_code == 409
+    assert cliente.post("/perfil/detener").status_code == 200
+    assert cliente.get("/perfil").status_code == 200
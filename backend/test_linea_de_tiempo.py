@@ -0,0 +1,70 @@
+import json
+import random
+import pytest
+from fastapi.testclient import TestClient
+from controllers.planificador import Planificador, fabrica_politica
+from main import _ndjson, app
+from models.process import Proceso
+
+
+def _procesos(cargas):
+    return [Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad, usuario="test")
+            for pid, llegada, rafaga, prioridad in cargas]
+
+
+def _cargas(semilla, n=25):
+    azar = random.Random(semilla)
+    return [(pid, azar.randint(0, 30), azar.randint(1, 12), azar.randint(0, 4)) for pid in range(1, n + 1)]
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf", "rr", "srtf", "prioridad_expropiativo", "mlfq"])
+def test_tramos_cubren_las_rafagas_sin_solaparse(algoritmo):
+    cargas = _cargas(5)
+    fabrica = fabrica_politica(algoritmo)
+    tramos = list(Planificador().linea_de_tiempo(_procesos(cargas), fabrica))
+    ejecutado = {pid: 0 for pid, _, _, _ in cargas}
+    for tramo in tramos:
+        assert tramo["cpu"] == 0 and tramo["inicio"] < tramo["fin"]
+        ejecutado[tramo["pid"]] += tramo["fin"] - tramo["inicio"]
+    assert ejecutado == {pid: rafaga for pid, _, rafaga, _ in cargas}
+    # una sola CPU: los tramos salen en orden y no se pisan
+    for anterior, siguiente in zip(tramos, tramos[1:]):
+        assert anterior["fin"] <= siguiente["inicio"]
+    # el último tramo de cada proceso termina donde lo dice la planificación completa
+    finales = {r["pid"]: r["tiempo_finalizacion"]
+               for r in Planificador()._simular(fabrica(), _procesos(cargas))}
+    assert finales == {t["pid"]: t["fin"] for t in tramos}
+
+
+def test_ndjson_agrupa_lineas_por_envio():
+    envios = list(_ndjson(({"n": i} for i in range(5)), por_bloque=2))
+    assert len(envios) == 3
+    assert all(envio.endswith("\n") for envio in envios)
+    assert [json.loads(linea) for linea in "".join(envios).splitlines()] == [{"n": i} for i in range(5)]
+    assert list(_ndjson([])) == []
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9301, "tiempo_llegada": 0, "rafaga_cpu": 5, "usuario": "test"})
+    yield cliente
+    cliente.delete("/colas/procesos/9301")
+
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_endpoint_transmite_ndjson(cliente, cpus):
+    respuesta = cliente.post("/planificar/rr/linea_de_tiempo", params={"cpus": cpus, "quantum": 1})
+    assert respuesta.headers["content-type"].startswith("application/x-ndjson")
+    tramos = [json.loads(linea) for linea in respuesta.text.splitlines()]
+    assert sum(t["fin"] - t["inicio"] for t in tramos if t["pid"] == 9301) == 5
+    assert all(0 <= t["cpu"] < cpus for t in tramos)
+
+
+@pytest.mark.parametrize("params", [{"quantum": 0}, {"periodo_balance": -1}])
+def test_endpoint_valida_antes_de_transmitir(cliente, params):
+    assert "error" in cliente.post("/planificar/rr/linea_de_tiempo", params=params).json()
+
+
+def test_endpoint_algoritmo_invalido(cliente):
+    assert "error" in cliente.post("/planificar/lifo/linea_de_tiempo").json()
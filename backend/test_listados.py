@@ -0,0 +1,83 @@
+import pytest
+from fastapi.testclient import TestClient
+from controllers.colas import MAX_LIMITE
+from main import app
+
+PIDS = range(9601, 9606)
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    for pid in PIDS:
+        cliente.post("/colas/agregar", json={"PID": pid, "tiempo_llegada": 0, "rafaga_cpu": 2, "usuario": "test"})
+    cliente.post("/colas/bloquear", params={"pid": PIDS[-1]})
+    yield cliente
+    for pid in PIDS:
+        cliente.delete(f"/colas/procesos/{pid}")
+
+
+def _paginas(cliente, limite, al_recibir=None):
+    pids, cursor = [], None
+    while True:
+        params = {"limite": limite} if cursor is None else {"limite": limite, "cursor": cursor}
+        respuesta = cliente.get("/colas/procesos", params=params)
+        pagina = [p["PID"] for p in respuesta.json()]
+        assert len(pagina) <= limite
+        pids += pagina
+        cursor = respuesta.headers.get("X-Cursor-Siguiente")
+        if cursor is None:
+            return pids
+        if al_recibir:
+            al_recibir(pagina)
+
+
+@pytest.mark.parametrize("limite", [1, 2, 3, MAX_LIMITE])
+def test_las_paginas_recorren_listos_y_despues_bloqueados(cliente, limite):
+    completo = [p["PID"] for p in cliente.get("/colas/procesos").json()]
+    assert completo.index(PIDS[-1]) > completo.index(PIDS[0])
+    assert _paginas(cliente, limite) == completo
+
+
+def test_el_cursor_sigue_valiendo_si_el_proceso_se_va(cliente):
+    completo = [p["PID"] for p in cliente.get("/colas/procesos").json()]
+    quitados = []
+
+    def quitar_el_ultimo(pagina):
+        # el proceso del cursor se va de la cola (borrado o movido a bloqueados)
+        if pagina[-1] in PIDS[:2]:
+            cliente.delete(f"/colas/procesos/{pagina[-1]}")
+            quitados.append(pagina[-1])
+        elif pagina[-1] == PIDS[2]:
+            cliente.post("/colas/bloquear", params={"pid": PIDS[2]})
+            quitados.append(PIDS[2])
+
+    obtenidos = _paginas(cliente, 1, quitar_el_ultimo)
+    # nada se repite ni se saltea (el bloqueado reaparece al final, en bloqueados)
+    assert [pid for pid in obtenidos if pid != PIDS[2]] == [pid for pid in completo if pid != PIDS[2]]
+    assert quitados == list(PIDS[:3])
+
+
+def test_proyeccion_de_campos(cliente):
+    filas = cliente.get("/colas/procesos", params={"campos": "pid,rafaga_cpu"}).json()
+    assert {"pid": PIDS[0], "rafaga_cpu": 2} in filas
+    assert all(set(fila) == {"pid", "rafaga_cpu"} for fila in filas)
+
+
+@pytest.mark.parametrize("params", [
+    {"campos": "pid,contraseña"}, {"campos": ","}, {"limite": 0}, {"limite": MAX_LIMITE + 1},
+    {"cursor": "otra:1:1"}, {"cursor": "listos:x:1"},
+])
+def test_parametros_invalidos(cliente, params):
+    assert cliente.get("/colas/procesos", params=params).status_code == 400
+
+
+@pytest.mark.parametrize("ruta", ["/colas/procesos", "/colas/mostrar"])
+def test_etag_y_304(cliente, ruta):
+    etag = cliente.get(ruta).headers["ETag"]
+    no_modificado = cliente.get(ruta, headers={"If-None-Match": etag})
+    assert no_modificado.status_code == 304 and no_modificado.content == b""
+    assert cliente.get(ruta, headers={"If-None-Match": "*"}).status_code == 304
+    cliente.post("/colas/desbloquear", params={"pid": PIDS[-1]})
+    respuesta = cliente.get(ruta, headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200 and respuesta.headers["ETag"] != etag
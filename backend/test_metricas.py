@@ -0,0 +1,67 @@
+import math
+import random
+import pytest
+from controllers.metricas import SketchCuantiles
+from controllers.planificador import Planificador
+from models.process import Proceso
+
+
+def _exacto(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[max(1, math.ceil(q * len(ordenados))) - 1]
+
+
+def test_valores_chicos_son_exactos():
+    azar = random.Random(0)
+    valores = [azar.randint(0, 1000) for _ in range(5000)]
+    sketch = SketchCuantiles()
+    for valor in valores:
+        sketch.agregar(valor)
+    assert sketch.cuantiles((0.01, 0.5, 0.95, 0.99, 1.0)) == [
+        _exacto(valores, q) for q in (0.01, 0.5, 0.95, 0.99, 1.0)
+    ]
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_valores_grandes_respetan_el_error_relativo(semilla):
+    azar = random.Random(semilla)
+    valores = [int(azar.lognormvariate(12, 3)) for _ in range(20000)]
+    sketch = SketchCuantiles(error_relativo=0.01)
+    for valor in valores:
+        sketch.agregar(valor)
+    for q, obtenido in zip((0.5, 0.9, 0.99), sketch.cuantiles((0.5, 0.9, 0.99))):
+        real = _exacto(valores, q)
+        assert abs(obtenido - real) <= 0.01 * real + 1
+    # memoria acotada: muchas menos cubetas que valores
+    assert len(sketch.cubetas) < 3000
+    assert sketch.minimo == min(valores) and sketch.maximo == max(valores)
+
+
+def test_sketch_vacio_y_valores_invalidos():
+    sketch = SketchCuantiles()
+    assert sketch.cuantiles() == [None, None, None]
+    assert sketch.to_dict()["promedio"] == 0.0
+    with pytest.raises(ValueError):
+        sketch.agregar(-1)
+    with pytest.raises(ValueError):
+        SketchCuantiles(error_relativo=1)
+
+
+def test_resumen_coincide_con_los_resultados_completos():
+    azar = random.Random(5)
+    cargas = [(pid, azar.randint(0, 200), azar.randint(1, 30)) for pid in range(1, 301)]
+
+    def procesos():
+        return [Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga) for pid, llegada, rafaga in cargas]
+
+    completos = Planificador().round_robin(procesos(), quantum=3)
+    resumen = Planificador().round_robin(procesos(), quantum=3, resumen=True)
+    esperas = [r["tiempo_espera"] for r in completos]
+    assert resumen["procesos"] == len(cargas)
+    assert resumen["espera"]["promedio"] == pytest.approx(sum(esperas) / len(esperas))
+    # esperas de más de 1024 unidades: valen dentro del error relativo del sketch
+    for clave, q in (("p50", 0.5), ("p99", 0.99)):
+        assert resumen["espera"][clave] == pytest.approx(_exacto(esperas, q), rel=0.01, abs=1)
+    assert resumen["retorno"]["maximo"] == max(r["tiempo_retorno"] for r in completos)
+    assert resumen["tiempo_total"] == max(r["tiempo_finalizacion"] for r in completos)
+    assert resumen["utilizacion_cpu"] <= 1.0
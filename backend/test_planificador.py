@@ -0,0 +1,206 @@
+import random
+import pytest
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.simulador import PoliticaRR, SimuladorEventos
+from models.process import Proceso
+
+
+def _procesos(cargas):
+    return [Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad, usuario="test")
+            for pid, llegada, rafaga, prioridad in cargas]
+
+
+def _cargas(semilla, n=25):
+    azar = random.Random(semilla)
+    return [(pid, azar.randint(0, 30), azar.randint(1, 12), azar.randint(0, 4)) for pid in range(1, n + 1)]
+
+
+def _referencia(cargas, algoritmo, quantum=2):
+    """
+    Simulación de referencia unidad de tiempo por unidad, sin atajos.
+    En cada instante: primero las llegadas, después el fin de tramo o la expropiación
+    del que está en CPU (que vuelve a la cola detrás de las llegadas), después el despacho.
+    Devuelve {pid: (inicio, finalizacion)}.
+    """
+    pendientes = sorted(cargas, key=lambda c: (c[1], c[0]))
+    datos = {pid: (llegada, prioridad) for pid, llegada, _, prioridad in cargas}
+    restante = {pid: rafaga for pid, _, rafaga, _ in cargas}
+    listos, inicio, fin = [], {}, {}
+    en_cpu, usado, tiempo, i = None, 0, 0, 0
+
+    def clave(pid):
+        if algoritmo in ("sjf", "srtf"):
+            return restante[pid], pid
+        if algoritmo.startswith("prioridad"):
+            return datos[pid][1], datos[pid][0], pid
+        return 0
+
+    while len(fin) < len(cargas):
+        while i < len(pendientes) and pendientes[i][1] == tiempo:
+            listos.append(pendientes[i][0])
+            i += 1
+        if en_cpu is not None:
+            if restante[en_cpu] == 0:
+                fin[en_cpu] = tiempo
+                en_cpu = None
+            elif algoritmo == "rr" and usado == quantum:
+                listos.append(en_cpu)
+                en_cpu = None
+            elif (algoritmo in ("srtf", "prioridad_expropiativo") and listos
+                  and min(map(clave, listos)) < clave(en_cpu)):
+                listos.append(en_cpu)
+                en_cpu = None
+        if en_cpu is None and listos:
+            en_cpu = listos.pop(0) if algoritmo in ("fcfs", "rr") else min(listos, key=clave)
+            if algoritmo not in ("fcfs", "rr"):
+                listos.remove(en_cpu)
+            inicio.setdefault(en_cpu, tiempo)
+            usado = 0
+        if en_cpu is not None:
+            restante[en_cpu] -= 1
+            usado += 1
+        tiempo += 1
+    return {pid: (inicio[pid], fin[pid]) for pid in fin}
+
+
+def _obtenidos(resultados):
+    return {r["pid"]: (r["tiempo_inicio"], r["tiempo_finalizacion"]) for r in resultados}
+
+
+@pytest.mark.parametrize("semilla", range(8))
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf"])
+def test_no_expropiativos_coinciden_con_referencia(algoritmo, semilla):
+    cargas = _cargas(semilla)
+    planificador = Planificador()
+    metodos = {"fcfs": planificador.fcfs, "sjf": planificador.sjf}
+    resultados = metodos[algoritmo](_procesos(cargas))
+    assert _obtenidos(resultados) == _referencia(cargas, algoritmo)
+
+
+@pytest.mark.parametrize("semilla", range(8))
+@pytest.mark.parametrize("quantum", [1, 2, 3, 5])
+def test_round_robin_coincide_con_referencia(quantum, semilla):
+    # incluye los atajos: rondas comprimidas y el drenado final sin llegadas
+    cargas = _cargas(semilla)
+    resultados = Planificador().round_robin(_procesos(cargas), quantum=quantum)
+    assert _obtenidos(resultados) == _referencia(cargas, "rr", quantum)
+
+
+@pytest.mark.parametrize("semilla", range(8))
+@pytest.mark.parametrize("algoritmo", ["srtf", "prioridad", "prioridad_expropiativo"])
+def test_srtf_y_prioridad_coinciden_con_referencia(algoritmo, semilla):
+    cargas = _cargas(semilla)
+    planificador = Planificador()
+    if algoritmo == "srtf":
+        resultados = planificador.srtf(_procesos(cargas))
+    else:
+        resultados = planificador.prioridad(_procesos(cargas), expropiativo=algoritmo.endswith("expropiativo"))
+    assert _obtenidos(resultados) == _referencia(cargas, algoritmo)
+
+
+def test_envejecimiento_evita_la_inanicion():
+    # un proceso de prioridad 4 compite con una llegada continua de procesos de prioridad 0
+    cargas = [(1, 0, 2, 4)] + [(pid, pid - 2, 2, 0) for pid in range(2, 40)]
+    sin = Planificador().prioridad(_procesos(cargas))
+    con = Planificador().prioridad(_procesos(cargas), envejecimiento=2)
+    assert [r["pid"] for r in sin][-1] == 1
+    # cada 2 unidades de espera mejora en 1: llega a 0 en t=8 y gana el desempate por llegada
+    assert _obtenidos(con)[1] == (8, 10)
+
+
+def test_envejecimiento_negativo():
+    with pytest.raises(ValueError):
+        Planificador().prioridad(_procesos(_cargas(0)), envejecimiento=-1)
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf", "rr", "srtf", "prioridad"])
+def test_tiempos_derivados(algoritmo):
+    cargas = _cargas(99)
+    fabrica = fabrica_politica(algoritmo)
+    resultados = Planificador()._simular(fabrica(), _procesos(cargas))
+    rafagas = {pid: rafaga for pid, _, rafaga, _ in cargas}
+    assert len(resultados) == len(cargas)
+    for r in resultados:
+        assert r["tiempo_retorno"] == r["tiempo_finalizacion"] - r["tiempo_llegada"]
+        assert r["tiempo_espera"] == r["tiempo_retorno"] - rafagas[r["pid"]]
+        assert r["tiempo_restante"] == 0
+
+
+def test_round_robin_con_rafagas_largas_no_itera_por_quantum():
+    procesos = [Proceso(pid=pid, tiempo_llegada=pid % 7, rafaga_cpu=10**6 + pid) for pid in range(500)]
+    simulador = SimuladorEventos(PoliticaRR(1), procesos)
+    terminados = simulador.ejecutar()
+    assert len(terminados) == 500
+    assert simulador.reloj == sum(10**6 + pid for pid in range(500))
+    # llegadas, rondas comprimidas y drenado final: no un evento por quantum
+    assert simulador.eventos_procesados < 10 * len(procesos)
+
+
+def _referencia_mlfq(cargas, quantums):
+    """
+    MLFQ sin boost, unidad por unidad: entra al nivel 0; quien agota el quantum baja
+    (en el último nivel vuelve al final del mismo); el expropiado por un nivel mejor
+    vuelve al final de su nivel conservando lo consumido.
+    """
+    pendientes = sorted(cargas, key=lambda c: (c[1], c[0]))
+    restante = {pid: rafaga for pid, _, rafaga, _ in cargas}
+    niveles = [[] for _ in quantums]
+    inicio, fin = {}, {}
+    en_cpu, tiempo, i = None, 0, 0
+    ultimo = len(quantums) - 1
+    while len(fin) < len(cargas):
+        while i < len(pendientes) and pendientes[i][1] == tiempo:
+            niveles[0].append((pendientes[i][0], 0))
+            i += 1
+        if en_cpu is not None:
+            pid, nivel, consumido = en_cpu
+            mejor = next((n for n, cola in enumerate(niveles) if cola), None)
+            if restante[pid] == 0:
+                fin[pid] = tiempo
+                en_cpu = None
+            elif consumido == quantums[nivel]:
+                niveles[min(nivel + 1, ultimo)].append((pid, 0))
+                en_cpu = None
+            elif mejor is not None and mejor < nivel:
+                niveles[nivel].append((pid, consumido))
+                en_cpu = None
+        if en_cpu is None:
+            nivel = next((n for n, cola in enumerate(niveles) if cola), None)
+            if nivel is not None:
+                pid, consumido = niveles[nivel].pop(0)
+                inicio.setdefault(pid, tiempo)
+                en_cpu = (pid, nivel, consumido)
+        if en_cpu is not None:
+            pid, nivel, consumido = en_cpu
+            restante[pid] -= 1
+            en_cpu = (pid, nivel, consumido + 1)
+        tiempo += 1
+    return {pid: (inicio[pid], fin[pid]) for pid in fin}
+
+
+@pytest.mark.parametrize("semilla", range(8))
+@pytest.mark.parametrize("quantums", [(2, 4, 8), (1, 3), (3,)])
+def test_mlfq_coincide_con_referencia(quantums, semilla):
+    cargas = _cargas(semilla)
+    resultados = Planificador().mlfq(_procesos(cargas), quantums=quantums)
+    assert _obtenidos(resultados) == _referencia_mlfq(cargas, quantums)
+
+
+def test_mlfq_boost_atiende_a_los_niveles_bajos():
+    # un proceso largo baja al último nivel mientras llegan procesos cortos sin parar
+    cargas = [(1, 0, 40, 1)] + [(pid, pid, 1, 1) for pid in range(2, 200)]
+
+    def ejecutado_antes_de_200(periodo_boost):
+        fabrica = fabrica_politica("mlfq", quantums=(1, 2), periodo_boost=periodo_boost)
+        tramos = Planificador().linea_de_tiempo(_procesos(cargas), fabrica)
+        return sum(min(t["fin"], 200) - t["inicio"] for t in tramos if t["pid"] == 1 and t["inicio"] < 200)
+
+    assert ejecutado_antes_de_200(0) <= 2
+    # con boost cada 10 unidades vuelve al nivel 0 y avanza en cada periodo
+    assert ejecutado_antes_de_200(10) >= 15
+
+
+@pytest.mark.parametrize("quantums,periodo_boost", [((), 0), ((2, 0), 0), ((2, 4), -1)])
+def test_mlfq_configuracion_invalida(quantums, periodo_boost):
+    with pytest.raises(ValueError):
+        Planificador().mlfq(_procesos(_cargas(0)), quantums=quantums, periodo_boost=periodo_boost)
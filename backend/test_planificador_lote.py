@@ -0,0 +1,76 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+from controllers.planificador import Planificador
+from controllers.planificador_lote import ALGORITMOS_LOTE, COLUMNAS_SALIDA
+from main import app
+from models.process import Proceso
+
+
+def _columnas(semilla, n=200):
+    azar = random.Random(semilla)
+    pids = list(range(1, n + 1))
+    azar.shuffle(pids)
+    return {
+        "pid": pids,
+        "tiempo_llegada": [azar.randint(0, 300) for _ in range(n)],
+        "rafaga_cpu": [azar.randint(1, 9) for _ in range(n)],
+        "prioridad": [azar.randint(0, 4) for _ in range(n)],
+    }
+
+
+@pytest.mark.parametrize("semilla", range(5))
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf"])
+def test_lote_coincide_con_el_simulador(algoritmo, semilla):
+    columnas = _columnas(semilla)
+    resultado = ALGORITMOS_LOTE[algoritmo](
+        columnas["pid"], columnas["tiempo_llegada"], columnas["rafaga_cpu"], columnas["prioridad"]
+    )
+    procesos = [
+        Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad)
+        for pid, llegada, rafaga, prioridad in zip(*(columnas[c] for c in ("pid", "tiempo_llegada",
+                                                                          "rafaga_cpu", "prioridad")))
+    ]
+    esperado = getattr(Planificador(), algoritmo)(procesos)
+    # mismo orden de ejecución (no expropiativo: coincide con el de finalización) y mismos tiempos
+    for campo in COLUMNAS_SALIDA:
+        assert resultado[campo].tolist() == [pcb[campo] for pcb in esperado], campo
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf"])
+def test_lote_vacio(algoritmo):
+    resultado = ALGORITMOS_LOTE[algoritmo]([], [], [])
+    assert all(len(resultado[campo]) == 0 for campo in COLUMNAS_SALIDA)
+
+
+@pytest.mark.parametrize("columnas", [
+    ([1, 2], [0], [1, 1]),          # largos distintos
+    ([1], [0], [0]),                # ráfaga no positiva
+    ([1], [-1], [3]),               # llegada negativa
+])
+def test_lote_valida_las_columnas(columnas):
+    with pytest.raises(ValueError):
+        ALGORITMOS_LOTE["fcfs"](*columnas)
+
+
+def test_endpoint_lote():
+    cliente = TestClient(app)
+    respuesta = cliente.post("/planificar/lote/sjf", json={
+        "pid": [1, 2, 3], "tiempo_llegada": [0, 1, 1], "rafaga_cpu": [4, 3, 1],
+    })
+    assert respuesta.status_code == 200
+    datos = respuesta.json()
+    assert datos["pid"] == [1, 3, 2]
+    assert datos["tiempo_finalizacion"] == [4, 5, 8]
+    assert datos["prioridad"] == [1, 1, 1]
+
+
+@pytest.mark.parametrize("algoritmo,cuerpo", [
+    ("rr", {"pid": [1], "tiempo_llegada": [0], "rafaga_cpu": [1]}),
+    ("fcfs", {"pid": [1], "tiempo_llegada": [0]}),
+    ("fcfs", {"pid": [1, 2], "tiempo_llegada": [0], "rafaga_cpu": [1, 1]}),
+])
+def test_endpoint_lote_errores(algoritmo, cuerpo):
+    respuesta = TestClient(app).post(f"/planificar/lote/{algoritmo}", json=cuerpo)
+    assert respuesta.status_code == 200
+    assert "error" in respuesta.json()
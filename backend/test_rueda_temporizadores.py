@@ -0,0 +1,86 @@
+import heapq
+import random
+import pytest
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.rueda_temporizadores import BITS, NIVELES, RuedaTemporizadores
+from models.process import Proceso
+
+
+@pytest.mark.parametrize("semilla", range(6))
+def test_vence_en_el_mismo_orden_que_un_heap(semilla):
+    azar = random.Random(semilla)
+    rueda, referencia = RuedaTemporizadores(), []
+    reloj, ident = 0, 0
+    # saltos de todos los tamaños: dentro de una ranura, entre niveles y más allá de los NIVELES
+    saltos = [1, 7, 300, 70_000, 20_000_000, 1 << (NIVELES * BITS + 3)]
+    for _ in range(3000):
+        if azar.random() < 0.6:
+            tiempo = reloj + azar.randint(0, azar.choice(saltos))
+            rueda.programar(tiempo, ident)
+            heapq.heappush(referencia, (tiempo, ident))
+            ident += 1
+        else:
+            assert rueda.proximo() == (referencia[0][0] if referencia else None)
+            if azar.random() < 0.5:
+                reloj += azar.randint(0, azar.choice(saltos))
+            else:
+                reloj = rueda.proximo() or reloj
+            esperados = []
+            while referencia and referencia[0][0] <= reloj:
+                esperados.append(heapq.heappop(referencia))
+            vencidos = rueda.vencer(reloj)
+            # mismo conjunto; el orden es por tiempo (dentro de un mismo instante no se garantiza)
+            assert sorted(vencidos) == sorted(i for _, i in esperados)
+            tiempos = {i: t for t, i in esperados}
+            assert [tiempos[i] for i in vencidos] == sorted(tiempos[i] for i in vencidos)
+        assert len(rueda) == len(referencia)
+
+
+def test_no_se_programa_en_el_pasado():
+    rueda = RuedaTemporizadores(inicio=10)
+    with pytest.raises(ValueError):
+        rueda.programar(9, "a")
+    rueda.programar(10, "b")
+    assert rueda.vencer(10) == ["b"] and rueda.proximo() is None
+
+
+def _tramos(procesos, algoritmo="fcfs"):
+    tramos = {}
+    for tramo in Planificador().linea_de_tiempo(procesos, fabrica_politica(algoritmo)):
+        tramos.setdefault(tramo["pid"], []).append((tramo["inicio"], tramo["fin"]))
+    return tramos
+
+
+def test_un_proceso_con_entrada_salida():
+    assert _tramos([Proceso(pid=1, rafagas=[2, 3, 4])]) == {1: [(0, 2), (5, 9)]}
+
+
+def test_la_cpu_se_usa_mientras_otro_espera_la_entrada_salida():
+    procesos = [Proceso(pid=1, rafagas=[2, 10, 1]), Proceso(pid=2, tiempo_llegada=1, rafaga_cpu=5)]
+    assert _tramos(procesos) == {1: [(0, 2), (12, 13)], 2: [(2, 7)]}
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "rr", "srtf", "mlfq"])
+def test_rafagas_con_entrada_salida_se_respetan(algoritmo):
+    azar = random.Random(11)
+    rafagas = {
+        pid: [azar.randint(1, 6) if i % 2 == 0 else azar.randint(1, 400) for i in range(2 * azar.randint(0, 3) + 1)]
+        for pid in range(1, 31)
+    }
+    llegadas = {pid: azar.randint(0, 50) for pid in rafagas}
+    procesos = [Proceso(pid=pid, tiempo_llegada=llegadas[pid], rafagas=r) for pid, r in rafagas.items()]
+    tramos = _tramos(procesos, algoritmo)
+    for pid, r in rafagas.items():
+        assert sum(fin - inicio for inicio, fin in tramos[pid]) == sum(r[0::2])
+        assert tramos[pid][0][0] >= llegadas[pid]
+        # entre el fin de cada ráfaga de CPU y el inicio de la siguiente pasa al menos su E/S
+        limite = llegadas[pid]
+        for rafaga, io in zip(r[0::2], r[1::2] + [None]):
+            primero = True
+            while rafaga > 0:
+                inicio, fin = tramos[pid].pop(0)
+                assert not primero or inicio >= limite
+                primero = False
+                rafaga -= fin - inicio
+            if io is not None:
+                limite = fin + io
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+from controllers.sesiones import GestorSesiones, MAX_PASOS
+from main import app, planificador, procesos_a_planificar
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9801, "tiempo_llegada": 1, "rafaga_cpu": 5, "usuario": "test"})
+    yield cliente
+    cliente.delete("/colas/procesos/9801")
+
+
+def _abrir(cliente, **cuerpo):
+    respuesta = cliente.post("/sesiones", json={"algoritmo": "rr", **cuerpo})
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+
+def test_avanzar_de_a_pasos_da_lo_mismo_que_simular_todo(cliente):
+    sesion = _abrir(cliente)
+    assert sesion["reloj"] == 0 and sesion["eventos_procesados"] == 0 and not sesion["finalizada"]
+    finales, tramos = {}, []
+    while True:
+        avance = cliente.post(f"/sesiones/{sesion['id']}/paso", params={"n": 3}).json()
+        tramos += avance["tramos"]
+        finales.update({p["pid"]: p["tiempo_finalizacion"] for p in avance["terminados"]})
+        if avance["finalizada"]:
+            break
+    esperado = planificador.round_robin(procesos_a_planificar(), quantum=2)
+    assert finales == {r["pid"]: r["tiempo_finalizacion"] for r in esperado}
+    assert sum(t["fin"] - t["inicio"] for t in tramos if t["pid"] == 9801) == 5
+    assert cliente.post(f"/sesiones/{sesion['id']}/paso").json()["pasos"] == 0
+
+
+def test_avanzar_hasta_un_instante(cliente):
+    sesion = _abrir(cliente, algoritmo="srtf", cpus=2)
+    avance = cliente.post(f"/sesiones/{sesion['id']}/hasta", params={"t": 3}).json()
+    assert avance["reloj"] <= 3
+    assert avance["proximo_evento"] is None or avance["proximo_evento"] > 3
+    assert all(t["fin"] <= 3 and t["cpu"] in (0, 1) for t in avance["tramos"])
+    datos = cliente.get(f"/sesiones/{sesion['id']}", params={"procesos": True}).json()
+    assert 9801 in {p["pid"] for p in datos["procesos"]}
+    assert cliente.delete(f"/sesiones/{sesion['id']}").status_code == 200
+    assert cliente.get(f"/sesiones/{sesion['id']}").status_code == 404
+
+
+def test_se_cierra_la_sesion_usada_hace_mas_tiempo():
+    gestor = GestorSesiones(maximo=2)
+    primera = gestor.abrir("fcfs", {}, None, [])
+    segunda = gestor.abrir("fcfs", {}, None, [])
+    gestor.obtener(primera.id)
+    gestor.abrir("fcfs", {}, None, [])
+    assert gestor.obtener(segunda.id) is None and gestor.obtener(primera.id) is primera
+
+
+@pytest.mark.parametrize("cuerpo", [
+    {"algoritmo": "lifo"},
+    {"algoritmo": "rr", "quantums": 5},
+    {"algoritmo": "mlfq", "quantums": [2, 0]},
+    {"algoritmo": "rr", "quantum": 0},
+    {"algoritmo": "rr", "cpus": 0},
+    {"algoritmo": "rr", "cpus": True},
+    {"algoritmo": "rr", "cpus": 2, "periodo_balance": -1},
+])
+def test_configuracion_invalida(cliente, cuerpo):
+    assert cliente.post("/sesiones", json=cuerpo).status_code == 400
+
+
+def test_pasos_fuera_de_rango(cliente):
+    sesion = _abrir(cliente)
+    for n in (0, MAX_PASOS + 1):
+        assert cliente.post(f"/sesiones/{sesion['id']}/paso", params={"n": n}).status_code == 400
+    assert cliente.post("/sesiones/no-existe/paso").status_code == 404
@@ -0,0 +1,91 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.simulador_smp import MAX_CPUS, SimuladorSMP
+from main import app
+from models.process import Proceso
+
+
+def _procesos(cargas):
+    return [Proceso(pid=pid, tiempo_llegada=llegada, rafaga_cpu=rafaga, prioridad=prioridad, usuario="test")
+            for pid, llegada, rafaga, prioridad in cargas]
+
+
+def _cargas(semilla, n=25):
+    azar = random.Random(semilla)
+    return [(pid, azar.randint(0, 30), azar.randint(1, 12), azar.randint(0, 4)) for pid in range(1, n + 1)]
+
+
+@pytest.mark.parametrize("algoritmo", ["fcfs", "sjf", "rr", "srtf", "prioridad_expropiativo", "mlfq"])
+@pytest.mark.parametrize("num_cpus,periodo_balance,robo", [(2, 0, True), (3, 4, True), (4, 3, False)])
+def test_smp_conserva_las_rafagas(algoritmo, num_cpus, periodo_balance, robo):
+    cargas = _cargas(7, n=40)
+    resultado = Planificador().smp(_procesos(cargas), fabrica_politica(algoritmo), num_cpus,
+                                   periodo_balance, robo)
+    rafagas = {pid: rafaga for pid, _, rafaga, _ in cargas}
+    llegadas = {pid: llegada for pid, llegada, _, _ in cargas}
+    ejecutado = dict.fromkeys(rafagas, 0)
+    por_cpu, por_pid = {}, {}
+    for tramo in resultado["tramos"]:
+        assert tramo["inicio"] < tramo["fin"]
+        assert tramo["inicio"] >= llegadas[tramo["pid"]]
+        ejecutado[tramo["pid"]] += tramo["fin"] - tramo["inicio"]
+        por_cpu.setdefault(tramo["cpu"], []).append((tramo["inicio"], tramo["fin"]))
+        por_pid.setdefault(tramo["pid"], []).append((tramo["inicio"], tramo["fin"]))
+    # cada proceso ejecuta exactamente su ráfaga, ni más ni menos
+    assert ejecutado == rafagas
+    # una CPU no ejecuta dos tramos a la vez, y un proceso no corre en dos CPUs a la vez
+    for tramos in list(por_cpu.values()) + list(por_pid.values()):
+        tramos.sort()
+        for (_, fin), (inicio, _) in zip(tramos, tramos[1:]):
+            assert fin <= inicio
+    finales = {r["pid"]: r["tiempo_finalizacion"] for r in resultado["procesos"]}
+    assert finales == {pid: max(fin for _, fin in tramos) for pid, tramos in por_pid.items()}
+    ocupado = sum(cpu["tiempo_ocupado"] for cpu in resultado["cpus"])
+    assert ocupado == sum(rafagas.values())
+
+
+def test_una_cpu_da_lo_mismo_que_el_simulador_de_una():
+    cargas = _cargas(3)
+    resultado = Planificador().smp(_procesos(cargas), fabrica_politica("rr"), 1)
+    esperado = Planificador().round_robin(_procesos(cargas))
+    finales = {r["pid"]: r["tiempo_finalizacion"] for r in resultado["procesos"]}
+    assert finales == {r["pid"]: r["tiempo_finalizacion"] for r in esperado}
+
+
+@pytest.mark.parametrize("num_cpus", [0, -1, MAX_CPUS + 1])
+def test_cantidad_de_cpus_fuera_de_rango(num_cpus):
+    with pytest.raises(ValueError):
+        SimuladorSMP(fabrica_politica("fcfs"), [], num_cpus)
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9101, "tiempo_llegada": 0, "rafaga_cpu": 3, "usuario": "test"})
+    yield cliente
+    cliente.delete("/colas/procesos/9101")
+
+
+@pytest.mark.parametrize("ruta", [
+    "/planificar/smp/fcfs", "/planificar/fcfs/linea_de_tiempo", "/planificar/fcfs/exportar",
+])
+@pytest.mark.parametrize("cpus", [0, MAX_CPUS + 1, 2_000_000])
+def test_endpoints_limitan_las_cpus(cliente, ruta, cpus):
+    respuesta = cliente.post(ruta, params={"cpus": cpus})
+    assert respuesta.status_code == 200
+    assert "error" in respuesta.json()
+
+
+@pytest.mark.parametrize("ruta,cuerpo", [
+    ("/sesiones", {"algoritmo": "fcfs", "cpus": MAX_CPUS + 1}),
+    ("/trabajos", {"algoritmo": "fcfs", "cpus": MAX_CPUS + 1}),
+])
+def test_sesiones_y_trabajos_limitan_las_cpus(cliente, ruta, cuerpo):
+    assert cliente.post(ruta, json=cuerpo).status_code == 400
+
+
+def test_smp_con_el_maximo_de_cpus(cliente):
+    respuesta = cliente.post("/planificar/smp/rr", params={"cpus": MAX_CPUS, "resumen": True})
+    assert len(respuesta.json()["cpus"]) == MAX_CPUS
@@ -0,0 +1,191 @@
+import pytest
+from models.filesystem.cache_rutas import CacheRutas
+from models.filesystem.directorio import Directorio
+from models.filesystem.permisos import EJECUCION, LECTURA, ESCRITURA, NodoConPermisos, derechos, modo_desde_texto
+from models.filesystem.sistema_de_archivos import SistemaArchivos
+from models.filesystem.usuario import Usuario
+
+
+@pytest.fixture
+def fs():
+    return SistemaArchivos(verificar_busqueda=True, cache_permisos=True)
+
+
+def test_segunda_busqueda_sale_del_cache(fs):
+    fs.ls("/home/usuario1")
+    aciertos = fs.cache_rutas.aciertos
+    assert "error" not in fs.ls("/home/usuario1")
+    assert fs.cache_rutas.aciertos == aciertos + 1
+
+
+def test_rutas_relativas_y_con_puntos(fs):
+    fs.mkdir("/home/usuario1/docs")
+    fs.cd("/home")
+    assert fs.ls("usuario1")["directorios"] == fs.ls("/home/usuario1")["directorios"]
+    assert "error" not in fs.ls("./usuario1/docs")
+    assert "error" not in fs.ls("usuario1/docs/../../usuario2")
+    assert "error" in fs.ls("usuario2/../usuario1/nada")
+
+
+def test_cache_acotado():
+    raiz = Directorio("/", Usuario("root", 0, "root"))
+    cache = CacheRutas(maximo=2)
+    for ruta in ("/a", "/b", "/c"):
+        cache.guardar(ruta, raiz)
+    assert len(cache) == 2
+    assert cache.buscar("/a") == (False, None)
+    assert cache.buscar("/c") == (True, raiz)
+
+
+def test_mkdir_invalida_la_entrada_negativa(fs):
+    assert "error" in fs.ls("/datos/sub")
+    assert "error" in fs.ls("/datos/sub")       # ahora sale del cache como inexistente
+    assert "ok" in fs.mkdir("/datos")
+    assert "error" in fs.ls("/datos/sub")
+    assert "ok" in fs.mkdir("/datos/sub")
+    assert "error" not in fs.ls("/datos/sub")
+
+
+def test_rm_invalida_la_entrada_positiva(fs):
+    fs.mkdir("/datos")
+    fs.mkdir("/datos/sub", permisos="755")
+    assert "error" not in fs.ls("/datos/sub")
+    assert "ok" in fs.rm("/datos/sub")
+    assert "error" in fs.ls("/datos/sub")
+    assert "error" in fs.cd("/datos/sub")
+    # el directorio nuevo con el mismo nombre es otro nodo: no hereda nada del anterior
+    fs.mkdir("/datos/sub", permisos="700")
+    assert fs.ls("/datos")["directorios"][0]["permisos"] == "700"
+    fs.su("usuario1")
+    assert "error" in fs.ls("/datos/sub")
+
+
+def test_rm_invalida_las_rutas_de_abajo(fs):
+    fs.mkdir("/datos")
+    fs.mkdir("/datos/sub")
+    assert "error" in fs.ls("/datos/sub/nada")
+    fs.rm("/datos/sub")
+    fs.rm("/datos")
+    assert "error" in fs.ls("/datos")
+    assert "error" in fs.ls("/datos/sub/nada")
+
+
+def test_rutas_relativas_desde_un_cwd_borrado(fs):
+    fs.mkdir("/datos")
+    fs.cd("/datos")
+    fs.rm("/datos")
+    fs.mkdir("/datos")
+    fs.mkdir("/datos/sub")
+    # el cwd es el nodo borrado, no la ruta /datos
+    assert "error" in fs.ls("sub")
+    assert "error" not in fs.ls("/datos/sub")
+
+
+def test_rm_y_crear_archivo_de_nuevo(fs):
+    fs.crear_archivo("/a.txt", "uno")
+    assert fs.read("/a.txt")["contenido"] == "uno"
+    fs.rm("/a.txt")
+    assert "error" in fs.read("/a.txt")
+    fs.crear_archivo("/a.txt", "dos")
+    assert fs.read("/a.txt")["contenido"] == "dos"
+
+
+def test_pwd_sigue_al_cwd(fs):
+    assert fs.pwd() == "/"
+    fs.mkdir("/home/usuario1/docs")
+    fs.cd("/home/usuario1/docs")
+    assert fs.pwd() == "/home/usuario1/docs"
+    assert fs.ls(".")["path"] == "/home/usuario1/docs"
+    fs.cd("..")
+    assert fs.pwd() == "/home/usuario1"
+    fs.cd("../usuario2")
+    assert fs.pwd() == "/home/usuario2"
+    fs.cd("/")
+    assert fs.pwd() == "/"
+
+
+def test_ruta_de_cada_directorio(fs):
+    fs.mkdir("/a")
+    fs.mkdir("/a/b")
+    fs.mkdir("/a/b/c")
+    c = fs.root.subdirectorios["a"].subdirectorios["b"].subdirectorios["c"]
+    assert c.ruta == "/a/b/c"
+    assert c.parent.ruta == "/a/b"
+    assert fs.root.ruta == "/"
+
+
+def test_derechos_por_propietario_grupo_y_otros():
+    duenio = Usuario("a", 1001, "usuarios")
+    companero = Usuario("b", 1002, "usuarios")
+    otro = Usuario("c", 1003, "otros")
+    nodo = Directorio("d", duenio, permisos="751")
+    assert derechos(duenio, nodo) == LECTURA | ESCRITURA | EJECUCION
+    assert derechos(companero, nodo) == LECTURA | EJECUCION
+    assert derechos(otro, nodo) == EJECUCION
+    assert derechos(Usuario("root", 0, "root"), Directorio("d", duenio, permisos="000")) == 7
+
+
+@pytest.mark.parametrize("texto,modo", [("755", 0o755), ("7", 0o007), (644, 0o644), ("0755", 0o755)])
+def test_modo_desde_texto(texto, modo):
+    assert modo_desde_texto(texto) == modo
+
+
+@pytest.mark.parametrize("texto", ["79", "abc", "rwx"])
+def test_modo_desde_texto_invalido(texto, fs):
+    with pytest.raises(ValueError):
+        modo_desde_texto(texto)
+    assert "error" in fs.mkdir("/datos", permisos=texto)
+    assert "error" in fs.chmod("/home", texto)
+
+
+@pytest.mark.parametrize("cache_permisos", [False, True])
+def test_busqueda_exige_x_en_cada_ancestro(cache_permisos):
+    fs = SistemaArchivos(verificar_busqueda=True, cache_permisos=cache_permisos)
+    fs.mkdir("/datos", permisos="744")
+    fs.mkdir("/datos/sub", permisos="777")
+    fs.crear_archivo("/datos/sub/a.txt", "hola", permisos="666")
+    fs.su("usuario1")
+    assert "error" not in fs.ls("/datos")      # r alcanza para listar
+    assert "error" in fs.ls("/datos/sub")
+    assert "error" in fs.read("/datos/sub/a.txt")
+    # sin verificar_busqueda alcanza con los permisos del nodo final
+    fs.verificar_busqueda = False
+    assert fs.read("/datos/sub/a.txt")["contenido"] == "hola"
+
+
+def test_chmod_invalida_las_decisiones_cacheadas(fs):
+    fs.mkdir("/datos", permisos="755")
+    fs.mkdir("/datos/sub", permisos="755")
+    fs.su("usuario1")
+    assert "error" not in fs.ls("/datos/sub")
+    fs.su("root")
+    fs.chmod("/datos", "700")
+    fs.su("usuario1")
+    # sin x en un ancestro ya no se puede llegar (la búsqueda cacheada quedó vieja)
+    assert "error" in fs.ls("/datos/sub")
+    fs.su("root")
+    fs.chmod("/datos", "755")
+    fs.su("usuario1")
+    assert "error" not in fs.ls("/datos/sub")
+
+
+def test_chown_invalida_las_decisiones_cacheadas(fs):
+    fs.crear_archivo("/privado.txt", "secreto", permisos="600")
+    fs.su("usuario1")
+    assert "error" in fs.read("/privado.txt")
+    fs.su("root")
+    assert "ok" in fs.chown("/privado.txt", "usuario1")
+    fs.su("usuario1")
+    assert fs.read("/privado.txt")["contenido"] == "secreto"
+
+
+def test_crear_nodos_no_cambia_la_epoca(fs):
+    epoca = NodoConPermisos.epoca
+    fs.mkdir("/datos")
+    fs.crear_archivo("/datos/a.txt", "hola")
+    fs.rm("/datos/a.txt")
+    assert NodoConPermisos.epoca == epoca
+    fs.chmod("/datos", "700")
+    assert NodoConPermisos.epoca == epoca + 1
+    fs.chown("/datos", "usuario2")
+    assert NodoConPermisos.epoca == epoca + 2
@@ -0,0 +1,79 @@
+import copy
+import gc
+import pickle
+import pytest
+from models.pcb import PCB
+from models.process import Proceso
+from models.tabla_procesos import TABLA_PROCESOS, TablaProcesos
+
+
+def _valores(tabla, pid, **otros):
+    valores = dict.fromkeys(tabla.columnas, 0)
+    valores.update(pid=pid, **otros)
+    return valores
+
+
+def test_las_filas_liberadas_se_reutilizan():
+    tabla = TablaProcesos()
+    filas = [tabla.reservar(_valores(tabla, pid)) for pid in range(3)]
+    assert filas == [0, 1, 2] and len(tabla) == 3
+    tabla.extras["registros"][1] = {"pc": 7}
+    tabla.liberar(1)
+    assert len(tabla) == 2 and 1 not in tabla.extras["registros"]
+    assert tabla.reservar(_valores(tabla, 9)) == 1
+    assert tabla.columnas["pid"][1] == 9
+
+
+@pytest.mark.parametrize("con_fila_libre", [False, True])
+def test_un_valor_que_no_entra_no_desalinea_las_columnas(con_fila_libre):
+    tabla = TablaProcesos()
+    tabla.reservar(_valores(tabla, 1))
+    if con_fila_libre:
+        tabla.liberar(tabla.reservar(_valores(tabla, 2)))
+    largos = {nombre: len(columna) for nombre, columna in tabla.columnas.items()}
+    with pytest.raises(OverflowError):
+        tabla.reservar(_valores(tabla, 3, prioridad=2 ** 40))     # la columna es int32
+    assert {nombre: len(columna) for nombre, columna in tabla.columnas.items()} == largos
+    assert len(tabla) == 1
+
+
+def test_textos_se_guardan_una_vez():
+    tabla = TablaProcesos()
+    assert tabla.indice_texto("root") == tabla.indice_texto("root")
+    assert tabla.textos.count("root") == 1
+
+
+def test_pcb_lee_y_escribe_su_fila():
+    pcb = PCB(pid=41, tiempo_llegada=3, rafaga_cpu=5, usuario="ana")
+    datos = pcb.to_dict()
+    assert (datos["pid"], datos["tiempo_llegada"], datos["tiempo_restante"], datos["usuario"]) == (41, 3, 5, "ana")
+    assert datos["tiempo_inicio"] is None and datos["registros"] == {}
+    pcb.tiempo_inicio = 4
+    pcb.registros["pc"] = 10          # el contenedor pedido persiste en la tabla
+    assert TABLA_PROCESOS.columnas["tiempo_inicio"][pcb.fila] == 4
+    assert pcb.to_dict()["registros"] == {"pc": 10}
+    pcb.tiempo_inicio = None
+    assert pcb.tiempo_inicio is None
+
+
+@pytest.mark.parametrize("copiar", [copy.deepcopy, lambda p: pickle.loads(pickle.dumps(p))])
+def test_copias_tienen_fila_propia(copiar):
+    original = Proceso(pid=42, rafaga_cpu=4, rafagas=[2, 5, 3], registros={"ax": 1})
+    copia = copiar(original)
+    assert copia.pcb.fila != original.pcb.fila
+    assert copia.pcb.to_dict() == original.pcb.to_dict()
+    copia.pcb.tiempo_restante = 0
+    copia.pcb.registros["ax"] = 2
+    assert original.pcb.tiempo_restante == 2 and original.pcb.registros == {"ax": 1}
+
+
+def test_la_fila_se_libera_con_el_pcb():
+    gc.collect()
+    antes = len(TABLA_PROCESOS)
+    procesos = [Proceso(pid=pid, archivos_abiertos=["/a"]) for pid in range(100)]
+    assert len(TABLA_PROCESOS) == antes + 100
+    filas = [p.pcb.fila for p in procesos]
+    del procesos
+    gc.collect()
+    assert len(TABLA_PROCESOS) == antes
+    assert not any(fila in TABLA_PROCESOS.extras["archivos_abiertos"] for fila in filas)
@@ -0,0 +1,80 @@
+from concurrent.futures import Future
+import pytest
+from fastapi.testclient import TestClient
+import controllers.trabajos as trabajos
+from controllers.trabajos import DemasiadosTrabajos, GestorTrabajos
+from main import app
+
+
+@pytest.fixture
+def futuros(monkeypatch):
+    """Reemplaza el pool: cada trabajo recibe un futuro que el test termina a mano."""
+    creados = []
+
+    def enviar(*_):
+        creados.append(Future())
+        return creados[-1]
+
+    monkeypatch.setattr(trabajos, "enviar", enviar)
+    return creados
+
+
+def test_se_rechazan_trabajos_con_el_maximo_pendiente(futuros):
+    gestor = GestorTrabajos(maximo=2)
+    gestor.enviar("fcfs", {}, [])
+    gestor.enviar("fcfs", {}, [])
+    with pytest.raises(DemasiadosTrabajos):
+        gestor.enviar("fcfs", {}, [])
+    assert len(futuros) == 2      # el rechazado no llegó al pool
+    futuros[0].set_result({})
+    gestor.enviar("fcfs", {}, [])
+    assert gestor.en_curso() == 2
+
+
+def test_se_olvidan_primero_los_terminados(futuros):
+    gestor = GestorTrabajos(maximo=2)
+    primero = gestor.enviar("fcfs", {}, [])
+    segundo = gestor.enviar("fcfs", {}, [])
+    futuros[1].set_result({})
+    tercero = gestor.enviar("fcfs", {}, [])
+    assert list(gestor.trabajos) == [primero.id, tercero.id]
+    assert gestor.obtener(segundo.id) is None
+
+
+@pytest.fixture
+def cliente():
+    cliente = TestClient(app)
+    cliente.post("/colas/agregar", json={"PID": 9701, "tiempo_llegada": 0, "rafaga_cpu": 4, "usuario": "test"})
+    yield cliente
+    cliente.delete("/colas/procesos/9701")
+
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_trabajo_en_segundo_plano(cliente, cpus):
+    trabajo = cliente.post("/trabajos", json={"algoritmo": "rr", "quantum": 1, "cpus": cpus}).json()
+    assert trabajo["estado"] in ("pendiente", "ejecutando", "terminado")
+    datos = cliente.get(f"/trabajos/{trabajo['id']}", params={"esperar": 30}).json()
+    assert datos["estado"] == "terminado"
+    assert 9701 in {p["pid"] for p in datos["resultado"]["procesos"]}
+    assert trabajo["id"] in {t["id"] for t in cliente.get("/trabajos").json()}
+
+
+def test_trabajo_rechazado_con_demasiados_pendientes(cliente, monkeypatch):
+    monkeypatch.setattr(trabajos.gestor, "maximo", 0)
+    assert cliente.post("/trabajos", json={"algoritmo": "fcfs"}).status_code == 429
+
+
+@pytest.mark.parametrize("cuerpo", [
+    {"algoritmo": "lifo"},
+    {"algoritmo": "rr", "quantum": 0},
+    {"algoritmo": "mlfq", "quantums": 5},
+    {"algoritmo": "fcfs", "cpus": 0},
+    {"algoritmo": "fcfs", "cpus": 2, "periodo_balance": -1},
+])
+def test_configuracion_invalida(cliente, cuerpo):
+    assert cliente.post("/trabajos", json=cuerpo).status_code == 400
+
+
+def test_trabajo_inexistente(cliente):
+    assert cliente.get("/trabajos/no-existe").status_code == 404
+    assert cliente.delete("/trabajos/no-existe").status_code == 404
@@ -0,0 +1,132 @@
+import io
+import json
+import os
+import random
+import pytest
+from fastapi.testclient import TestClient
+import controllers.trazas as trazas
+from controllers.planificador import Planificador, fabrica_politica
+from controllers.simulador_smp import MAX_CPUS
+from controllers.trazas import MAX_PID_MAPA, EscritorTraza, TrazaBinaria, convertir_csv
+from main import app
+from models.process import Proceso
+
+
+def _cargas(semilla, n=200):
+    azar = random.Random(semilla)
+    llegadas = sorted(azar.randint(0, 500) for _ in range(n))
+    pids = azar.sample(range(1, 10 * n), n)
+    return [(pid, llegada, azar.randint(1, 20), azar.randint(0, 4)) for pid, llegada in zip(pids, llegadas)]
+
+
+def test_escribir_y_leer(tmp_path):
+    ruta = str(tmp_path / "t")
+    cargas = _cargas(0) + [(MAX_PID_MAPA + 5, 600, 3, 1), (-7, 600, 2, 1)]
+    with EscritorTraza(ruta) as escritor:
+        for carga in cargas:
+            escritor.agregar(*carga)
+    with TrazaBinaria(ruta) as traza:
+        assert len(traza) == len(cargas)
+        assert list(traza.registros()) == cargas
+    assert os.listdir(tmp_path) == ["t"]     # sin temporales
+
+
+@pytest.mark.parametrize("registros", [
+    [(1, 5, 1, 1), (2, 4, 1, 1)],                           # desordenada
+    [(1, 0, 1, 1), (1, 0, 1, 1)],                           # PID repetido
+    [(MAX_PID_MAPA * 2, 0, 1, 1), (MAX_PID_MAPA * 2, 1, 1, 1)],
+    [(1, 0, 1, 2 ** 40)],                                   # no entra en el formato
+])
+def test_traza_invalida_no_deja_archivos(tmp_path, registros):
+    with pytest.raises(ValueError):
+        with EscritorTraza(str(tmp_path / "t")) as escritor:
+            for registro in registros:
+                escritor.agregar(*registro)
+    assert os.listdir(tmp_path) == []
+
+
+def test_archivo_que_no_es_traza(tmp_path):
+    ruta = tmp_path / "t"
+    with EscritorTraza(str(ruta)) as escritor:
+        escritor.agregar(1, 0, 1)
+    ruta.write_bytes(ruta.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        TrazaBinaria(str(ruta))
+    ruta.write_bytes(b"nada de esto es una traza")
+    with pytest.raises(ValueError):
+        TrazaBinaria(str(ruta))
+
+
+def test_convertir_csv(tmp_path):
+    origen = io.StringIO("pid,tiempo_llegada,rafaga_cpu,prioridad\n1,0,4,2\n\n2,3,1,\n")
+    assert convertir_csv(origen, str(tmp_path / "t")) == 2
+    with TrazaBinaria(str(tmp_path / "t")) as traza:
+        assert list(traza.registros()) == [(1, 0, 4, 2), (2, 3, 1, 1)]
+    with pytest.raises(ValueError, match="Línea 3"):
+        convertir_csv(io.StringIO("pid,tiempo_llegada,rafaga_cpu\n1,0,4\n2,0\n"), str(tmp_path / "u"))
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    monkeypatch.setattr(trazas, "DIRECTORIO_TRAZAS", str(tmp_path))
+    return TestClient(app)
+
+
+def _subir(cliente, nombre, cargas):
+    cuerpo = "".join(
+        json.dumps({"pid": pid, "tiempo_llegada": llegada, "rafaga_cpu": rafaga, "prioridad": prioridad}) + "\n"
+        for pid, llegada, rafaga, prioridad in cargas
+    )
+    return cliente.put(f"/trazas/{nombre}", content=cuerpo)
+
+
+@pytest.mark.parametrize("algoritmo,cpus", [("fcfs", 1), ("rr", 1), ("srtf", 3)])
+def test_reproducir_da_lo_mismo_que_planificar(cliente, algoritmo, cpus):
+    cargas = _cargas(1)
+    assert _subir(cliente, "carga", cargas).json()["registros"] == len(cargas)
+    resultado = cliente.post(f"/trazas/carga/reproducir/{algoritmo}", params={"cpus": cpus}).json()
+    procesos = [Proceso(pid=p, tiempo_llegada=l, rafaga_cpu=r, prioridad=pr) for p, l, r, pr in cargas]
+    if cpus == 1:
+        esperado = getattr(Planificador(), {"fcfs": "fcfs", "rr": "round_robin", "srtf": "srtf"}[algoritmo])(
+            procesos, resumen=True)
+        del resultado["segundos"]
+        assert resultado == esperado
+    else:
+        smp = Planificador().smp(procesos, fabrica_politica(algoritmo), cpus)
+        retornos = [p["tiempo_retorno"] for p in smp["procesos"]]
+        assert resultado["procesos"] == len(cargas) and len(resultado["cpus"]) == cpus
+        assert resultado["retorno"]["promedio"] == pytest.approx(sum(retornos) / len(retornos))
+        assert resultado["retorno"]["maximo"] == max(retornos)
+
+
+def test_subir_listar_y_borrar(cliente):
+    assert _subir(cliente, "a", _cargas(2)).status_code == 200
+    assert cliente.get("/trazas").json() == [{"nombre": "a", "registros": 200}]
+    assert cliente.delete("/trazas/a").status_code == 200
+    assert cliente.delete("/trazas/a").status_code == 404
+    assert cliente.post("/trazas/a/reproducir/fcfs").status_code == 404
+
+
+@pytest.mark.parametrize("cargas", [
+    [(1, 0, 1, 1), (1, 1, 1, 1)],
+    [(1, 5, 1, 1), (2, 4, 1, 1)],
+    [(1, 0, 0, 1)],
+])
+def test_subir_rechaza_cargas_invalidas(cliente, cargas):
+    assert _subir(cliente, "mala", cargas).status_code == 400
+    assert cliente.get("/trazas").json() == []
+
+
+@pytest.mark.parametrize("ruta,params", [
+    ("/trazas/x/reproducir/lifo", {}),
+    ("/trazas/x/reproducir/fcfs", {"cpus": 0}),
+    ("/trazas/x/reproducir/fcfs", {"cpus": MAX_CPUS + 1}),
+])
+def test_reproducir_valida_los_parametros(cliente, ruta, params):
+    _subir(cliente, "x", _cargas(3))
+    assert cliente.post(ruta, params=params).status_code == 400
+
+
+@pytest.mark.parametrize("nombre", [".oculta", "a.tmp", "x" * 65])
+def test_nombres_invalidos(cliente, nombre):
+    assert cliente.put(f"/trazas/{nombre}", content="").status_code == 400